@@ -308,6 +308,71 @@ def artiax_flip(session, axis=None):
         particle_list.update_places()
 
 
+def artiax_select(session, models, expression, mode="select"):
+    """Select or show particles of one or more particle lists using an attribute expression."""
+    if not hasattr(session, "ArtiaX"):
+        session.logger.warning("ArtiaX is not currently running.")
+        return
+
+    from ..particle import ParticleList
+    from ..util.select import expression_cmd
+
+    if models is None:
+        models = session.ArtiaX.partlists.child_models()
+
+    for model in models:
+        if not isinstance(model, ParticleList):
+            continue
+
+        mask = expression_cmd(session, model, expression, mode=mode)
+        session.logger.info(
+            'artiax select: {} of {} particles of #{} - "{}" match.'.format(
+                np.count_nonzero(mask), model.size, model.id_string, model.name
+            )
+        )
+
+
+def artiax_dedup(session, models, radius, score=None, lowest=False, keep="best"):
+    """Remove near-duplicate particles of one or more particle lists."""
+    if not hasattr(session, "ArtiaX"):
+        session.logger.warning("ArtiaX is not currently running.")
+        return
+
+    if radius <= 0:
+        raise errors.UserError("artiax dedup: radius needs to be larger than 0.")
+
+    from ..particle import ParticleList
+    from ..util.dedup import dedup_particles
+
+    if models is None:
+        models = session.ArtiaX.partlists.child_models()
+
+    for model in models:
+        if not isinstance(model, ParticleList):
+            continue
+
+        if model.editing_locked:
+            session.logger.warning(
+                'artiax dedup: #{} - "{}" is locked for editing.'.format(model.id_string, model.name)
+            )
+            continue
+
+        if score is not None and score not in model.get_all_attributes():
+            raise errors.UserError(
+                "artiax dedup: Attribute {} unknown for particle list #{} - {}.".format(
+                    score, model.id_string, model.name
+                )
+            )
+
+        count = model.size
+        deleted = dedup_particles(model, radius, score=score, lowest=lowest, average=keep == "average")
+        session.logger.info(
+            'artiax dedup: removed {} of {} particles of #{} - "{}".'.format(
+                deleted, count, model.id_string, model.name
+            )
+        )
+
+
 def artiax_select_inside_surface(session):
     if not hasattr(session, "ArtiaX"):
         session.logger.warning(
@@ -326,53 +391,23 @@ def artiax_select_inside_surface(session):
         session.logger.warning("Select a model with a surface.")
         return
 
-    """looks for intersections from particle to outside bounding box in the z-direction. If theres an intersection,
-     a new intersection is looked for from that point to the outside of the bounding box. Continues until there are no
-     more intersections. If there was an even number of intersections, the particle is outside the volume, if
-     there was an odd number of intersections, it's inside."""
-    bounds = model.bounds()
-    from chimerax.geometry._geometry import closest_triangle_intercept
+    # The surface is voxelized once and cached, particles are classified in bulk
+    from ..util.containment import surface_containment
+
+    if isinstance(model, VolumeSurface):
+        vertices = model.parent.position.transform_points(model.vertices)
+    else:
+        vertices = model.vertices
+    containment = surface_containment(model, vertices)
 
     for pl in session.ArtiaX.partlists.iter():
         if pl.visible:
             pl.selected_particles = False
             atoms = pl.markers.atoms
             select_particles = np.array(atoms.selecteds)
-            for i, p_id in enumerate(pl.particle_ids[pl.displayed_particles]):
-                pos = np.asarray(pl.get_particle(p_id).coord)
-                if not (
-                    np.any(pos > bounds.xyz_max) or np.any(pos < bounds.xyz_min)
-                ):  #  inside bounding box
-                    intersepts = 0
-                    dist_to_end = bounds.xyz_max[2] - pos[2] + 1
-                    if isinstance(model, VolumeSurface):
-                        vertices = model.parent.position.transform_points(
-                            model.vertices
-                        )
-                    else:
-                        vertices = model.vertices
-                    dist_to_tri, tnum = closest_triangle_intercept(
-                        vertices, model.triangles, pos, pos + [0, 0, dist_to_end]
-                    )
-                    start = pos
-                    margin = 0.001
-                    while dist_to_tri is not None:
-                        intersepts += 1
-                        if intersepts > 100:
-                            session.logger.warning("Too many intersepts, terminating.")
-                            break
-                        start = [
-                            start[0],
-                            start[1],
-                            start[2] + dist_to_tri * dist_to_end + margin,
-                        ]
-                        dist_to_end = bounds.xyz_max[2] - start[2] + 1
-                        end = [start[0], start[1], start[2] + dist_to_end]
-                        dist_to_tri, tnum = closest_triangle_intercept(
-                            vertices, model.triangles, start, end
-                        )
-                    if intersepts % 2:
-                        select_particles[i] = True
+            displayed = np.nonzero(pl.displayed_particles)[0]
+            coords = atoms.coords[displayed]
+            select_particles[displayed[containment.contains(coords)]] = True
             atoms.selecteds = select_particles
 
 
@@ -443,6 +478,9 @@ def artiax_remove_overlap(
     thoroughness=None,
     precision=None,
     maxSearchDistance=None,
+    workers=None,
+    redrawEvery=None,
+    tolerance=None,
 ):
     if not hasattr(session, "ArtiaX"):
         session.logger.warning("ArtiaX is not currently running.")
@@ -631,6 +669,34 @@ def artiax_remove_overlap(
     else:
         max_iterations = iterations
 
+    if workers is None:
+        workers = 1
+    elif workers < 1:
+        raise errors.UserError(
+            "artiax remove overlap: workers must be set to at least 1."
+        )
+
+    if redrawEvery is None:
+        redrawEvery = 1
+    elif redrawEvery < 0:
+        raise errors.UserError(
+            "artiax remove overlap: redrawEvery must not be negative."
+        )
+
+    if tolerance is None:
+        tolerance = 0
+    elif tolerance < 0:
+        raise errors.UserError(
+            "artiax remove overlap: tolerance must not be negative."
+        )
+
+    def progress(iteration, largest_movement):
+        session.logger.status(
+            "artiax remove overlap: iteration {}, largest movement {:.3f}".format(
+                iteration, largest_movement
+            )
+        )
+
     if freeze is not None:
         particles_to_keep_still = {p: False for p in particles}
         for pl in freeze:
@@ -673,6 +739,10 @@ def artiax_remove_overlap(
         max_iterations,
         thoroughness,
         precision,
+        workers=workers,
+        redraw_every=redrawEvery,
+        tolerance=tolerance,
+        progress=progress,
     )
 
 
@@ -689,27 +759,27 @@ def artiax_gen_in_surface(
         session.logger.warning("{} is not a Surface.".format(model))
         return
 
-    if method not in ["poisson", "regular grid", "uniform"]:
+    if method not in ["poisson", "regular grid", "jittered grid", "uniform"]:
         session.logger.warning(
             "{} is not a valid method of generating points in a surface. Please use one of 'poisson'"
-            ", 'regular grid', or 'uniform'.".format(method)
+            ", 'regular grid', 'jittered grid', or 'uniform'.".format(method)
         )
         return
-    elif method in ["uniform", "regular grid"] and (num_pts is None or num_pts < 0):
+    elif (method in ["uniform", "regular grid", "jittered grid"] or exactNum) and (num_pts is None or num_pts < 0):
         session.logger.warning(
             "Please input a number of points larger than 0 using the 'num_points' keyword when"
-            " generating points in a surface using uniform sampling or on a regular grid."
+            " generating points in a surface using uniform sampling, on a grid, or an exact number of points."
         )
         return
-    elif method == "poisson" and (radius is None or radius < 0):
+    elif method == "poisson" and ((radius is None and not exactNum) or (radius is not None and radius < 0)):
         session.logger.warning(
             "Please input a radius larger than 0 using the 'radius' keyword when"
-            " generating points in a surface using poisson disk sampling."
+            " generating points in a surface using poisson disk sampling without an exact number of points."
         )
         return
-    if method in ["poisson", "regular grid"] and exactNum:
+    if method in ["regular grid", "jittered grid"] and exactNum:
         session.logger.warning(
-            "Cannot create an exact number of particles when using 'poisson' or 'regular grid' method."
+            "Cannot create an exact number of particles when using 'regular grid' or 'jittered grid' method."
         )
         return
 
@@ -1098,6 +1168,8 @@ def artiax_particles(
     color=None,
     originScaleFactor=None,
     transScaleFactor=None,
+    slabDistance=None,
+    slabTomogram=None,
 ):
     # No ArtiaX
     if not hasattr(session, "ArtiaX"):
@@ -1152,6 +1224,32 @@ def artiax_particles(
                 "artiax particles: transScaleFactor required to be a positive, non-zero number."
             )
 
+    set_slab = False
+    if slabDistance is not None:
+        set_slab = True
+        if isinstance(slabDistance, str):
+            if slabDistance != "off":
+                raise errors.UserError(
+                    "artiax particles: slabDistance required to be a positive number or 'off'."
+                )
+            slabTomogram = None
+        elif slabDistance <= 0:
+            raise errors.UserError(
+                "artiax particles: slabDistance required to be a positive number or 'off'."
+            )
+        else:
+            # Default to the displayed tomogram
+            if slabTomogram is None:
+                for t in session.ArtiaX.tomograms.child_models():
+                    if t.display:
+                        slabTomogram = t
+                        break
+
+            if not isinstance(slabTomogram, Tomogram):
+                raise errors.UserError(
+                    "artiax particles: slabDistance requires a displayed tomogram or slabTomogram."
+                )
+
     # Filter models and work
     for model in models:
         # Is it a particle list?
@@ -1201,6 +1299,9 @@ def artiax_particles(
         if set_trans_scale:
             model.translation_pixelsize = transScaleFactor
 
+        if set_slab:
+            model.set_slab_culling(slabTomogram, None if slabTomogram is None else slabDistance)
+
 
 def artiax_tomo(
     session,
@@ -1335,12 +1436,12 @@ def artiax_colormap(
     if minValue is None:
         minValue = model.get_attribute_min([attribute])[0]
     else:
-        minValue = max(minValue, model.get_attribute_min([attribute]))
+        minValue = max(minValue, model.get_attribute_min([attribute])[0])
 
     if maxValue is None:
         maxValue = model.get_attribute_max([attribute])[0]
     else:
-        maxValue = min(maxValue, model.get_attribute_max([attribute]))
+        maxValue = min(maxValue, model.get_attribute_max([attribute])[0])
 
     # Transparency
     if transparency is None:
@@ -1696,6 +1797,30 @@ def register_artiax(logger):
         )
         register("artiax flip", desc, artiax_flip)
 
+    def register_artiax_select():
+        desc = CmdDesc(
+            required=[("models", Or(ModelsArg, EmptyArg)), ("expression", StringArg)],
+            keyword=[("mode", EnumOf(("select", "show")))],
+            synopsis="Select or show particles using an expression over particle attributes.",
+            url="help:user/commands/artiax_select.html",
+        )
+        register("artiax select", desc, artiax_select)
+
+    def register_artiax_dedup():
+        desc = CmdDesc(
+            required=[("models", Or(ModelsArg, EmptyArg))],
+            keyword=[
+                ("radius", FloatArg),
+                ("score", StringArg),
+                ("lowest", BoolArg),
+                ("keep", EnumOf(("best", "average"))),
+            ],
+            required_arguments=["radius"],
+            synopsis="Remove near-duplicate particles, keeping the best particle of every cluster within a radius.",
+            url="help:user/commands/artiax_dedup.html",
+        )
+        register("artiax dedup", desc, artiax_dedup)
+
     def register_select_inside_surface():
         desc = CmdDesc(
             synopsis="Selects all shown particles inside the selected surface.",
@@ -1741,6 +1866,9 @@ def register_artiax(logger):
                 ("thoroughness", IntArg),
                 ("precision", FloatArg),
                 ("maxSearchDistance", FloatArg),
+                ("workers", IntArg),
+                ("redrawEvery", IntArg),
+                ("tolerance", FloatArg),
             ],
             synopsis="Moves selected particles to remove overlap. Can be made to move particles along surface or inside a surface",
             url="help:user/commands/artiax_remove_overlap.html",
@@ -1751,11 +1879,11 @@ def register_artiax(logger):
         desc = CmdDesc(
             required=[
                 ("model", ModelArg),
-                ("method", EnumOf(("poisson", "uniform", "regular grid"))),
+                ("method", EnumOf(("poisson", "uniform", "regular grid", "jittered grid"))),
             ],
             keyword=[("num_pts", IntArg), ("radius", FloatArg), ("exactNum", BoolArg)],
             synopsis="Generates points in the specified surface. Can generate points using uniform sampling, "
-            "a poisson disk sampling method, or on a regular grid.",
+            "a poisson disk sampling method, on a regular grid, or on a jittered grid.",
             url="help:user/commands/artiax_generate_points_in_surface.html",
         )
         register("artiax gen in surface", desc, artiax_gen_in_surface)
@@ -1851,6 +1979,8 @@ def register_artiax(logger):
                 ("color", ColorArg),
                 ("originScaleFactor", FloatArg),
                 ("transScaleFactor", FloatArg),
+                ("slabDistance", Or(FloatArg, EnumOf(["off"]))),
+                ("slabTomogram", ModelArg),
             ],
             synopsis="Set particle list properties.",
             url="help:user/commands/artiax_particles.html",
@@ -1941,7 +2071,9 @@ def register_artiax(logger):
     register_artiax_triangulate()
     register_artiax_boundary()
     register_artiax_mask()
+    register_artiax_select()
     register_select_inside_surface()
+    register_artiax_dedup()
     register_artiax_remove_links()
     register_artiax_triangles_from_links()
     register_artiax_flip()
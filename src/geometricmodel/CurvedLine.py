@@ -253,20 +253,9 @@ class CurvedLine(PopulatedModel):
             self.recalc_and_update()
 
     def get_camera_marker_surface(self):
+        from ..util.glyphs import glyph_surface
 
-        b = _BildFile(self.session, 'dummy')
-
-        b.color_command('.color 1 1 0'.split())
-        b.arrow_command(".arrow 0 0 0 0 {} 0 {} {}".format(self.camera_axes_size, self.camera_axes_size / 15,
-                                                           self.camera_axes_size / 15 * 4).split())
-        b.color_command('.color 0 0 1'.split())
-        b.arrow_command(".arrow 0 0 0 0 0 {} {} {}".format(self.camera_axes_size, self.camera_axes_size / 15,
-                                                           self.camera_axes_size / 15 * 4).split())
-
-        d = AtomicShapeDrawing('shapes')
-        d.add_shapes(b.shapes)
-
-        return d.vertices, d.normals, d.triangles, d.vertex_colors
+        return glyph_surface(self.session, "camera", self.camera_axes_size)
 
     def move_camera_along_line(self, draw=False, no_frames=None, backwards=False, distance_behind=10000, x_rotation=0,
                                z_rotation=0, y_rotation=0, specific_frame=None, max_angle=None):
@@ -100,9 +100,9 @@ class Line(GeoModel):
         if nr_particles == 0:
             print("too large spacing")
             return
-        for i in range(1, int(nr_particles) + 1):
-            pos = self.start + direction * self.spacing * i
-            partlist.new_particle(pos, [0, 0, 0], rotation)
+        steps = np.arange(1, int(nr_particles) + 1)
+        positions = self.start + np.outer(steps * self.spacing, direction)
+        partlist.new_particles(positions, np.zeros((len(steps), 3)), [rotation] * len(steps))
 
     def _calculate_particle_pos(self):
         rotation_to_z = z_align(self.start, self.end)
@@ -1,10 +1,6 @@
 # General imports
 import numpy as np
 
-# ChimeraX imports
-from chimerax.bild.bild import _BildFile
-from chimerax.atomic import AtomicShapeDrawing
-
 # ArtiaX imports
 from .GeoModel import GeoModel, GEOMODEL_CHANGED
 from ..particle.SurfaceCollectionModel import SurfaceCollectionModel
@@ -64,18 +60,10 @@ class PopulatedModel(GeoModel):
             self.collection_model.set_surface('direction_markers', v, n, t)
 
     def get_direction_marker_surface(self):
-        b = _BildFile(self.session, 'dummy')
-
-        b.sphere_command('.sphere 0 0 0 {}'.format(self.marker_size).split())
-        b.arrow_command(".arrow 0 0 0 {} 0 0 {} {}".format(self.axes_size, self.axes_size / 15,
-                                                           self.axes_size / 15 * 4).split())
-        b.arrow_command(".arrow 0 0 0 0 0 {} {} {}".format(self.axes_size, self.axes_size / 15,
-                                                           self.axes_size / 15 * 4).split())
-
-        d = AtomicShapeDrawing('shapes')
-        d.add_shapes(b.shapes)
+        from ..util.glyphs import glyph_surface, combine_surfaces
 
-        return d.vertices, d.normals, d.triangles, d.vertex_colors
+        return combine_surfaces(glyph_surface(self.session, "sphere", self.marker_size),
+                                glyph_surface(self.session, "direction", self.axes_size))
 
     def remove_spheres(self):
         """Removes fake particles."""
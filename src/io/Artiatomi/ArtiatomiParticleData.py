@@ -9,7 +9,7 @@ from chimerax.core.errors import UserError
 
 # This package
 from ..formats import ArtiaXFormat
-from ..ParticleData import ParticleData, EulerRotation
+from ..ParticleData import ParticleData, EulerRotation, zxz_angles_from_matrices
 from .emwrite import emwrite
 
 
@@ -48,6 +48,9 @@ class ArtiatomiEulerRotation(EulerRotation):
 
         return angle
 
+    def angles_from_matrices(self, matrices):
+        return zxz_angles_from_matrices(matrices, clip=True)
+
 class ArtiatomiParticleData(ParticleData):
 
     DATA_KEYS = {
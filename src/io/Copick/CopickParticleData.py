@@ -18,7 +18,7 @@ from chimerax.core.errors import UserError
 
 # This package
 from ..formats import ArtiaXFormat
-from ..ParticleData import ParticleData, EulerRotation
+from ..ParticleData import ParticleData, EulerRotation, zxz_angles_from_matrices
 
 
 class CopickLocation(BaseModel):
@@ -119,6 +119,9 @@ class CopickEulerRotation(EulerRotation):
 
         return angle
 
+    def angles_from_matrices(self, matrices):
+        return zxz_angles_from_matrices(matrices, clip=True)
+
 class CopickParticleData(ParticleData):
     DATA_KEYS = {
         'location_x': ['location_x'],
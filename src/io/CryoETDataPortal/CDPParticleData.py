@@ -19,7 +19,7 @@ from chimerax.core.errors import UserError
 
 # This package
 from ..formats import ArtiaXFormat
-from ..ParticleData import ParticleData, EulerRotation
+from ..ParticleData import ParticleData, EulerRotation, zxz_angles_from_matrices
 
 
 class CDPLocation(BaseModel):
@@ -98,6 +98,9 @@ class CDPEulerRotation(EulerRotation):
 
         return angle
 
+    def angles_from_matrices(self, matrices):
+        return zxz_angles_from_matrices(matrices, clip=True)
+
 
 def points_to_particles(
     points: List[CDPGenericPoint], particle_data: "CDPParticleData"
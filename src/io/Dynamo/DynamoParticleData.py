@@ -9,7 +9,7 @@ from chimerax.core.errors import UserError
 
 # This package
 from ..formats import ArtiaXFormat
-from ..ParticleData import ParticleData, EulerRotation
+from ..ParticleData import ParticleData, EulerRotation, zxz_angles_from_matrices
 
 
 class DynamoEulerRotation(EulerRotation):
@@ -43,6 +43,9 @@ class DynamoEulerRotation(EulerRotation):
 
         return angle
 
+    def angles_from_matrices(self, matrices):
+        return zxz_angles_from_matrices(matrices)
+
 class DynamoParticleData(ParticleData):
     DATA_KEYS = {
         'tag':          ['column_1'],                           # tag of particle fil in data folder
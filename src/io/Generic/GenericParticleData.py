@@ -9,7 +9,7 @@ from chimerax.core.errors import UserError
 
 # This package
 from ..formats import ArtiaXFormat
-from ..ParticleData import ParticleData, EulerRotation
+from ..ParticleData import ParticleData, EulerRotation, zxz_angles_from_matrices
 
 
 class GenericEulerRotation(EulerRotation):
@@ -43,6 +43,9 @@ class GenericEulerRotation(EulerRotation):
 
         return angle
 
+    def angles_from_matrices(self, matrices):
+        return zxz_angles_from_matrices(matrices)
+
 class GenericParticleData(ParticleData):
 
     DATA_KEYS = {
@@ -11,7 +11,7 @@ from chimerax.core.errors import UserError
 
 # This package
 from ..formats import ArtiaXFormat, ArtiaXSaverInfo, ArtiaXOpenerInfo
-from ..ParticleData import ParticleData, EulerRotation
+from ..ParticleData import ParticleData, EulerRotation, zxz_angles_from_matrices
 from ...widgets import SaveArgsWidget
 
 class GenericEulerRotation(EulerRotation):
@@ -45,6 +45,9 @@ class GenericEulerRotation(EulerRotation):
 
         return angle
 
+    def angles_from_matrices(self, matrices):
+        return zxz_angles_from_matrices(matrices)
+
 class PEETParticleData(ParticleData):
 
     DATA_KEYS = {
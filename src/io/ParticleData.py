@@ -5,6 +5,7 @@ from __future__ import annotations
 from uuid import uuid4
 from collections import OrderedDict
 from importlib import import_module
+import numpy as np
 
 # ChimeraX
 from chimerax.core.errors import UserError
@@ -87,6 +88,107 @@ class EulerRotation(State):
 
         return rot3 * rot2 * rot1
 
+    def as_matrices(self, ang_1, ang_2, ang_3):
+        """Compute many full rotations at once, combining the rotations in order M3 * M2 * M1.
+
+        Parameters
+        ----------
+        ang_1 : numpy.ndarray
+            1st Rotation angles in degrees (N).
+        ang_2: numpy.ndarray
+            2nd Rotation angles in degrees (N).
+        ang_3: numpy.ndarray
+            3rd Rotation angles in degrees (N).
+
+        Returns
+        -------
+        matrices: numpy.ndarray
+            The full rotations as Nx3x3 array.
+        """
+        sign = -1 if self.invert_dir else 1
+
+        rot1 = _axis_rotations(self.axis_1, sign * np.asarray(ang_1, dtype=np.float64))
+        rot2 = _axis_rotations(self.axis_2, sign * np.asarray(ang_2, dtype=np.float64))
+        rot3 = _axis_rotations(self.axis_3, sign * np.asarray(ang_3, dtype=np.float64))
+
+        return rot3 @ rot2 @ rot1
+
+    def angles_from_matrices(self, matrices):
+        """Compute the three rotation angles for many 3x3 or 3x4 transformation matrices.
+
+        Parameters
+        ----------
+        matrices : numpy.ndarray
+            Nx3x3 or Nx3x4 array of rotation matrices.
+
+        Returns
+        -------
+        angles: numpy.ndarray
+            Nx3 array of rotation angles in degrees.
+        """
+        angles = np.zeros((len(matrices), 3))
+
+        for idx, m in enumerate(matrices):
+            # Copy, some formats clip the matrix in place
+            angles[idx, 0] = self.rot1_from_matrix(np.array(m, dtype=np.float64))
+            angles[idx, 1] = self.rot2_from_matrix(np.array(m, dtype=np.float64))
+            angles[idx, 2] = self.rot3_from_matrix(np.array(m, dtype=np.float64))
+
+        return angles
+
+
+def _axis_rotations(axis, angles):
+    """Nx3x3 right-handed rotation matrices around one axis by N angles in degrees (Rodrigues' formula)."""
+    k = np.asarray(axis, dtype=np.float64)
+    k = k / np.linalg.norm(k)
+
+    kx = np.array([[0, -k[2], k[1]],
+                   [k[2], 0, -k[0]],
+                   [-k[1], k[0], 0]])
+
+    rad = np.radians(angles)
+    c = np.cos(rad)[:, np.newaxis, np.newaxis]
+    s = np.sin(rad)[:, np.newaxis, np.newaxis]
+
+    return c * np.identity(3) + s * kx + (1 - c) * np.outer(k, k)
+
+
+def zxz_angles_from_matrices(matrices, clip=False):
+    """Vectorized angle extraction for formats with ZXZ rotations (phi, theta, psi), equivalent to their
+    rot1_from_matrix, rot2_from_matrix and rot3_from_matrix methods.
+
+    Parameters
+    ----------
+    matrices : numpy.ndarray
+        Nx3x3 or Nx3x4 array of rotation matrices.
+    clip : bool
+        If true, clip the matrix entries to [-1, 1] before extraction.
+
+    Returns
+    -------
+    angles: numpy.ndarray
+        Nx3 array of rotation angles in degrees.
+    """
+    if len(matrices) == 0:
+        return np.zeros((0, 3))
+
+    m = np.array(matrices, dtype=np.float64)[:, :3, :3]
+    if clip:
+        np.clip(m, -1, 1, out=m)
+
+    # Singularity check
+    singular = m[:, 2, 2] > 0.9999
+
+    angles = np.empty((m.shape[0], 3))
+    with np.errstate(invalid="ignore"):
+        angles[:, 0] = np.where(singular, 0, np.arctan2(m[:, 2, 0], m[:, 2, 1]))
+        angles[:, 1] = np.arctan2(np.sqrt(1 - (m[:, 2, 2] * m[:, 2, 2])), m[:, 2, 2])
+        angles[:, 2] = np.where(
+            singular, -1.0 * np.sign(m[:, 0, 1]) * np.arccos(m[:, 0, 0]), np.arctan2(m[:, 0, 2], -m[:, 1, 2])
+        )
+
+    return angles * 180.0 / np.pi
+
 
 class Particle(State):
     """
@@ -587,6 +689,21 @@ class ParticleData(State):
 
         return particle
 
+    def new_particles(self, count):
+        """Creates many new :class:.Particle instances and adds them to the list.
+
+        Parameters
+        ----------
+        count : int
+            Number of particles to create.
+
+        Returns
+        -------
+        particles : list of Particle
+            The new particle instances.
+        """
+        return [self.new_particle() for i in range(count)]
+
     def _store_orig_particles(self):
         for _id, part in self:
             from copy import copy
@@ -629,7 +746,7 @@ class ParticleData(State):
         self._particles.pop(_id)
 
     def delete_particles(self, ids):
-        """Delete particles corresponding to ids.
+        """Delete particles corresponding to ids. IDs that are not present are ignored.
 
         Parameters
         ----------
@@ -637,7 +754,7 @@ class ParticleData(State):
             The IDs of the particles to delete.
         """
         for _id in ids:
-            self._particles.pop(_id)
+            self._particles.pop(_id, None)
 
     def get_main_attributes(self):
         """Returns a list of the main attributes of a particle in this list."""
@@ -715,7 +832,7 @@ class ParticleData(State):
         if isinstance(item, str):
             return item in self._particles.keys()
         elif isinstance(item, Particle):
-            return item in self._particles.values()
+            return self._particles.get(item.id) is item
 
     def read_file(self):
         pass
@@ -78,6 +78,38 @@ class RELIONEulerRotation(EulerRotation):
 
         return sign_sb
 
+    def angles_from_matrices(self, matrices):
+        """Vectorized version of rot1_from_matrix, rot2_from_matrix and rot3_from_matrix (Nx3 array of angles)."""
+        if len(matrices) == 0:
+            return np.zeros((0, 3))
+
+        m = np.asarray(matrices, dtype=np.float64)[:, :3, :3]
+
+        abs_sb = np.sqrt(m[:, 0, 2] * m[:, 0, 2] + m[:, 1, 2] * m[:, 1, 2])
+        regular = abs_sb > EPSILON16
+        positive = np.sign(m[:, 2, 2]) > 0
+
+        # Sign of rot2, see _sign_rot2
+        rot3 = np.arctan2(m[:, 1, 2], -m[:, 0, 2])
+        sin3 = np.sin(rot3)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sign_sb = np.where(
+                np.abs(sin3) < EPSILON,
+                np.sign(-m[:, 0, 2] / np.cos(rot3)),
+                np.where(sin3 > 0, np.sign(m[:, 1, 2]), -np.sign(m[:, 1, 2])),
+            )
+
+        angles = np.empty((m.shape[0], 3))
+        angles[:, 0] = np.where(regular, np.arctan2(m[:, 2, 1], m[:, 2, 0]), 0)
+        angles[:, 1] = np.where(regular, np.arctan2(sign_sb * abs_sb, m[:, 2, 2]), np.where(positive, 0, np.pi))
+        angles[:, 2] = np.where(
+            regular,
+            rot3,
+            np.where(positive, np.arctan2(-m[:, 1, 0], m[:, 0, 0]), np.arctan2(m[:, 1, 0], -m[:, 0, 0])),
+        )
+
+        return angles * 180.0 / np.pi
+
 
 
 
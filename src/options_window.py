@@ -94,6 +94,12 @@ class OptionsWindow(ToolInstance):
         # Icon path
         self.iconpath = Path(__file__).parent / 'icons'
 
+        # Particle list shown in the options tabs
+        self._partlist_handler = None
+        """PARTLIST_CHANGED handler of the particle list shown in the options tabs."""
+        self._partlist_ui_state = {}
+        """Particle list state the options tabs currently show, by field."""
+
         # Build the user interfaces
         self._build_tomo_widget()
         self._build_geomodel_widget()
@@ -235,11 +241,19 @@ class OptionsWindow(ToolInstance):
             self.tabs.widget(2).setEnabled(True)
             self.tabs.widget(3).setEnabled(True)
 
-            # Update the ui
+            # Update the ui, all fields for a new list
+            if self._partlist_handler is None or self._partlist_handler[0] is not cpl:
+                self._partlist_ui_state = {}
             self._update_partlist_ui()
 
+            # Only listen to the shown list
             from .particle.ParticleList import PARTLIST_CHANGED
-            cpl.triggers.add_handler(PARTLIST_CHANGED, self._partlist_changed)
+            if self._partlist_handler is not None:
+                pl, handler = self._partlist_handler
+                if not pl.deleted:
+                    pl.triggers.remove_handler(handler)
+
+            self._partlist_handler = (cpl, cpl.triggers.add_handler(PARTLIST_CHANGED, self._partlist_changed))
 
         elif obj == "geomodel":
             geomodel = artia.geomodels.get(artia.options_geomodel)
@@ -1221,48 +1235,94 @@ class OptionsWindow(ToolInstance):
         artia = self.session.ArtiaX
         pl = artia.partlists.get(artia.options_partlist)
 
+        # Only fields whose state differs from the shown state are updated
+        state = self._partlist_state(pl)
+        changed = {key for key, value in state.items() if self._partlist_ui_state.get(key, None) != value}
+        self._partlist_ui_state = state
+
         # Toolbar
-        self.part_toolbar_1.set_name(pl)
-        self.part_toolbar_2.set_name(pl)
-        self.part_toolbar_3.set_name(pl)
-        self.translation_lock_button_1.setState(pl.translation_locked)
-        self.translation_lock_button_2.setState(pl.translation_locked)
-        self.translation_lock_button_3.setState(pl.translation_locked)
-        self.rotation_lock_button_1.setState(pl.rotation_locked)
-        self.rotation_lock_button_2.setState(pl.rotation_locked)
-        self.rotation_lock_button_3.setState(pl.rotation_locked)
+        if 'name' in changed:
+            self.part_toolbar_1.set_name(pl)
+            self.part_toolbar_2.set_name(pl)
+            self.part_toolbar_3.set_name(pl)
+
+        if 'locks' in changed:
+            self.translation_lock_button_1.setState(pl.translation_locked)
+            self.translation_lock_button_2.setState(pl.translation_locked)
+            self.translation_lock_button_3.setState(pl.translation_locked)
+            self.rotation_lock_button_1.setState(pl.rotation_locked)
+            self.rotation_lock_button_2.setState(pl.rotation_locked)
+            self.rotation_lock_button_3.setState(pl.rotation_locked)
 
         # Set new list
-        self.partlist_selection.clear(trigger_update=False)
-        self.partlist_selection.set_partlist(pl)
-        self.color_selection.set_partlist(pl)
+        if 'selection' in changed:
+            self.partlist_selection.clear(trigger_update=False)
+            self.partlist_selection.set_partlist(pl)
+
+        if 'color' in changed:
+            self.color_selection.set_partlist(pl)
 
         # Set sliders
-        self.radius_widget.value = pl.radius
-        prev = self.axes_size_widget.blockSignals(True)
-        self.axes_size_widget.value = pl.axes_size
-        self.axes_size_widget.blockSignals(prev)
-
-        if pl.has_display_model() and pl.display_is_volume():
-            self.surface_level_widget.setEnabled(True)
-            self.surface_level_widget.set_range(range=pl.surface_range, value=pl.surface_level)
-        else:
-            self.surface_level_widget.setEnabled(False)
+        if 'radius' in changed:
+            self.radius_widget.value = pl.radius
+
+        if 'axes_size' in changed:
+            prev = self.axes_size_widget.blockSignals(True)
+            self.axes_size_widget.value = pl.axes_size
+            self.axes_size_widget.blockSignals(prev)
+
+        if 'surface_level' in changed:
+            if pl.has_display_model() and pl.display_is_volume():
+                self.surface_level_widget.setEnabled(True)
+                self.surface_level_widget.set_range(range=pl.surface_range, value=pl.surface_level)
+            else:
+                self.surface_level_widget.setEnabled(False)
 
         # Pixelsize
-        self.pf_edit_ori.setText(str(pl.origin_pixelsize))
-        self.pf_edit_tra.setText(str(pl.translation_pixelsize))
+        if 'pixelsize' in changed:
+            self.pf_edit_ori.setText(str(pl.origin_pixelsize))
+            self.pf_edit_tra.setText(str(pl.translation_pixelsize))
 
         # Path of display model
+        if 'display_model' in changed:
+            if pl.has_display_model():
+                dpm = pl.display_model.get(0)
+                if dpm.data.path is None:
+                    self.browse_edit.setText('')
+                else:
+                    self.current_surface_label.setText('Current Surface: #{} - {}'.format(dpm.id_string, dpm.name))
+                    self.browse_edit.setText(dpm.data.path)
+            else:
+                self.browse_edit.setText('')
+
+    @staticmethod
+    def _partlist_state(pl):
+        """State of a particle list shown by each field of the options tabs."""
+        attributes = pl.get_main_attributes()
+        minima = [float(v) for v in pl.get_attribute_min(attributes)]
+        maxima = [float(v) for v in pl.get_attribute_max(attributes)]
+
+        display_model = None
+        surface_level = None
         if pl.has_display_model():
             dpm = pl.display_model.get(0)
-            if dpm.data.path is None:
-                self.browse_edit.setText('')
-            else:
-                self.current_surface_label.setText('Current Surface: #{} - {}'.format(dpm.id_string, dpm.name))
-                self.browse_edit.setText(dpm.data.path)
-        else:
-            self.browse_edit.setText('')
+            display_model = (dpm.id_string, dpm.name, dpm.data.path)
+
+            if pl.display_is_volume():
+                surface_level = (tuple(pl.surface_range), pl.surface_level)
+
+        return {
+            'name': (pl.id_string, pl.name),
+            'locks': (pl.translation_locked, pl.rotation_locked),
+            'selection': (tuple(attributes), tuple(minima), tuple(maxima)),
+            'color': (tuple(attributes), tuple(minima), tuple(maxima),
+                      repr(pl.color_settings), tuple(int(c) for c in pl.color)),
+            'radius': pl.radius,
+            'axes_size': pl.axes_size,
+            'surface_level': (display_model is not None, surface_level),
+            'pixelsize': (pl.origin_pixelsize, pl.translation_pixelsize),
+            'display_model': display_model,
+        }
 
     def _partlist_changed(self, name, model):
         artia = self.session.ArtiaX
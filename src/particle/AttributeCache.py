@@ -0,0 +1,332 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+from itertools import islice
+import numpy as np
+
+
+class AttributeCache:
+    """
+    An AttributeCache holds the values of particle attributes as numpy columns in particle order, together with sorted
+    indices and summary statistics per attribute, and the row of each particle ID.
+
+    Columns are only built for attributes that were requested. Afterwards they are kept up to date incrementally: the
+    owning ParticleList reports appended, changed and deleted particles, which are applied on the next access by reading
+    only the affected particles.
+    """
+
+    HISTOGRAM_BINS = 64
+
+    def __init__(self, data):
+        self._data = data
+        """The ParticleData the columns are read from."""
+        self._columns = {}
+        """Maps attribute name -> 1D float array of values in particle order."""
+        self._order = {}
+        """Maps attribute name -> (argsort indices, sorted values)."""
+        self._stats = {}
+        """Maps attribute name -> dict of running statistics."""
+        self._rows = None
+        """Maps particle id -> row. None if it needs to be rebuilt."""
+        self._appended = 0
+        """Number of particles appended since the last update."""
+        self._changed = set()
+        """IDs of particles modified since the last update."""
+        self.version = 0
+        """Incremented on every change notification."""
+
+    @property
+    def size(self):
+        return self._data.size
+
+    # ==============================================================================
+    # Change notifications =========================================================
+    # ==============================================================================
+    def appended(self, count=1):
+        """Particles were added to the end of the list."""
+        self._appended += count
+        self.version += 1
+
+    def changed(self, particle_ids):
+        """Attributes of these particles were modified."""
+        self._changed.update(particle_ids)
+        self.version += 1
+
+    def deleted(self, keep):
+        """
+        Particles were deleted. Call update() before deleting from the ParticleData.
+
+        Parameters
+        ----------
+        keep : numpy.ndarray
+            Boolean mask over the rows before deletion, True for remaining particles.
+        """
+        if not np.any(~keep):
+            return
+
+        self.version += 1
+
+        for attr, col in self._columns.items():
+            if attr in self._stats:
+                self._remove_values(attr, col[~keep])
+            self._columns[attr] = col[keep]
+
+        # Compress sorted indices instead of sorting again
+        new_index = np.cumsum(keep) - 1
+        for attr, (order, values) in self._order.items():
+            remaining = keep[order]
+            self._order[attr] = (new_index[order[remaining]], values[remaining])
+
+        self._rows = None
+
+    def clear(self):
+        """Drop everything, e.g. after all particles were modified."""
+        self.version += 1
+        self._columns.clear()
+        self._order.clear()
+        self._stats.clear()
+        self._rows = None
+        self._appended = 0
+        self._changed.clear()
+
+    # ==============================================================================
+    # Queries ======================================================================
+    # ==============================================================================
+    def column(self, attr):
+        """Values of one attribute for all particles (1D float array)."""
+        self.update()
+
+        if attr not in self._columns:
+            self._columns[attr] = self._read(attr, self._data._particles.values(), self.size)
+
+        return self._columns[attr]
+
+    def order(self, attr):
+        """Tuple (argsort indices, sorted values) of one attribute."""
+        col = self.column(attr)
+
+        if attr not in self._order:
+            order = np.argsort(col, kind="stable")
+            self._order[attr] = (order, col[order])
+
+        return self._order[attr]
+
+    def rows(self, particle_ids):
+        """Rows of the particles with these IDs."""
+        rows = self._row_map()
+        return np.fromiter((rows[pid] for pid in particle_ids), dtype=np.int64, count=len(particle_ids))
+
+    def row(self, particle_id):
+        """Row of the particle with this ID."""
+        return self._row_map()[particle_id]
+
+    def _row_map(self):
+        self.update()
+
+        if self._rows is None:
+            self._rows = {pid: idx for idx, pid in enumerate(self._data._particles.keys())}
+
+        return self._rows
+
+    def statistics(self, attr):
+        """
+        Summary statistics of one attribute.
+
+        Returns
+        -------
+        stats : dict
+            Keys 'min', 'max', 'mean', 'var', 'std' and 'count'.
+        """
+        col = self.column(attr)
+        count = col.shape[0]
+
+        if count == 0:
+            return {"min": 0, "max": 0, "mean": 0, "var": 0, "std": 0, "count": 0}
+
+        # Sums are kept relative to a shift close to the mean to avoid cancellation, and recomputed from the column
+        # once as many values were edited as there are particles, so that rounding errors don't accumulate.
+        if attr not in self._stats or self._stats[attr]["edits"] > count:
+            hist = self._stats[attr]["hist"] if attr in self._stats else None
+            shift = col.mean()
+            centered = col - shift
+            self._stats[attr] = {
+                "min": col.min(),
+                "max": col.max(),
+                "shift": shift,
+                "sum": centered.sum(),
+                "sumsq": np.dot(centered, centered),
+                "edits": 0,
+                "hist": hist,
+            }
+
+        s = self._stats[attr]
+        if s["min"] is None:
+            s["min"] = col.min()
+        if s["max"] is None:
+            s["max"] = col.max()
+
+        offset = s["sum"] / count
+        var = max(s["sumsq"] / count - offset * offset, 0.0)
+
+        return {
+            "min": s["min"],
+            "max": s["max"],
+            "mean": s["shift"] + offset,
+            "var": var,
+            "std": np.sqrt(var),
+            "count": count,
+        }
+
+    def histogram(self, attr):
+        """
+        Fixed-bin histogram of one attribute over its current range.
+
+        Returns
+        -------
+        counts, edges : numpy.ndarray, numpy.ndarray
+        """
+        self.statistics(attr)
+        col = self.column(attr)
+
+        s = self._stats.get(attr)
+        if s is None:
+            return np.histogram(col, bins=self.HISTOGRAM_BINS)
+
+        if s["hist"] is None:
+            s["hist"] = np.histogram(col, bins=self.HISTOGRAM_BINS)
+
+        return s["hist"]
+
+    def quantiles(self, attr, qs):
+        """
+        Quantiles of one attribute (linear interpolation), read from the cached sorted values.
+
+        Parameters
+        ----------
+        attr : str
+            Attribute name.
+        qs : array-like
+            Quantiles between 0 and 1.
+
+        Returns
+        -------
+        values : numpy.ndarray
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        values = self.order(attr)[1]
+        count = values.shape[0]
+
+        if count == 0:
+            return np.zeros(qs.shape)
+
+        pos = qs * (count - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, count - 1)
+
+        return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+    # ==============================================================================
+    # Incremental updates ==========================================================
+    # ==============================================================================
+    def update(self):
+        """Apply pending changes to all cached columns."""
+        if self._appended > 0:
+            self._apply_appended()
+
+        if len(self._changed) > 0:
+            self._apply_changed()
+
+    def _apply_appended(self):
+        n = self._appended
+        self._appended = 0
+
+        if len(self._columns) == 0 and self._rows is None:
+            return
+
+        new = list(islice(reversed(self._data._particles.values()), n))[::-1]
+        start = self.size - len(new)
+
+        for attr, col in self._columns.items():
+            values = self._read(attr, new, len(new))
+            self._columns[attr] = np.concatenate((col, values))
+            self._order.pop(attr, None)
+
+            if attr in self._stats:
+                self._add_values(attr, values)
+
+        if self._rows is not None:
+            for idx, p in enumerate(new):
+                self._rows[p.id] = start + idx
+
+    def _apply_changed(self):
+        ids = [pid for pid in self._changed if pid in self._data]
+        self._changed.clear()
+
+        if len(self._columns) == 0 or len(ids) == 0:
+            return
+
+        rows = self.rows(ids)
+        particles = [self._data[pid] for pid in ids]
+
+        for attr, col in self._columns.items():
+            new = self._read(attr, particles, len(particles))
+            old = col[rows]
+
+            diff = new != old
+            if not np.any(diff):
+                continue
+
+            col[rows] = new
+            self._order.pop(attr, None)
+
+            if attr in self._stats:
+                self._remove_values(attr, old[diff])
+                self._add_values(attr, new[diff])
+
+    def _add_values(self, attr, values):
+        if values.shape[0] == 0:
+            return
+
+        s = self._stats[attr]
+        centered = values - s["shift"]
+        s["sum"] += centered.sum()
+        s["sumsq"] += np.dot(centered, centered)
+        s["edits"] += values.shape[0]
+
+        if s["min"] is not None:
+            s["min"] = min(s["min"], values.min())
+        if s["max"] is not None:
+            s["max"] = max(s["max"], values.max())
+
+        if s["hist"] is not None:
+            counts, edges = s["hist"]
+            if values.min() >= edges[0] and values.max() <= edges[-1]:
+                counts += np.histogram(values, bins=edges)[0]
+            else:
+                s["hist"] = None
+
+    def _remove_values(self, attr, values):
+        if values.shape[0] == 0:
+            return
+
+        s = self._stats[attr]
+        centered = values - s["shift"]
+        s["sum"] -= centered.sum()
+        s["sumsq"] -= np.dot(centered, centered)
+        s["edits"] += values.shape[0]
+
+        # Extremes need to be recomputed only if they were removed, the histogram range then shrinks with them
+        if s["min"] is not None and values.min() <= s["min"]:
+            s["min"] = None
+            s["hist"] = None
+        if s["max"] is not None and values.max() >= s["max"]:
+            s["max"] = None
+            s["hist"] = None
+
+        if s["hist"] is not None:
+            counts, edges = s["hist"]
+            counts -= np.histogram(values, bins=edges)[0]
+
+    @staticmethod
+    def _read(attr, particles, count):
+        return np.fromiter((p[attr] for p in particles), dtype=np.float64, count=count)
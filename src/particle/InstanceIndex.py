@@ -0,0 +1,302 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+
+class InstanceIndex:
+    """
+    An InstanceIndex bins instance origins into a uniform grid, so that the instances close to a ray or within a set of
+    planes can be found without testing every instance.
+
+    Moving instances does not rebuild the grid. Moved instances are taken out of their cells and tested exhaustively
+    until more than REBUILD_FRACTION of all instances have moved, at which point the grid is rebuilt.
+    """
+
+    POINTS_PER_CELL = 8
+    """Average number of instances per occupied cell the grid is sized for."""
+    REBUILD_FRACTION = 0.1
+    """Fraction of moved instances above which the grid is rebuilt."""
+
+    def __init__(self, coords, min_cell_size=0):
+        self._coords = np.array(coords, dtype=np.float64).reshape((-1, 3))
+        """Instance origins in instance order."""
+        self._min_cell_size = min_cell_size
+        """Lower limit of the cell size, e.g. the instance radius."""
+        self._build()
+
+    def __len__(self):
+        return self._coords.shape[0]
+
+    @property
+    def coords(self):
+        """Instance origins (Nx3), must not be modified."""
+        return self._coords
+
+    # ==============================================================================
+    # Maintenance ==================================================================
+    # ==============================================================================
+    def _build(self):
+        coords = self._coords
+        count = coords.shape[0]
+
+        self._moved = np.zeros((count,), dtype=bool)
+        """True for instances that are not in the grid anymore."""
+        self._moved_rows = np.zeros((0,), dtype=np.int64)
+        """Rows of moved instances."""
+
+        if count == 0:
+            self._origin = np.zeros((3,))
+            self._cell = max(self._min_cell_size, 1.0)
+            self._dims = np.ones((3,), dtype=np.int64)
+            self._order = np.zeros((0,), dtype=np.int64)
+            self._keys = np.zeros((0,), dtype=np.int64)
+            return
+
+        lo = coords.min(axis=0)
+        extent = np.maximum(coords.max(axis=0) - lo, 1e-6)
+        cell = max(self._grid_cell(extent, count), float(extent.max()) / 1024, 1e-6)
+
+        self._origin = lo
+        """Lower corner of the grid."""
+        self._cell = cell
+        """Edge length of the cubic cells."""
+        self._dims = np.floor(extent / cell).astype(np.int64) + 1
+        """Number of cells along x, y and z."""
+
+        keys = self._cell_keys(coords)
+        self._order = np.argsort(keys, kind="stable")
+        """Rows sorted by cell."""
+        self._keys = keys[self._order]
+        """Sorted cell keys."""
+
+    def _grid_cell(self, extent, count):
+        # Cell size for about POINTS_PER_CELL instances per cell if they filled the bounding box
+        cell = (np.prod(extent) * self.POINTS_PER_CELL / count) ** (1 / 3)
+        return max(cell, self._min_cell_size)
+
+    def _cell_indices(self, points):
+        return np.floor((points - self._origin) / self._cell).astype(np.int64)
+
+    def _cell_keys(self, points):
+        c = self._cell_indices(points)
+        return (c[:, 0] * self._dims[1] + c[:, 1]) * self._dims[2] + c[:, 2]
+
+    def move(self, rows, coords):
+        """Set the origins of the instances at rows."""
+        rows = np.asarray(rows, dtype=np.int64)
+        self._coords[rows] = coords
+
+        new = rows[~self._moved[rows]]
+        if len(new) == 0:
+            return
+
+        self._moved[new] = True
+        self._moved_rows = np.concatenate((self._moved_rows, np.unique(new)))
+
+        if len(self._moved_rows) > self.REBUILD_FRACTION * len(self):
+            self._build()
+
+    def append(self, coords):
+        """Add instances at the end."""
+        coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+        start = len(self)
+
+        self._coords = np.concatenate((self._coords, coords))
+        self._moved = np.concatenate((self._moved, np.zeros((len(coords),), dtype=bool)))
+        self.move(np.arange(start, start + len(coords)), coords)
+
+    # ==============================================================================
+    # Queries ======================================================================
+    # ==============================================================================
+    def _rows_in_cells(self, cells):
+        """Rows of the (not moved) instances in the cells (Mx3 cell indices)."""
+        inside = np.all((cells >= 0) & (cells < self._dims), axis=1)
+        cells = cells[inside]
+        keys = np.unique((cells[:, 0] * self._dims[1] + cells[:, 1]) * self._dims[2] + cells[:, 2])
+
+        starts = np.searchsorted(self._keys, keys, side="left")
+        stops = np.searchsorted(self._keys, keys, side="right")
+        rows = self._order[_ranges(starts, stops)]
+
+        return rows[~self._moved[rows]]
+
+    def ray_candidates(self, xyz1, xyz2, radius, mask=None):
+        """
+        Instances whose bounding sphere around the origin intersects the segment from xyz1 to xyz2.
+
+        Parameters
+        ----------
+        xyz1, xyz2 : array-like
+            Segment end points.
+        radius : float
+            Bounding sphere radius of all instances.
+        mask : numpy.ndarray or None
+            Only consider instances that are True in mask.
+
+        Returns
+        -------
+        rows, entry : numpy.ndarray, numpy.ndarray
+            Rows, sorted by the fraction of the segment at which it enters their sphere, and these fractions.
+        """
+        p1 = np.asarray(xyz1, dtype=np.float64)
+        p2 = np.asarray(xyz2, dtype=np.float64)
+        d = p2 - p1
+        length = np.linalg.norm(d)
+
+        rows = self._moved_rows
+        if length > 0 and len(self._keys) > 0:
+            # Part of the segment within the grid, grown by the radius
+            lo = self._origin - radius
+            hi = self._origin + self._dims * self._cell + radius
+            clipped = _clip_segment(p1, d, lo, hi)
+
+            if clipped is not None:
+                t0, t1 = clipped
+                steps = max(int(np.ceil((t1 - t0) * length / self._cell)), 1)
+                samples = p1 + np.linspace(t0, t1, steps + 1)[:, np.newaxis] * d
+
+                # Cells within radius + half a step of any sample
+                reach = int(np.ceil(radius / self._cell + 0.5))
+                offsets = np.arange(-reach, reach + 1)
+                offsets = np.stack(np.meshgrid(offsets, offsets, offsets, indexing="ij"), axis=-1).reshape((-1, 3))
+                cells = np.unique(self._cell_indices(samples), axis=0)
+                cells = np.unique((cells[:, np.newaxis, :] + offsets).reshape((-1, 3)), axis=0)
+
+                rows = np.concatenate((rows, self._rows_in_cells(cells)))
+
+        if mask is not None:
+            rows = rows[mask[rows]]
+
+        if len(rows) == 0 or length == 0:
+            return np.zeros((0,), dtype=np.int64), np.zeros((0,))
+
+        # Exact sphere-segment test
+        rel = self._coords[rows] - p1
+        t = rel @ d / (length * length)
+        dist2 = np.sum(rel * rel, axis=1) - (t * length) ** 2
+        hit = dist2 <= radius * radius
+        half_chord = np.sqrt(np.maximum(radius * radius - dist2[hit], 0)) / length
+        entry = t[hit] - half_chord
+        leave = t[hit] + half_chord
+        rows = rows[hit]
+
+        on_segment = (leave >= 0) & (entry <= 1)
+        rows = rows[on_segment]
+        entry = np.maximum(entry[on_segment], 0)
+
+        order = np.argsort(entry, kind="stable")
+        return rows[order], entry[order]
+
+    def planes_mask(self, planes, mask=None):
+        """
+        Instances with origins on the positive side of all planes.
+
+        Parameters
+        ----------
+        planes : numpy.ndarray
+            Px4 array of planes (a, b, c, d), a point is inside if a*x + b*y + c*z + d >= 0.
+        mask : numpy.ndarray or None
+            Only consider instances that are True in mask.
+
+        Returns
+        -------
+        inside : numpy.ndarray
+            Boolean mask over all instances.
+        """
+        planes = np.asarray(planes, dtype=np.float64).reshape((-1, 4))
+        normals = planes[:, :3]
+        offsets = planes[:, 3]
+        result = np.zeros((len(self),), dtype=bool)
+
+        if len(self._keys) > 0:
+            # Occupied cells and their distances from the planes
+            keys, starts = np.unique(self._keys, return_index=True)
+            stops = np.append(starts[1:], len(self._keys))
+            cz = keys % self._dims[2]
+            cy = (keys // self._dims[2]) % self._dims[1]
+            cx = keys // (self._dims[2] * self._dims[1])
+            centers = self._origin + (np.stack((cx, cy, cz), axis=1) + 0.5) * self._cell
+            half = self._cell * np.sqrt(3) / 2 * np.linalg.norm(normals, axis=1)
+            dist = centers @ normals.T + offsets
+
+            # Cells entirely inside all planes are taken whole, cells crossing any plane are tested per instance
+            full = np.all(dist >= half, axis=1)
+            partial = ~full & np.all(dist >= -half, axis=1)
+
+            rows = self._order[_ranges(starts[full], stops[full])]
+            result[rows] = True
+
+            rows = self._order[_ranges(starts[partial], stops[partial])]
+            result[rows] = np.all(self._coords[rows] @ normals.T + offsets >= 0, axis=1)
+
+        # Moved instances are tested exhaustively
+        rows = self._moved_rows
+        result[rows] = np.all(self._coords[rows] @ normals.T + offsets >= 0, axis=1)
+
+        if mask is not None:
+            result &= mask
+
+        return result
+
+
+def _ranges(starts, stops):
+    """Concatenation of arange(start, stop) for all start/stop pairs."""
+    lengths = stops - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.arange(total, dtype=np.int64) + shifts
+
+
+def _clip_segment(p, d, lo, hi):
+    """Fractions (t0, t1) of the segment p + t * d, 0 <= t <= 1, within the box from lo to hi, or None."""
+    t0, t1 = 0.0, 1.0
+    for axis in range(3):
+        if d[axis] == 0:
+            if p[axis] < lo[axis] or p[axis] > hi[axis]:
+                return None
+            continue
+
+        a = (lo[axis] - p[axis]) / d[axis]
+        b = (hi[axis] - p[axis]) / d[axis]
+        t0 = max(t0, min(a, b))
+        t1 = min(t1, max(a, b))
+
+    if t0 > t1:
+        return None
+
+    return t0, t1
+
+
+def polygon_mask(points, polygon):
+    """
+    Points inside a polygon (even-odd rule).
+
+    Parameters
+    ----------
+    points : numpy.ndarray
+        Nx2 array of points.
+    polygon : numpy.ndarray
+        Mx2 array of polygon corners.
+
+    Returns
+    -------
+    inside : numpy.ndarray
+        Boolean mask over the points.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    polygon = np.asarray(polygon, dtype=np.float64)
+    x, y = points[:, 0], points[:, 1]
+    inside = np.zeros((len(points),), dtype=bool)
+
+    for (xi, yi), (xj, yj) in zip(polygon, np.roll(polygon, 1, axis=0)):
+        if yi == yj:
+            continue
+
+        crosses = ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+        inside ^= crosses
+
+    return inside
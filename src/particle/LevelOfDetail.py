@@ -0,0 +1,191 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+
+class LevelOfDetail:
+    """
+    A LevelOfDetail holds a full resolution surface and decimated versions of it at decreasing triangle budgets
+    (each level has about 1/REDUCTION of the triangles of the previous one).
+
+    Decimated levels are computed in a background thread as soon as the LevelOfDetail is created, coarsest first. Until
+    a requested level is ready, the closest coarser level that is ready is used instead (or the coarsest ready one), so
+    that drawing never waits for decimation.
+
+    Parameters
+    ----------
+    vertices, normals, triangles : numpy.ndarray
+        The full resolution surface.
+    background : bool
+        Whether to compute the decimated levels in a background thread instead of right away.
+    """
+
+    REDUCTION = 4
+    MIN_TRIANGLES = 100
+
+    def __init__(self, vertices, normals, triangles, background=True):
+        self._levels = {0: (vertices, normals, triangles)}
+        """Maps level -> (vertices, normals, triangles) for all levels that are ready."""
+
+        self._targets = [0 if triangles is None else len(triangles)]
+        """Triangle budget of each level, from finest to coarsest."""
+        while self._targets[-1] > self.MIN_TRIANGLES:
+            self._targets.append(max(self._targets[-1] // self.REDUCTION, self.MIN_TRIANGLES))
+
+        self._cancelled = False
+        """Set to stop the background thread."""
+        self._thread = None
+        """Thread computing the decimated levels."""
+
+        if vertices is not None and len(vertices) > 0:
+            self.radius = float(np.max(np.linalg.norm(vertices - vertices.mean(axis=0), axis=1)))
+        else:
+            self.radius = 0.0
+
+        if len(self._targets) > 1:
+            if background:
+                import threading
+
+                self._thread = threading.Thread(target=self._build, daemon=True)
+                self._thread.start()
+            else:
+                self._build()
+
+    @property
+    def full(self):
+        """The full resolution surface (vertices, normals, triangles)."""
+        return self._levels[0]
+
+    @property
+    def ready(self):
+        """Number of levels that are ready, changes whenever a level was added."""
+        return len(self._levels)
+
+    def cancel(self):
+        """Stop computing levels, e.g. when the surface was replaced."""
+        self._cancelled = True
+
+    def triangle_count(self, level):
+        """Number of triangles of a level, its budget if it is not ready yet."""
+        if level in self._levels:
+            return len(self._levels[level][2])
+        return self._targets[level]
+
+    def resolve(self, level):
+        """The level to display for a requested level: the level itself, the closest coarser or the coarsest ready."""
+        level = min(level, len(self._targets) - 1)
+        ready = sorted(self._levels.keys())
+
+        coarser = [lvl for lvl in ready if lvl >= level]
+        if coarser:
+            return coarser[0]
+        return ready[-1]
+
+    def get(self, level):
+        """Surface (vertices, normals, triangles) of a level, 0 being full resolution. See resolve()."""
+        return self._levels[self.resolve(level)]
+
+    def level_for(self, max_triangles):
+        """Index of the finest level with at most max_triangles triangles, or the coarsest level."""
+        for level in range(len(self._targets)):
+            if self.triangle_count(level) <= max_triangles:
+                return level
+
+        return len(self._targets) - 1
+
+    def _build(self):
+        v, n, t = self.full
+
+        # Coarsest first, those are the levels shown for many instances
+        for level in reversed(range(1, len(self._targets))):
+            if self._cancelled:
+                return
+            self._levels[level] = decimate_surface(v, n, t, self._targets[level])
+
+
+def decimate_surface(vertices, normals, triangles, max_triangles, iterations=12):
+    """
+    Reduce a triangle mesh to at most max_triangles triangles by vertex clustering on a regular grid. The finest grid
+    that satisfies the budget is found by bisection of the cell size.
+
+    Parameters
+    ----------
+    vertices : numpy.ndarray
+        Nx3 array of vertex positions.
+    normals : numpy.ndarray
+        Nx3 array of vertex normals.
+    triangles : numpy.ndarray
+        Mx3 array of vertex indices.
+    max_triangles : int
+        Triangle budget.
+    iterations : int
+        Number of bisection steps.
+
+    Returns
+    -------
+    vertices, normals, triangles : numpy.ndarray, numpy.ndarray, numpy.ndarray
+        The decimated surface.
+    """
+    if len(triangles) <= max_triangles:
+        return vertices, normals, triangles
+
+    size = float(np.max(vertices.max(axis=0) - vertices.min(axis=0)))
+    if size == 0:
+        return vertices, normals, triangles
+
+    # Cell sizes bracketing the budget: smallest edge length keeps everything, one cell removes everything
+    fine = size / 2 ** 10
+    coarse = size
+
+    best = _cluster_vertices(vertices, normals, triangles, coarse)
+    for i in range(iterations):
+        cell = np.sqrt(fine * coarse)
+        result = _cluster_vertices(vertices, normals, triangles, cell)
+
+        if len(result[2]) > max_triangles:
+            fine = cell
+        else:
+            coarse = cell
+            best = result
+
+    return best
+
+
+def _cluster_vertices(vertices, normals, triangles, cell):
+    """Merge all vertices within the same grid cell and drop degenerate and duplicate triangles."""
+    cells = np.floor((vertices - vertices.min(axis=0)) / cell).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    unique_keys, cluster = np.unique(keys, return_inverse=True)
+    cluster = cluster.ravel()
+    count = len(unique_keys)
+
+    # Triangles between clusters
+    t = cluster[triangles]
+    keep = (t[:, 0] != t[:, 1]) & (t[:, 1] != t[:, 2]) & (t[:, 0] != t[:, 2])
+    t = t[keep]
+    if len(t) > 0:
+        t = t[np.sort(np.unique(np.sort(t, axis=1), axis=0, return_index=True)[1])]
+
+    # Cluster representatives: mean positions and normals
+    weights = np.bincount(cluster, minlength=count).astype(np.float64)
+    v = np.zeros((count, 3), dtype=np.float64)
+    n = np.zeros((count, 3), dtype=np.float64)
+    for axis in range(3):
+        v[:, axis] = np.bincount(cluster, weights=vertices[:, axis], minlength=count) / weights
+        n[:, axis] = np.bincount(cluster, weights=normals[:, axis], minlength=count)
+
+    length = np.linalg.norm(n, axis=1)
+    length[length == 0] = 1
+    n /= length[:, np.newaxis]
+
+    # Drop unused vertices
+    used, t = np.unique(t, return_inverse=True)
+    t = t.reshape((-1, 3))
+
+    return (
+        v[used].astype(vertices.dtype),
+        n[used].astype(normals.dtype),
+        t.astype(triangles.dtype),
+    )
@@ -69,6 +69,36 @@ class MarkerSetPlus(MarkerSet):
             mask[idx] = True
             return mask
 
+    def _changed_atoms(self, rows):
+        """Atoms at rows, or None if setting all atoms is cheaper."""
+        if rows is None or len(rows) > len(self.atoms) // 4:
+            return None
+        return self.atoms.filter(rows)
+
+    def set_displayed_rows(self, mask, rows=None):
+        """Set display of the markers at rows (all if None) from mask."""
+        atoms = self._changed_atoms(rows)
+        if atoms is None:
+            self.atoms.displays = mask
+        else:
+            atoms.displays = mask[rows]
+
+    def set_selected_rows(self, mask, rows=None):
+        """Set selection of the markers at rows (all if None) from mask."""
+        atoms = self._changed_atoms(rows)
+        if atoms is None:
+            self.atoms.selecteds = mask
+        else:
+            atoms.selecteds = mask[rows]
+
+    def set_color_rows(self, colors, rows=None):
+        """Set colors of the markers at rows (all if None) from Nx4 colors."""
+        atoms = self._changed_atoms(rows)
+        if atoms is None:
+            self.atoms.colors = colors
+        else:
+            atoms.colors = colors[rows, :]
+
     @property
     def displayed_markers(self):
         return self.atoms.displays
@@ -153,7 +183,7 @@ class MarkerSetPlus(MarkerSet):
 
 
         if 'coord changed' in changes.atom_reasons():
-            self.triggers.activate_trigger(MARKER_MOVED, changes.modified_atoms().instances())
+            self.triggers.activate_trigger(MARKER_MOVED, changes.modified_atoms())
         if 'color changed' in changes.atom_reasons():
             self.triggers.activate_trigger(MARKER_COLOR_CHANGED, changes.modified_atoms().instances())
         if 'selected changed' in changes.atom_reasons():
@@ -190,7 +220,7 @@ class MarkerSetPlus(MarkerSet):
                 ui = self.session.ui
                 pu = ui.main_window.graphics_window.popup
                 model = '#{}, '.format(pick.atom.structure.parent.id_string)  #Ooooof
-                particle = 'particle {}/{}, '.format(self.atoms.instances().index(pick.atom)+1,
+                particle = 'particle {}/{}, '.format(self.parent.particle_index(pick.atom.particle_id)+1,
                                                      len(self.atoms))
                 position = 'x: {}, y: {}, z: {}'.format(round(pick.atom.coord[0], 2),
                                                         round(pick.atom.coord[1], 2),
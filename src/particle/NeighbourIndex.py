@@ -0,0 +1,263 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+# This package
+from .InstanceIndex import InstanceIndex, _ranges
+
+
+class NeighbourIndex(InstanceIndex):
+    """
+    A NeighbourIndex answers nearest neighbour, radius and pair queries over particle coordinates, returning rows in
+    particle order.
+
+    It uses the grid of InstanceIndex and is kept up to date the same way: moved and appended particles are taken out of
+    the grid and tested exhaustively until too many have accumulated. Deleted particles are compressed out of the grid
+    without sorting again.
+    """
+
+    MAX_REACH = 3
+    """Cells searched in each direction, radius queries reaching further use a temporary coarser grid."""
+    REGRID_QUERIES = 4096
+    """Number of query points above which radius queries much smaller than the cells use a temporary finer grid."""
+    BRUTE_FORCE_PAIRS = 2 ** 22
+    """Number of (query, moved particle) distances above which the grid is rebuilt before a query."""
+    CHUNK = 2 ** 20
+    """Number of candidate pairs handled at once."""
+
+    def __init__(self, coords, min_cell_size=0, cell_size=None):
+        self._cell_size = cell_size
+        """Fixed cell size, or None to size the cells by the particle density."""
+        super().__init__(coords, min_cell_size=min_cell_size)
+
+    def _grid_cell(self, extent, count):
+        if self._cell_size is not None:
+            return self._cell_size
+        return super()._grid_cell(extent, count)
+
+    def delete(self, keep):
+        """
+        Remove deleted particles.
+
+        Parameters
+        ----------
+        keep : numpy.ndarray
+            Boolean mask over the rows before deletion, True for remaining particles.
+        """
+        keep = np.asarray(keep, dtype=bool)
+        if np.all(keep):
+            return
+
+        new_rows = np.cumsum(keep) - 1
+        remaining = keep[self._order]
+        self._order = new_rows[self._order[remaining]]
+        self._keys = self._keys[remaining]
+        self._moved_rows = new_rows[self._moved_rows[keep[self._moved_rows]]]
+        self._moved = self._moved[keep]
+        self._coords = self._coords[keep]
+
+    # ==============================================================================
+    # Queries ======================================================================
+    # ==============================================================================
+    def query_radius(self, points, radius):
+        """
+        Particles within radius of query points.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Qx3 array of query coordinates.
+        radius : float
+            Search radius.
+
+        Returns
+        -------
+        queries, rows : numpy.ndarray, numpy.ndarray
+            Index of the query point and row of the particle, one entry per pair within radius, sorted by query point.
+        """
+        queries, rows, _ = self._radius_pairs(points, radius)
+        return queries, rows
+
+    def query_knn(self, points, k):
+        """
+        The k nearest particles of query points.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Qx3 array of query coordinates.
+        k : int
+            Number of neighbours.
+
+        Returns
+        -------
+        rows, distances : numpy.ndarray, numpy.ndarray
+            Qxk arrays of rows and distances sorted by distance. Padded with -1 and inf if there are fewer than k
+            particles.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        rows = np.full((len(points), k), -1, dtype=np.int64)
+        distances = np.full((len(points), k), np.inf)
+
+        count = min(k, len(self))
+        if count == 0 or len(points) == 0:
+            return rows, distances
+
+        # A search radius beyond the farthest corner of the bounding box finds all particles
+        lo, hi = self._coords.min(axis=0), self._coords.max(axis=0)
+        farthest = np.linalg.norm(np.maximum(np.abs(points - lo), np.abs(points - hi)), axis=1)
+
+        pending = np.arange(len(points))
+        radius = self._cell
+        while len(pending) > 0:
+            queries, found, d2 = self._radius_pairs(points[pending], radius)
+            counts = np.bincount(queries, minlength=len(pending))
+            done = (counts >= count) | (radius >= farthest[pending])
+
+            # The nearest count pairs of every finished query
+            finished = done[queries]
+            queries, found, d2 = queries[finished], found[finished], d2[finished]
+            order = np.lexsort((d2, queries))
+            queries, found, d2 = queries[order], found[order], d2[order]
+            starts = np.searchsorted(queries, queries, side="left")
+            rank = np.arange(len(queries)) - starts
+            first = rank < k
+            rows[pending[queries[first]], rank[first]] = found[first]
+            distances[pending[queries[first]], rank[first]] = np.sqrt(d2[first])
+
+            pending = pending[~done]
+            radius *= 2
+
+        return rows, distances
+
+    def pairs(self, radius):
+        """
+        All pairs of particles within radius of each other.
+
+        Parameters
+        ----------
+        radius : float
+            Maximum distance.
+
+        Returns
+        -------
+        pairs : numpy.ndarray
+            Mx2 array of rows (i, j) with i < j, sorted by i, then j.
+        """
+        empty = np.zeros((0, 2), dtype=np.int64)
+        if len(self) < 2 or radius < 0:
+            return empty
+
+        # A grid with cells as large as the radius, without moved particles. Each pair of neighbouring cells is visited
+        # once, walking the particles in cell order so that the binary searches run over sorted keys.
+        grid = NeighbourIndex(self._coords, cell_size=max(radius, 1e-6))
+        keys, order = grid._keys, grid._order
+        cells = grid._cell_indices(self._coords[order])
+        position = np.arange(len(order))
+        r2 = radius * radius
+
+        first, second = [], []
+        for offset in _HALF_NEIGHBOURHOOD:
+            valid = np.nonzero(np.all((cells + offset >= 0) & (cells + offset < grid._dims), axis=1))[0]
+            shifted = keys[valid] + (offset[0] * grid._dims[1] + offset[1]) * grid._dims[2] + offset[2]
+            starts = np.searchsorted(keys, shifted, side="left")
+            stops = np.searchsorted(keys, shifted, side="right")
+
+            # Pairs within one cell are found twice
+            if offset == (0, 0, 0):
+                starts = np.maximum(starts, valid + 1)
+                stops = np.maximum(stops, starts)
+
+            for chunk in range(0, len(valid), self.CHUNK):
+                c = slice(chunk, chunk + self.CHUNK)
+                lengths = stops[c] - starts[c]
+                a = order[np.repeat(position[valid[c]], lengths)]
+                b = order[_ranges(starts[c], stops[c])]
+
+                d = self._coords[a] - self._coords[b]
+                within = np.sum(d * d, axis=1) <= r2
+                first.append(a[within])
+                second.append(b[within])
+
+        if not first:
+            return empty
+
+        a = np.concatenate(first)
+        b = np.concatenate(second)
+        i, j = np.minimum(a, b), np.maximum(a, b)
+        order = np.lexsort((j, i))
+        return np.stack((i[order], j[order]), axis=1)
+
+    def _radius_pairs(self, points, radius):
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        empty = np.zeros((0,), dtype=np.int64)
+        if len(points) == 0 or len(self) == 0 or radius < 0:
+            return empty, empty, np.zeros((0,))
+
+        # Searching far beyond the cells is cheaper on a coarser grid, many small searches on a finer one
+        reach = int(np.ceil(radius / self._cell))
+        coarse = reach > self.MAX_REACH
+        fine = 2 * radius < self._cell and len(points) >= self.REGRID_QUERIES
+        if self._cell_size is None and radius > 0 and (coarse or fine):
+            return NeighbourIndex(self._coords, cell_size=radius)._radius_pairs(points, radius)
+        reach = max(reach, 1)
+
+        if len(self._moved_rows) * len(points) > self.BRUTE_FORCE_PAIRS:
+            self._build()
+
+        r2 = radius * radius
+        queries, rows, d2 = [], [], []
+
+        def collect(q, r):
+            for start in range(0, len(q), self.CHUNK):
+                qc, rc = q[start:start + self.CHUNK], r[start:start + self.CHUNK]
+                d = self._coords[rc] - points[qc]
+                dist2 = np.sum(d * d, axis=1)
+                within = dist2 <= r2
+                queries.append(qc[within])
+                rows.append(rc[within])
+                d2.append(dist2[within])
+
+        if len(self._keys) > 0:
+            # Cells that can hold a particle within radius
+            offsets = np.arange(-reach, reach + 1)
+            offsets = np.stack(np.meshgrid(offsets, offsets, offsets, indexing="ij"), axis=-1).reshape((-1, 3))
+            gap = np.linalg.norm(np.maximum(np.abs(offsets) - 1, 0), axis=1) * self._cell
+            offsets = offsets[gap <= radius]
+
+            # Query points sorted by cell, so that the binary searches run over sorted keys
+            cells = self._cell_indices(points)
+            by_cell = np.lexsort((cells[:, 2], cells[:, 1], cells[:, 0]))
+            cells = cells[by_cell]
+
+            for offset in offsets:
+                c = cells + offset
+                q = np.nonzero(np.all((c >= 0) & (c < self._dims), axis=1))[0]
+                keys = (c[q, 0] * self._dims[1] + c[q, 1]) * self._dims[2] + c[q, 2]
+                q = by_cell[q]
+                starts = np.searchsorted(self._keys, keys, side="left")
+                stops = np.searchsorted(self._keys, keys, side="right")
+
+                r = self._order[_ranges(starts, stops)]
+                q = np.repeat(q, stops - starts)
+                in_grid = ~self._moved[r]
+                collect(q[in_grid], r[in_grid])
+
+        # Moved particles are tested exhaustively
+        moved = self._moved_rows
+        if len(moved) > 0:
+            collect(np.repeat(np.arange(len(points)), len(moved)), np.tile(moved, len(points)))
+
+        queries = np.concatenate(queries) if queries else empty
+        rows = np.concatenate(rows) if rows else empty
+        d2 = np.concatenate(d2) if d2 else np.zeros((0,))
+
+        order = np.lexsort((rows, queries))
+        return queries[order], rows[order], d2[order]
+
+
+_HALF_NEIGHBOURHOOD = [(0, 0, 0)] + [
+    (x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1) if (x, y, z) > (0, 0, 0)
+]
+"""The own cell and half of the neighbouring cells, such that each pair of neighbouring cells is visited once."""
@@ -17,6 +17,8 @@ from chimerax.graphics import Drawing
 from ..volume import VolumePlus
 from ..util import ManagerModel
 from ..io.ParticleData import ParticleData
+from .AttributeCache import AttributeCache
+from .SlabIndex import SlabIndex
 from .SurfaceCollectionModel import (
     SurfaceCollectionModel,
     MODELS_MOVED,
@@ -52,6 +54,7 @@ class ParticleList(Model):
         session,
         data: ParticleData,
         create_managers=True,
+        state=None,
     ):
 
         super().__init__(name, session)
@@ -129,16 +132,40 @@ class ParticleList(Model):
             self._radius = 4 * self.origin_pixelsize
             self._axes_size = 15 * self.origin_pixelsize
 
-        self._marker_cache = []
+        self._marker_cache = set()
+        """Markers deleted by delete_data, their MARKER_DELETED notifications are ignored."""
+
+        # Cached attribute columns and statistics
+        self._attribute_cache = AttributeCache(self._data)
+        """Columnar attribute values, sorted indices and statistics, updated incrementally."""
+
+        # Display only particles close to a tomogram slab
+        self._slab_culling = None
+        """Tuple (tomogram, distance, trigger handlers) while slab culling is on."""
+        self._slab_index = None
+        """SlabIndex of the particle coordinates along the slab normal."""
+        self._slab_key = None
+        """State the SlabIndex was built for."""
+        self._in_slab = None
+        """Particles within the slab. Boolean mask or None."""
+
+        # Neighbour queries
+        self._neighbour_index = None
+        """NeighbourIndex of the particle coordinates, None until first requested or after all particles changed."""
 
         # Initialize the surface collection model
         self._init_collection_model()
 
         # Initial particles if read from file
-        self._init_particles()
+        self._init_particles(state=state)
 
         # Initial color
-        self.color = get_unused_color(self.session)
+        if state is None or state["colors"] is None:
+            self.color = get_unused_color(self.session)
+        else:
+            # Particle colors were restored already
+            Model.set_color(self, state["colors"][0, :])
+            self.store_marker_information()
 
         # Change trigger for UI
         self.triggers.add_trigger(PARTLIST_CHANGED)
@@ -188,9 +215,6 @@ class ParticleList(Model):
             # Initialize only the particles.
             self._init_particles(markers=False)
 
-            # Set the colors
-            self._collection_model.colors = self.particle_colors
-
         return self._collection_model
 
     def _init_collection_model(self):
@@ -308,6 +332,7 @@ class ParticleList(Model):
                 base_model.surfaces[0].vertices,
                 base_model.surfaces[0].normals,
                 base_model.surfaces[0].triangles,
+                level_of_detail=True,
             )
 
     @property
@@ -316,41 +341,18 @@ class ParticleList(Model):
 
     @selected_particles.setter
     def selected_particles(self, value):
-        from numpy import all, size
-
         # Attempting to set for empty list
         if self.size == 0:
             self._selected_particles = None
             return
 
-        #  None value expanded to array
-        if value is None:
-            from numpy import zeros
-
-            value = zeros((self.size,), dtype=bool)
-
-        # Current state is equal to list
-        if self.size == size(self._selected_particles):
-            # Value same size as list
-            if size(value) == self.size and all(self._selected_particles == value):
-                return
-
-            # One value for all
-            if size(value) == 1 and all(self._selected_particles == value):
-                return
-
-        # Otherwise, set
-        if size(value) == 1:
-            from numpy import full
-
-            value = full((self.size,), value)
-
-        from numpy import copy
-
-        self._selected_particles = copy(value)
+        self._selected_particles, rows = _update_buffer(self._selected_particles, value, (self.size,), bool)
+        if rows is not None and len(rows) == 0:
+            return
 
-        self.markers.selected_markers = copy(value)
-        self.collection_model.selected_child_positions = copy(value)
+        # Markers copy the changed values, the collections share the buffer
+        self.markers.set_selected_rows(self._selected_particles, rows)
+        self.collection_model.share_selected_child_positions(self._selected_particles)
 
     @property
     def displayed_particles(self):
@@ -358,41 +360,153 @@ class ParticleList(Model):
 
     @displayed_particles.setter
     def displayed_particles(self, value):
-        from numpy import all, size
-
         # Attempting to set for empty list
         if self.size == 0:
             self._displayed_particles = None
             return
 
-        # None value expanded to array
-        if value is None:
-            from numpy import zeros
+        self._displayed_particles, rows = _update_buffer(self._displayed_particles, value, (self.size,), bool)
+
+        slab_rows = self._update_slab()
+        if self._slab_culling is not None:
+            rows = None if rows is None or slab_rows is None else np.union1d(rows, slab_rows)
+
+        if rows is not None and len(rows) == 0:
+            return
+
+        self._apply_display(rows)
+
+    def _apply_display(self, rows=None):
+        """Display particles that are displayed and, with slab culling, within the slab. Marker updates are limited to
+        rows if given."""
+        displayed = self._displayed_particles
+        if displayed is None:
+            return
 
-            value = zeros((self.size,), dtype=bool)
+        if self._in_slab is not None:
+            displayed = np.logical_and(displayed, self._in_slab)
 
-        # Current state is equal to list
-        if self.size == size(self._displayed_particles):
-            # Value same size as list, all equal
-            if size(value) == self.size and all(self._displayed_particles == value):
-                return
+        self.markers.set_displayed_rows(displayed, rows)
+        self.collection_model.set_displayed_rows(displayed, rows)
 
-            # One value for all, all equal
-            if size(value) == 1 and all(self._displayed_particles == value):
-                return
+    # ==============================================================================
+    # Slab culling =================================================================
+    # ==============================================================================
+    @property
+    def slab_distance(self):
+        """Distance from the tomogram slab within which particles are displayed, or None if slab culling is off."""
+        if self._slab_culling is None:
+            return None
+        return self._slab_culling[1]
+
+    def set_slab_culling(self, tomogram, distance=None):
+        """
+        Display only particles within distance of the current slab of a tomogram. The displayed particles follow the
+        slab when it is moved.
+
+        Parameters
+        ----------
+        tomogram : Tomogram or None
+            Tomogram whose slab to follow. None turns slab culling off.
+        distance : float
+            Maximum distance from the slab plane (Angstrom).
+        """
+        if self._slab_culling is not None:
+            old, d, handlers = self._slab_culling
+            if not old.deleted:
+                for h in handlers:
+                    old.triggers.remove_handler(h)
+
+        self._slab_culling = None
+        self._slab_index = None
+        self._slab_key = None
+        self._in_slab = None
+
+        if tomogram is not None:
+            from ..volume.VolumePlus import RENDERING_OPTIONS_CHANGED
+
+            handlers = [
+                tomogram.triggers.add_handler(RENDERING_OPTIONS_CHANGED, self._slab_moved),
+                tomogram.triggers.add_handler("deleted", self._slab_tomogram_deleted),
+            ]
+            self._slab_culling = (tomogram, distance, handlers)
+            self._update_slab()
+
+        self._apply_display()
+
+    def _slab_range(self):
+        """Normal and distance range of the slab in particle list coordinates."""
+        tomogram, distance, handlers = self._slab_culling
+
+        # Slab in tomogram coordinates: normal . x = offset
+        normal = np.array(tomogram.normal, dtype=np.float64)
+        offset = tomogram.slab_position
+
+        # Same plane for particle coordinates p: (R^T normal) . p = offset - normal . t
+        tf = (tomogram.scene_position.inverse() * self.scene_position).matrix
+        pl_normal = tf[:, :3].T @ normal
+        pl_offset = offset - np.dot(normal, tf[:, 3])
+
+        return pl_normal, pl_offset - distance, pl_offset + distance
+
+    def _update_slab(self):
+        """
+        Update which particles are within the slab.
+
+        Returns
+        -------
+        rows : numpy.ndarray or None
+            Rows that entered or left the slab, None if all rows may have changed.
+        """
+        if self._slab_culling is None or self.size == 0:
+            self._in_slab = None
+            return None
+
+        normal, minimum, maximum = self._slab_range()
+
+        # Particles were added, deleted or moved, or the slab was tilted
+        key = (normal.tobytes(), self._attribute_cache.version)
+        if key != self._slab_key or self._in_slab is None or self._in_slab.shape[0] != self.size:
+            self._slab_key = key
+            self._slab_index = SlabIndex(self.markers.atoms.coords, normal)
+            self._in_slab = np.zeros((self.size,), dtype=bool)
+            self._in_slab[self._slab_index.query(minimum, maximum)] = True
+            return None
+
+        entering, leaving = self._slab_index.move(minimum, maximum)
+        self._in_slab[entering] = True
+        self._in_slab[leaving] = False
+
+        return np.concatenate((entering, leaving))
+
+    def _slab_moved(self, name=None, data=None):
+        if self._slab_culling is None:
+            return
 
-        # Otherwise, set
-        if size(value) == 1:
-            from numpy import full
+        rows = self._update_slab()
+        if rows is None:
+            self._apply_display()
+        elif rows.shape[0] > 0:
+            self._apply_display(rows)
 
-            value = full((self.size,), value)
+    def _slab_particles_moved(self, particle_ids):
+        """Recheck only moved particles. The index is rebuilt on the next slab move."""
+        if self._slab_culling is None or self._in_slab is None or len(particle_ids) == 0:
+            return
 
-        from numpy import copy
+        normal, minimum, maximum = self._slab_range()
+        normal = normal / np.linalg.norm(normal)
 
-        self._displayed_particles = copy(value)
+        rows = self.particle_indices(particle_ids)
+        distances = self.markers.atoms.filter(rows).coords @ normal
+        self._in_slab[rows] = np.logical_and(distances >= minimum, distances <= maximum)
+        self._apply_display(rows)
 
-        self.markers.displayed_markers = copy(value)
-        self.collection_model.displayed_child_positions = copy(value)
+    def _slab_tomogram_deleted(self, name, data):
+        self._slab_culling = None
+        self._slab_index = None
+        self._in_slab = None
+        self._apply_display()
 
     @property
     def particle_colors(self):
@@ -400,32 +514,19 @@ class ParticleList(Model):
 
     @particle_colors.setter
     def particle_colors(self, rgba):
-        from numpy import all, size
-
         # Attempting to set for empty list
         if self.size == 0:
             self._particle_colors = None
             return
 
-        # Identical, don't set
-        if size(rgba) == 4 or size(rgba) == size(self._particle_colors):
-            if all(self._particle_colors == rgba) and self.size != 1:
-                return
-
-        col = rgba
-        if size(rgba) == 4:
-            from numpy import zeros, uint8
-
-            col = zeros((self.size, 4), dtype=uint8)
-            col[:,] = rgba
-
-        self.session.col = col
-        from numpy import copy
+        self._particle_colors, rows = _update_buffer(self._particle_colors, rgba, (self.size, 4), np.uint8)
+        if rows is not None and len(rows) == 0:
+            return
 
-        self._particle_colors = col
-        self.display_model.color = copy(col[0, :])
-        self.collection_model.colors = copy(col)
-        self.markers.marker_colors = copy(col)
+        col = self._particle_colors
+        self.display_model.color = col[0, :].copy()
+        self.collection_model.colors = col.copy()
+        self.markers.set_color_rows(col, rows)
 
     def has_display_model(self):
         if self.display_model.count > 0:
@@ -509,35 +610,34 @@ class ParticleList(Model):
         return self._data.get_all_attributes()
 
     def get_attribute_min(self, attrs):
-        minima = []
-        for a in attrs:
-            if self.size == 0:
-                minima.append(0)
-            else:
-                minima.append(min([getattr(m, a) for m in self.markers.atoms]))
-
-        return minima
+        return [self._attribute_cache.statistics(a)["min"] for a in attrs]
 
     def get_attribute_max(self, attrs):
-        maxima = []
-        for a in attrs:
-            if self.size == 0:
-                maxima.append(0)
-            else:
-                maxima.append(max([getattr(m, a) for m in self.markers.atoms]))
+        return [self._attribute_cache.statistics(a)["max"] for a in attrs]
+
+    def get_attribute_statistics(self, attr):
+        """Return cached min, max, mean, var, std and count of one attribute."""
+        return self._attribute_cache.statistics(attr)
 
-        return maxima
+    def get_attribute_histogram(self, attr):
+        """Return cached fixed-bin histogram (counts, edges) of one attribute."""
+        return self._attribute_cache.histogram(attr)
+
+    def get_attribute_quantiles(self, attr, quantiles):
+        """Return quantiles of one attribute, read from the cached sorted values."""
+        return self._attribute_cache.quantiles(attr, quantiles)
 
     def get_attribute_info(self, attrs):
         info = {}
 
         for a in attrs:
+            stats = self._attribute_cache.statistics(a)
             info[a] = {}
-            info[a]["min"] = min([getattr(m, a) for m in self.markers.atoms])
-            info[a]["max"] = max([getattr(m, a) for m in self.markers.atoms])
-            info[a]["mean"] = np.mean([getattr(m, a) for m in self.markers.atoms])
-            info[a]["std"] = np.std([getattr(m, a) for m in self.markers.atoms])
-            info[a]["var"] = np.var([getattr(m, a) for m in self.markers.atoms])
+            info[a]["min"] = stats["min"]
+            info[a]["max"] = stats["max"]
+            info[a]["mean"] = stats["mean"]
+            info[a]["std"] = stats["std"]
+            info[a]["var"] = stats["var"]
             info[a]["alias"] = self.data._data_keys[a]
 
             if a in self.data._default_params.values():
@@ -548,6 +648,27 @@ class ParticleList(Model):
 
         return dict(sorted(info.items()))
 
+    def get_attribute_values(self, attr):
+        """Return the values of one attribute for all particles as a 1D float array (cached).
+
+        Parameters
+        ----------
+        attr : str
+            Attribute name or alias.
+        """
+        return self._attribute_cache.column(attr)
+
+    def get_attribute_order(self, attr):
+        """Return (order, sorted values) of one attribute (cached), such that range queries can be answered with
+        binary searches.
+
+        Parameters
+        ----------
+        attr : str
+            Attribute name or alias.
+        """
+        return self._attribute_cache.order(attr)
+
     def reset_particles(self, reset_ids):
         self._data.reset_particles(reset_ids)
 
@@ -568,6 +689,8 @@ class ParticleList(Model):
             self._attr_to_marker(marker, new_part)
 
         self.collection_model.set_places(reset_ids, places)
+        self._attribute_cache.changed(reset_ids)
+        self._index_particles_moved(reset_ids, [p.translation() for p in places])
         self.triggers.activate_trigger(PARTLIST_CHANGED, self)
 
     def reset_all_particles(self):
@@ -575,6 +698,8 @@ class ParticleList(Model):
         self.collection_model.delete_places(self.particle_ids)
         self._map.clear()
         self._data.reset_all_particles()
+        self._attribute_cache.clear()
+        self._neighbour_index = None
 
         self._particle_colors = None
         self._selected_particles = None
@@ -614,45 +739,98 @@ class ParticleList(Model):
         )
         self.markers.triggers.add_handler(MARKERSET_DELETED, self._markerset_deleted)
 
-    def _init_particles(self, markers=True, collection=True):
-        """Add initial particles to this list."""
-        pids = []
-        pl = []
-
-        for idx, value in enumerate(self._data):
-            _id = value[0]
-            particle = value[1]
+    def _init_particles(self, markers=True, collection=True, state=None):
+        """
+        Add initial particles to this list, creating all markers, places and masks in bulk.
+
+        Parameters
+        ----------
+        markers : bool
+            Create the markers.
+        collection : bool
+            Add the places to the collection model.
+        state : dict
+            Selection, display and colors to restore (keys 'selected', 'displayed' and 'colors'). Defaults are used if
+            None.
+        """
+        particles = [particle for _id, particle in self._data]
+        places = self._full_transforms(particles)
 
-            # Full particle position
-            place = particle.full_transform()
+        if collection:
+            from chimerax.geometry import Places
 
-            # Lists for adding particles to collections
-            if collection:
-                pids.append(_id)
-                pl.append(place)
+            self.collection_model.add_places([p.id for p in particles], Places(place_array=places))
 
-            # Create the respective marker and set custom attributes
-            if markers:
-                marker = self.markers.create_marker(
-                    place.translation(), self.color, self.radius, id=idx, trigger=False
-                )
+        if markers:
+            ms = [
+                self.markers.create_marker(places[idx, :, 3], self.color, self.radius, id=idx, trigger=False)
+                for idx in range(len(particles))
+            ]
 
-                # Add custom attributes
-                self._attr_to_marker(marker, particle)
+            # Add custom attributes
+            self._attrs_to_markers(ms, particles)
 
-                # Add to internal map
+            # Add to internal map
+            for particle, marker in zip(particles, ms):
                 self._map[particle.id] = (particle, marker)
 
+        from numpy import ones, zeros, empty, uint8
+
+        if state is not None and state["displayed"] is not None:
+            self.displayed_particles = state["displayed"]
+            self.selected_particles = state["selected"]
+            self.particle_colors = state["colors"]
+        else:
+            self.displayed_particles = ones((self.size,), dtype=bool)
+            self.selected_particles = zeros((self.size,), dtype=bool)
+            col = empty((self.size, 4), dtype=uint8)
+            col[:,] = self.color
+            self.particle_colors = col
+
+        # The setters skip unchanged rows, but new child models start from their defaults
+        self._push_state(markers=markers, collection=collection)
+
+    def _push_state(self, markers=True, collection=True):
+        """Set the full selection, display and colors on the markers and/or the collection model."""
+        if self.size == 0 or self._displayed_particles is None:
+            return
+
+        displayed = self._displayed_particles
+        if self._in_slab is not None and self._in_slab.shape == displayed.shape:
+            displayed = np.logical_and(displayed, self._in_slab)
+
+        if markers:
+            self.markers.set_displayed_rows(displayed, None)
+            self.markers.set_selected_rows(self._selected_particles, None)
+            self.markers.set_color_rows(self._particle_colors, None)
+
         if collection:
-            self.collection_model.add_places(pids, pl)
+            scm = self.collection_model
+            scm.set_displayed_rows(displayed, None)
+            scm.share_selected_child_positions(self._selected_particles)
+            scm.colors = self._particle_colors.copy()
 
-        from numpy import ones, zeros, empty, uint8
+    def _full_transforms(self, particles):
+        """Full transforms of many particles as Nx3x4 array (vectorized Particle.full_transform)."""
+        count = len(particles)
+        if count == 0:
+            return np.zeros((0, 3, 4))
 
-        self.displayed_particles = ones((self.size,), dtype=bool)
-        self.selected_particles = zeros((self.size,), dtype=bool)
-        col = empty((self.size, 4), dtype=uint8)
-        col[:,] = self.color
-        self.particle_colors = col
+        origins = np.array([p._get_origin() for p in particles], dtype=np.float64)
+        translations = np.array([p._get_translation() for p in particles], dtype=np.float64)
+        angles = np.array([p._get_rotation() for p in particles], dtype=np.float64)
+
+        return self._places_array(origins + translations, angles)
+
+    def _places_array(self, coords, angles):
+        """Nx3x4 transforms from Nx3 coordinates and Nx3 rotation angles of this list's Euler convention."""
+        rot = self._data._rot()
+
+        places = np.zeros((coords.shape[0], 3, 4))
+        places[:, :, :3] = rot.as_matrices(angles[:, 0], angles[:, 1], angles[:, 2])
+        places[:, :, 3] = coords
+
+        return places
 
     def update_places(self):
         pids = []
@@ -673,6 +851,10 @@ class ParticleList(Model):
 
         self.collection_model.set_places(pids, places)
 
+        # Particles may have been modified by the caller in any way
+        self._attribute_cache.clear()
+        self._neighbour_index = None
+
     def get_particle(self, particle_id):
         """Return Particle instance for ParticleModel ID."""
         return self._map[particle_id][0]
@@ -699,6 +881,29 @@ class ParticleList(Model):
 
         marker.particle_id = particle.id
 
+    def _attrs_to_markers(self, markers, particles):
+        """Like _attr_to_marker for many particles, updating the selection ranges only once."""
+        if len(particles) == 0:
+            return
+
+        attributes = particles[0].attributes()
+        for marker, particle in zip(markers, particles):
+            for attr in attributes:
+                setattr(marker, attr, particle[attr])
+            marker.particle_id = particle.id
+
+        names = self.selection_settings["names"]
+        for idx, attr in enumerate(names):
+            if attr not in attributes:
+                continue
+
+            values = np.fromiter((p[attr] for p in particles), dtype=np.float64, count=len(particles))
+            if values.min() < self.selection_settings["minima"][idx]:
+                self.selection_settings["minima"][idx] = values.min()
+
+            if values.max() > self.selection_settings["maxima"][idx]:
+                self.selection_settings["maxima"][idx] = values.max()
+
     def _add_to_map(self, particle, marker):
         self._map[particle.id] = (particle, marker)
 
@@ -710,6 +915,7 @@ class ParticleList(Model):
             base_model.surfaces[0].vertices,
             base_model.surfaces[0].normals,
             base_model.surfaces[0].triangles,
+            level_of_detail=True,
         )
 
         base_model.display = False
@@ -741,7 +947,17 @@ class ParticleList(Model):
         #     self.delete_data(m.particle_id)
 
     def id_mask(self, particle_id):
-        return particle_id == self.particle_ids
+        mask = np.zeros((self.size,), dtype=bool)
+        mask[self.particle_index(particle_id)] = True
+        return mask
+
+    def particle_index(self, particle_id):
+        """Row of a particle in particle_ids, the particle masks, marker atoms and collection instances."""
+        return self._attribute_cache.row(particle_id)
+
+    def particle_indices(self, particle_ids):
+        """Rows of many particles in particle_ids, the particle masks, marker atoms and collection instances."""
+        return self._attribute_cache.rows(particle_ids)
 
     def delete_data(self, particle_ids, cache_markers=True):
         """Delete Marker and Particle instances if they exist."""
@@ -751,47 +967,34 @@ class ParticleList(Model):
         if self.editing_locked:
             return
 
+        # Particles might already be deleted, deletion can be triggered by different actions
+        particle_ids = list(dict.fromkeys(pid for pid in particle_ids if pid in self._map))
+
         if len(particle_ids) == 0:
             return
 
+        # Bring cached columns up to date while all rows still exist
+        self._attribute_cache.update()
+
         # Do it this way, because deleting atoms happens all at once, so we cannot individually set masks
-        from numpy import zeros, logical_not, logical_or
+        from numpy import zeros, logical_not
 
         mask = zeros((self.size,), dtype=bool)
-        prev_ids = self._data.particle_ids
-
-        pids = []
-        ats = []
-        self._marker_cache = []
+        mask[self.particle_indices([pid for pid in particle_ids if pid in self._data])] = True
 
         pre_sel = self.selected_particles
         pre_disp = self.displayed_particles
         pre_col = self.particle_colors
 
-        for pid in particle_ids:
-            # Particle already deleted?
-            if pid in self._map:
-                mask = logical_or(prev_ids == pid, mask)
-                particle, marker = self._map.pop(pid)
-            else:
-                continue
-
-            # Need to check because deletion can be triggered by different actions, and one or more might already be deleted
-            if particle in self._data:
-                self._data.delete_particle(particle.id)
-
-            if not marker.deleted:
-                ats.append(marker)
-                # self.markers.delete_atom(marker)
-                if cache_markers:
-                    self._marker_cache.append(marker)
+        entries = [self._map.pop(pid) for pid in particle_ids]
+        self._data.delete_particles(particle_ids)
 
-            if pid in self.collection_model:
-                pids.append(pid)
-                # self.collection_model.delete_place(pid)
+        ats = [marker for _particle, marker in entries if not marker.deleted]
+        self._marker_cache = set(ats) if cache_markers else set()
 
         # Delete all atoms/places at once
-        self.collection_model.delete_places(pids)
+        scm = self.collection_model
+        scm.delete_places([pid for pid in particle_ids if pid in scm])
 
         # For atoms this is a little weird. If we delete the last atom of the set using a collection, chimerax crashes.
         # So we intersect with all atoms, and if all are contained, we handle special cases.
@@ -813,6 +1016,9 @@ class ParticleList(Model):
         # Now update colors and display to keep consistent
         mask = logical_not(mask)
         # print(mask)
+        self._attribute_cache.deleted(mask)
+        if self._neighbour_index is not None:
+            self._neighbour_index.delete(mask)
 
         self.selected_particles = pre_sel[mask]  # zeros((self.size,), dtype=bool)
         self.displayed_particles = pre_disp[mask]  # self.displayed_particles[mask]
@@ -821,50 +1027,79 @@ class ParticleList(Model):
         self.triggers.activate_trigger(PARTLIST_CHANGED, self)
 
     def new_particles(self, origins, translations, rotations):
+        """
+        Add many particles at once. Data, markers, surface instances and masks are extended in one step.
+
+        Parameters
+        ----------
+        origins : numpy.ndarray or list of Place
+            Nx3 array of origins, or Place objects whose translation is used.
+        translations : numpy.ndarray or list of Place
+            Nx3 array of shifts after rotation, or Place objects whose translation is used.
+        rotations : numpy.ndarray, Places or list of Place
+            Nx3x3 or Nx3x4 array of rotation matrices, or Place objects whose rotation is used.
+
+        Returns
+        -------
+        particles : list of Particle
+            The new particles.
+        """
         if self.editing_locked:
             return
 
-        pids = []
-        places = []
-        for o, t, r in zip(origins, translations, rotations):
-            p = self.new_particle(
-                o,
-                t,
-                r,
-                update_selectors=False,
-                add_to_collection=False,
-                update_masks=False,
-            )
-            pids.append(p.id)
-            places.append(p.full_transform())
+        count = len(origins)
+        if count == 0:
+            return []
+
+        origins = _as_coords(origins, count)
+        translations = _as_coords(translations, count)
+        rotations = _as_rotations(rotations, count)
 
-        self.collection_model.add_places(pids, places)
+        # Store angles, and compute the displayed rotation from them so particles and instances agree
+        angles = self._data._rot().angles_from_matrices(rotations)
+        coords = origins + translations
+        places = self._places_array(coords, angles)
 
-        from numpy import array, append, reshape, tile
+        particles = self._data.new_particles(count)
+        for p, o, t, a in zip(particles, origins, translations, angles):
+            p.origin_coord = o
+            p.translation = t
+            p["ang_1"], p["ang_2"], p["ang_3"] = a
 
+        markers = [self.markers.create_marker(c, self.color, self.radius, trigger=False) for c in coords]
+        self._attribute_cache.appended(count)
+        self._index_particles_appended(coords)
+
+        self._attrs_to_markers(markers, particles)
+        for p, m in zip(particles, markers):
+            self._add_to_map(p, m)
+
+        from chimerax.geometry import Places
+
+        pids = [p.id for p in particles]
+        self.collection_model.add_places(pids, Places(place_array=places))
+
+        # Extend masks and colors once
         if self.selected_particles is None:
-            self.selected_particles = array([True] * len(pids))
+            self.selected_particles = np.ones((count,), dtype=bool)
         else:
-            self.selected_particles = append(
-                self.selected_particles, array([True] * len(pids))
-            )
+            self.selected_particles = np.concatenate((self.selected_particles, np.ones((count,), dtype=bool)))
 
         if self.displayed_particles is None:
-            self.displayed_particles = array(array([True] * len(pids)))
+            self.displayed_particles = np.ones((count,), dtype=bool)
         else:
-            self.displayed_particles = append(
-                self.displayed_particles, array([True] * len(pids))
-            )
+            self.displayed_particles = np.concatenate((self.displayed_particles, np.ones((count,), dtype=bool)))
 
         if self.particle_colors is None:
-            self.particle_colors = tile(self.color, (len(pids), 1))  # array(self.color)
+            self.particle_colors = np.tile(self.color, (count, 1))
         else:
             pc = self.particle_colors
-            cols = tile(reshape(pc[-1, :], (1, 4)), (len(pids), 1))
-            self.particle_colors = append(pc, cols, axis=0)
+            self.particle_colors = np.concatenate((pc, np.tile(pc[-1, :], (count, 1))), axis=0)
 
         self.update_position_selectors()
 
+        return particles
+
     def new_particle(
         self,
         origin,
@@ -885,6 +1120,8 @@ class ParticleList(Model):
         marker = self.markers.create_marker(
             particle.coord, self.color, self.radius, trigger=False
         )
+        self._attribute_cache.appended(1)
+        self._index_particles_appended([marker.coord])
 
         # Add to surface collection
         if add_to_collection:
@@ -930,6 +1167,8 @@ class ParticleList(Model):
         # Empty particle with coords
         particle = self._data.new_particle()
         particle.origin = marker.coord
+        self._attribute_cache.appended(1)
+        self._index_particles_appended([marker.coord])
 
         # Add to surface collection
         self.collection_model.add_place(
@@ -964,89 +1203,163 @@ class ParticleList(Model):
         self.update_position_selectors()
 
     def _marker_moved(self, name, data):
-        # Data sent by trigger should be marker instances
+        # Data sent by trigger should be an Atoms collection of markers
         markers = data
+        if len(markers) == 0:
+            return
 
-        place_ids = []
-        places = []
-
-        for m in markers:
-            particle, marker = self._map[m.particle_id]
+        pids = [m.particle_id for m in markers]
+        particles = [self._map[pid][0] for pid in pids]
 
-            if self.translation_locked:
-                m.coord = particle.coord
-                continue
+        if self.translation_locked:
+            # Move markers back where they differ from their particles
+            coords = np.array([p.coord for p in particles], dtype=np.float64)
+            moved = np.any(markers.coords != coords, axis=1)
+            if np.any(moved):
+                markers.filter(moved).coords = coords[moved]
+            return
 
-            new_coord = m.coord
+        coords = markers.coords
 
-            # Set as additional translation for now
-            # ori = particle.origin.translation()
-            # dx = new_coord[0] - ori[0]
-            # dy = new_coord[1] - ori[1]
-            # dz = new_coord[2] - ori[2]
-            # particle.translation = (dx, dy, dz)
+        # Set particle translation to 0, the new coordinate becomes the origin. Rotations are unchanged.
+        self._set_origins(particles, coords)
 
-            # Set particle translation to 0
-            if not particle.translation.is_identity():
-                particle.translation = (0, 0, 0)
-            particle.origin = (new_coord[0], new_coord[1], new_coord[2])
+        # Update attributes
+        self._attrs_to_markers(markers, particles)
 
-            # Update attributes
-            self._attr_to_marker(marker, particle)
+        angles = np.array([p._get_rotation() for p in particles], dtype=np.float64)
+        places = self._places_array(coords, angles)
 
-            place_ids.append(particle.id)
-            places.append(particle.full_transform())
+        from chimerax.geometry import Places
 
-        self.collection_model.set_places(place_ids, places)
+        self.collection_model.set_places(pids, Places(place_array=places))
+        self._attribute_cache.changed(pids)
+        self._slab_particles_moved(pids)
+        self._index_particles_moved(pids, coords)
 
     def _model_moved(self, name, data):
         # Data sent by trigger should be particle ids
         if self.DEBUG:
             print("Particles {} moved.".format(data))
 
+        if len(data) == 0:
+            return
+
+        from chimerax.atomic import Atoms
+        from chimerax.geometry import Places
+
         scm = self.collection_model
+        particles = [self._map[pid][0] for pid in data]
+        markers = Atoms([self._map[pid][1] for pid in data])
+
+        # Moved instance matrices as one array
+        places = np.array([p.matrix for p in scm.get_places(data)], dtype=np.float64)
+
+        # Apply locks: locked components are taken from the particles
+        locked = self.translation_locked or self.rotation_locked
+        if self.translation_locked:
+            places[:, :, 3] = [p.coord for p in particles]
+        if self.rotation_locked:
+            angles = np.array([p._get_rotation() for p in particles], dtype=np.float64)
+            places[:, :, :3] = self._data._rot().as_matrices(angles[:, 0], angles[:, 1], angles[:, 2])
+        else:
+            angles = self._data._rot().angles_from_matrices(places)
+
+        coords = np.ascontiguousarray(places[:, :, 3])
+
+        # Set particle translation to 0, the new coordinate becomes the origin
+        self._set_origins(particles, coords, angles)
 
-        # Update the marker, block changes trigger to prevent loop
+        # Update the markers, block changes trigger to prevent loop
         with self.markers.triggers.block_trigger("changes"):
-            for pid in data:
-                particle, marker = self._map[pid]
+            markers.coords = coords
+            self._attrs_to_markers(markers, particles)
+
+        if locked:
+            scm.set_places(data, Places(place_array=places))
+
+        self._attribute_cache.changed(data)
+        self._slab_particles_moved(data)
+        self._index_particles_moved(data, coords)
+
+    def set_particle_transforms(self, particle_ids, coords, rotations):
+        """
+        Move and rotate many particles at once. The coordinates become the particle origins and the translations are set
+        to zero.
+
+        Parameters
+        ----------
+        particle_ids : list of str
+            The particles.
+        coords : numpy.ndarray
+            Nx3 array of new particle coordinates.
+        rotations : numpy.ndarray
+            Nx3x3 array of new rotation matrices.
+        """
+        if len(particle_ids) == 0:
+            return
+
+        from chimerax.atomic import Atoms
+        from chimerax.geometry import Places
+
+        particles = [self._map[pid][0] for pid in particle_ids]
+        markers = Atoms([self._map[pid][1] for pid in particle_ids])
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        angles = self._data._rot().angles_from_matrices(rotations)
+
+        self._set_origins(particles, coords, angles)
 
-                place = scm.get_place(pid)
+        # Update the markers, block changes trigger to prevent loop
+        with self.markers.triggers.block_trigger("changes"):
+            markers.coords = coords
+            self._attrs_to_markers(markers, particles)
 
-                if self.translation_locked:
-                    new_coord = particle.coord
-                else:
-                    new_coord = place.translation()
+        self.collection_model.set_places(particle_ids, Places(place_array=self._places_array(coords, angles)))
+        self._attribute_cache.changed(particle_ids)
+        self._slab_particles_moved(particle_ids)
+        self._index_particles_moved(particle_ids, coords)
 
-                from chimerax.geometry import translation
+    def _set_origins(self, particles, coords, angles=None):
+        """
+        Set the origins of many particles to coordinates (in physical units) and their translations to zero.
+
+        Parameters
+        ----------
+        particles : list of Particle
+            The particles.
+        coords : numpy.ndarray
+            Nx3 array of new particle coordinates.
+        angles : numpy.ndarray
+            Nx3 array of new rotation angles, or None to keep the rotations.
+        """
+        origins = np.asarray(coords, dtype=np.float64) / self._data.pixelsize_ori
 
-                if self.rotation_locked:
-                    new_rot = particle.rotation
-                else:
-                    new_rot = place
+        for idx, p in enumerate(particles):
+            p["pos_x"], p["pos_y"], p["pos_z"] = origins[idx]
+            p["shift_x"] = p["shift_y"] = p["shift_z"] = 0
 
-                new_place = translation(new_coord) * new_rot.zero_translation()
+            if angles is not None:
+                p["ang_1"], p["ang_2"], p["ang_3"] = angles[idx]
 
-                # Set as additional translation for now
-                # ori = particle.origin_coord
-                # dx = new_coord[0] - ori[0]
-                # dy = new_coord[1] - ori[1]
-                # dz = new_coord[2] - ori[2]
-                # particle.translation = (dx, dy, dz)
+    def neighbour_index(self):
+        """
+        NeighbourIndex of the particle coordinates for k-nearest neighbour, radius and pair queries. Rows of the results
+        are rows in particle_ids and the particle masks. Built on first use and kept up to date afterwards.
+        """
+        if self._neighbour_index is None:
+            from .NeighbourIndex import NeighbourIndex
 
-                # Set particle translation to 0
-                if not particle.translation.is_identity():
-                    particle.translation = (0, 0, 0)
+            self._neighbour_index = NeighbourIndex(self.markers.atoms.coords)
 
-                particle.origin = (new_coord[0], new_coord[1], new_coord[2])
-                particle.rotation = new_rot
-                marker.coord = particle.coord
+        return self._neighbour_index
 
-                if self.translation_locked:
-                    scm.set_place(pid, new_place)
+    def _index_particles_appended(self, coords):
+        if self._neighbour_index is not None:
+            self._neighbour_index.append(coords)
 
-                # Update attributes
-                self._attr_to_marker(marker, particle)
+    def _index_particles_moved(self, particle_ids, coords):
+        if self._neighbour_index is not None and len(particle_ids) > 0:
+            self._neighbour_index.move(self.particle_indices(particle_ids), coords)
 
     def update_position_selectors(self):
         # names = self.selection_settings['names']
@@ -1069,52 +1382,36 @@ class ParticleList(Model):
         self.triggers.activate_trigger(PARTLIST_CHANGED, self)
 
     def _marker_selected(self, name, data):
-        sm = self.markers.selected_markers
-
-        from numpy import all
-
-        if all(self._selected_particles == sm):
-            return
-
-        from numpy import copy
-
-        self.selected_particles = copy(sm)
+        # The setter only propagates changed rows
+        self.selected_particles = self.markers.selected_markers
 
     def _model_selected(self, name, data):
+        # Data sent by trigger should be the changed rows, or None if all changed
         sc = self.collection_model.selected_child_positions
 
-        from numpy import all
-
-        if all(self._selected_particles == sc):
+        if sc is not self._selected_particles:
+            self.selected_particles = sc
             return
 
-        from numpy import copy
-
-        self.selected_particles = copy(sc)
+        # Shared buffer, already modified in place by the collection model
+        self.markers.set_selected_rows(sc, data)
 
     def _marker_color_changed(self, name, data):
         cm = self.markers.marker_colors
 
-        from numpy import all
-
-        if all(self._particle_colors == cm):
+        if np.array_equal(self._particle_colors, cm):
             return
 
-        from numpy import copy
-
-        self.colors = copy(cm)
+        self.colors = cm
 
     def _marker_display_changed(self, name, data):
         dm = self.markers.displayed_markers
 
-        from numpy import all
-
-        if all(self._displayed_particles == dm):
-            return
-
-        from numpy import copy
+        # Markers outside the slab are hidden by culling, not by the user
+        if self._in_slab is not None:
+            dm = np.logical_or(dm, np.logical_and(self._displayed_particles, np.logical_not(self._in_slab)))
 
-        self.displayed_particles = copy(dm)
+        self.displayed_particles = dm
 
     def _particlelist_set_color(self, rgba):
         Model.set_color(self, rgba)
@@ -1171,24 +1468,16 @@ class ParticleList(Model):
     @classmethod
     def restore_snapshot(cls, session, data):
 
-        from numpy import copy
+        # Markers, places and masks are created once from the saved state
+        state = {
+            "selected": data["selected"],
+            "displayed": data["displayed"],
+            "colors": data["colors"],
+        }
 
-        pl = cls(data["name"], session, data["data"], create_managers=False)
+        pl = cls(data["name"], session, data["data"], create_managers=False, state=state)
         Model.set_state_from_snapshot(pl, session, data["model state"])
 
-        pl._selected_particles = data["selected"]
-        pl.markers.selected_markers = copy(pl._selected_particles)
-        pl.collection_model.selected_child_positions = copy(pl._selected_particles)
-
-        pl._displayed_particles = data["displayed"]
-        pl.markers.displayed_markers = copy(pl._displayed_particles)
-        pl.collection_model.displayed_child_positions = copy(pl._displayed_particles)
-
-        pl._particle_colors = data["colors"]
-        pl.display_model.color = copy(pl._particle_colors[0, :])
-        pl.collection_model.colors = copy(pl._particle_colors)
-        pl.markers.marker_colors = copy(pl._particle_colors)
-
         pl.translation_locked = data["translation_locked"]
         pl.rotation_locked = data["rotation_locked"]
         pl.selection_settings = data["selection_settings"]
@@ -1199,6 +1488,13 @@ class ParticleList(Model):
         return pl
 
     def delete(self):
+        if self._slab_culling is not None:
+            tomogram, distance, handlers = self._slab_culling
+            if not tomogram.deleted:
+                for h in handlers:
+                    tomogram.triggers.remove_handler(h)
+            self._slab_culling = None
+
         if not self.markers.deleted:
             self.markers.delete()
         if not self._collection_model.deleted:
@@ -1212,32 +1508,10 @@ class ParticleList(Model):
 
 
 def get_axes_surface(session, size):
+    """Surface of the xyz axes glyph (red, yellow, blue arrows) with arrows of length size."""
+    from ..util.glyphs import glyph_surface
 
-    # Axes from https://www.cgl.ucsf.edu/chimera/docs/UsersGuide/bild.html
-    from chimerax.bild.bild import _BildFile
-
-    b = _BildFile(session, "dummy")
-    # print(size)
-    b.color_command(".color 1 0 0".split())
-    # print('.arrow 0 0 0 {} 0 0 {} {}'.format(size, size/15, size/15*4).split())
-    b.arrow_command(
-        ".arrow 0 0 0 {} 0 0 {} {}".format(size, size / 15, size / 15 * 4).split()
-    )
-    b.color_command(".color 1 1 0".split())
-    b.arrow_command(
-        ".arrow 0 0 0 0 {} 0 {} {}".format(size, size / 15, size / 15 * 4).split()
-    )
-    b.color_command(".color 0 0 1".split())
-    b.arrow_command(
-        ".arrow 0 0 0 0 0 {} {} {}".format(size, size / 15, size / 15 * 4).split()
-    )
-
-    from chimerax.atomic import AtomicShapeDrawing
-
-    d = AtomicShapeDrawing("shapes")
-    d.add_shapes(b.shapes)
-
-    return (d.vertices, d.normals, d.triangles, d.vertex_colors)
+    return glyph_surface(session, "axes", size)
 
 
 def selected_collections(session, exclude_rot_lock=False):
@@ -1350,3 +1624,70 @@ def invert_selection(session):
         if plist.visible:
             markerset = plist.markers
             markerset.atoms.selecteds = logical_not(markerset.atoms.selecteds)
+
+
+def _as_coords(values, count):
+    """Nx3 float array from an array or a list of Place objects/3-vectors."""
+    from chimerax.geometry import Place
+
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return np.asarray(values, dtype=np.float64).reshape((count, 3))
+
+    return np.array(
+        [v.translation() if isinstance(v, Place) else v for v in values], dtype=np.float64
+    ).reshape((count, 3))
+
+
+def _as_rotations(values, count):
+    """Nx3x3 float array from an array, a Places object or a list of Place objects/matrices."""
+    from chimerax.geometry import Place, Places
+
+    if isinstance(values, Places):
+        return values.array()[:, :, :3]
+
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        return np.asarray(values, dtype=np.float64)[:, :3, :3].reshape((count, 3, 3))
+
+    return np.array(
+        [v.matrix[:, :3] if isinstance(v, Place) else np.asarray(v)[:3, :3] for v in values], dtype=np.float64
+    ).reshape((count, 3, 3))
+
+
+def _update_buffer(buffer, value, shape, dtype):
+    """
+    Write value into an owned state buffer, in place if possible.
+
+    Parameters
+    ----------
+    buffer : numpy.ndarray or None
+        The current buffer.
+    value : numpy.ndarray, scalar or None
+        New values, broadcast to shape. None means zeros.
+    shape : tuple
+        Shape of the buffer.
+    dtype : numpy.dtype
+        Type of the buffer.
+
+    Returns
+    -------
+    buffer : numpy.ndarray
+        The updated buffer (a new one if the shape changed).
+    rows : numpy.ndarray or None
+        Changed rows, or None if all rows were replaced.
+    """
+    if value is None:
+        value = 0
+
+    value = np.broadcast_to(np.asarray(value, dtype=dtype), shape)
+
+    if buffer is None or buffer.shape != shape:
+        return np.array(value, dtype=dtype), None
+
+    changed = buffer != value
+    if changed.ndim > 1:
+        changed = np.any(changed, axis=1)
+
+    rows = np.flatnonzero(changed)
+    buffer[rows] = value[rows]
+
+    return buffer, rows
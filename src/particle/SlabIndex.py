@@ -0,0 +1,66 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+
+class SlabIndex:
+    """
+    A SlabIndex sorts particle coordinates by their distance along a plane normal, so that the particles within a slab
+    around any plane with that normal can be found by binary search.
+
+    After the first query, moving the slab only reports the particles entering or leaving it, which makes stepping
+    through a tomogram cost O(changed) instead of O(N).
+    """
+
+    def __init__(self, coords, normal):
+        normal = np.asarray(normal, dtype=np.float64)
+        self.normal = normal / np.linalg.norm(normal)
+        """Unit normal of the slab planes."""
+
+        distances = np.asarray(coords, dtype=np.float64) @ self.normal
+        self._order = np.argsort(distances, kind="stable")
+        """Rows sorted by distance along the normal."""
+        self._distances = distances[self._order]
+        """Sorted distances along the normal."""
+        self._range = None
+        """Index range (start, stop) into the sorted rows of the current slab."""
+
+    def __len__(self):
+        return self._order.shape[0]
+
+    def _bounds(self, minimum, maximum):
+        start = np.searchsorted(self._distances, minimum, side="left")
+        stop = np.searchsorted(self._distances, maximum, side="right")
+        return start, max(start, stop)
+
+    def query(self, minimum, maximum):
+        """Rows with minimum <= distance <= maximum. Makes this the current slab."""
+        self._range = self._bounds(minimum, maximum)
+        return self._order[self._range[0]:self._range[1]]
+
+    def move(self, minimum, maximum):
+        """
+        Move the current slab.
+
+        Returns
+        -------
+        entering, leaving : numpy.ndarray, numpy.ndarray
+            Rows that are now inside the slab and rows that are not anymore.
+        """
+        if self._range is None:
+            return self.query(minimum, maximum), np.zeros((0,), dtype=self._order.dtype)
+
+        old_start, old_stop = self._range
+        new_start, new_stop = self._bounds(minimum, maximum)
+        self._range = (new_start, new_stop)
+
+        # Ranges don't overlap
+        if new_stop <= old_start or old_stop <= new_start:
+            return self._order[new_start:new_stop], self._order[old_start:old_stop]
+
+        order = self._order
+        entering = np.concatenate((order[new_start:old_start], order[old_stop:new_stop]))
+        leaving = np.concatenate((order[old_start:new_start], order[new_stop:old_stop]))
+
+        return entering, leaving
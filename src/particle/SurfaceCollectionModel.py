@@ -7,7 +7,7 @@ import numpy as np
 # ChimeraX
 from chimerax.core.models import Model
 from chimerax.geometry import Place, Places, _geometry
-from chimerax.graphics.drawing import Drawing, PickedTriangle
+from chimerax.graphics.drawing import Drawing, Pick, PickedTriangle
 
 # Triggers
 MODELS_MOVED = "models moved"
@@ -35,10 +35,25 @@ class SurfaceCollectionModel(Model):
         self._gl_instances = OrderedDict()
         """Map of ids to place instances."""
 
+        self._child_ids = None
+        """Cached array of ids in instance order. None if it needs to be rebuilt."""
+        self._child_index = None
+        """Cached map of ids to instance index. None if it needs to be rebuilt."""
+
         self._selected_child_positions = None
         self._displayed_child_positions = None
+        self._displayed_back = None
+        """Second display mask, handed to the collections on the next change. None if it needs to be copied."""
+        self._displayed_pending = None
+        """Rows at which _displayed_back differs from _displayed_child_positions."""
         self._child_colors = None
 
+        self._instance_index = None
+        """InstanceIndex over the instance origins, None if it needs to be rebuilt."""
+
+        self._lod_handler = None
+        """Handler of the 'new frame' trigger, while any collection uses levels of detail."""
+
         self.triggers.add_trigger(MODELS_MOVED)
         self.triggers.add_trigger(MODELS_SELECTED)
 
@@ -90,14 +105,47 @@ class SurfaceCollectionModel(Model):
     def hide_collection(self, name):
         self.show_collection(name, show=False)
 
-    def set_surface(self, name, vertices, normals, triangles, vertex_colors=None):
-        """Sets the surface displayed in the named collection."""
-        self.collections[name].set_geometry(vertices, normals, triangles)
+    def set_surface(self, name, vertices, normals, triangles, vertex_colors=None, level_of_detail=False):
+        """Sets the surface displayed in the named collection. If level_of_detail is True, decimated versions of the
+        surface are displayed depending on the number and on-screen size of the instances."""
+        col = self.collections[name]
+
+        if level_of_detail and vertex_colors is None:
+            from .LevelOfDetail import LevelOfDetail
+
+            col.level_of_detail = LevelOfDetail(vertices, normals, triangles)
+        else:
+            col.level_of_detail = None
+
+        col.set_geometry(vertices, normals, triangles)
+
+        # The index cells are sized by the instance radius
+        self._instance_index = None
 
         # Surface has vertex specific colors
         if vertex_colors is not None:
-            self.collections[name].vertex_colors = vertex_colors
-            self.collections[name].color_locked = True
+            col.vertex_colors = vertex_colors
+            col.color_locked = True
+
+        self._update_lod_handler()
+
+    def _update_lod_handler(self):
+        """Only listen to new frames while levels of detail are in use."""
+        use_lod = any(col.level_of_detail is not None for col in self.collections.values())
+
+        if use_lod and self._lod_handler is None:
+            self._lod_handler = self.session.triggers.add_handler("new frame", self._new_frame)
+        elif not use_lod and self._lod_handler is not None:
+            self.session.triggers.remove_handler(self._lod_handler)
+            self._lod_handler = None
+
+    def _new_frame(self, name, data):
+        if not self.visible:
+            return
+
+        view = self.session.main_view
+        for col in self.collections.values():
+            col.update_level_of_detail(view)
 
     def _update_collections(self):
         """Updates the graphics of all child SurfaceCollectionDrawings."""
@@ -110,6 +158,7 @@ class SurfaceCollectionModel(Model):
     def add_place(self, place_id, pos):
         """Add a new display position and update graphics."""
         self._gl_instances[place_id] = pos
+        self._ids_changed()
 
         from numpy import array, append
 
@@ -119,18 +168,23 @@ class SurfaceCollectionModel(Model):
             self._displayed_child_positions = append(
                 self.displayed_child_positions, True
             )
+        self._displayed_back = None
 
         if self.selected_child_positions is None:
             self._selected_child_positions = array([True])
         else:
             self._selected_child_positions = append(self.selected_child_positions, True)
 
+        if self._instance_index is not None:
+            self._instance_index.append([pos.translation()])
+
         self._update_collections()
 
     def add_places(self, place_ids, positions):
         """Add many positions, and do only one graphics update afterwards (for speed)."""
         for pid, pos in zip(place_ids, positions):
             self._gl_instances[pid] = pos
+        self._ids_changed()
 
         from numpy import ones, zeros, append
 
@@ -140,11 +194,15 @@ class SurfaceCollectionModel(Model):
             self._displayed_child_positions = tr
         else:
             self._displayed_child_positions = append(self.displayed_child_positions, tr)
+        self._displayed_back = None
         if self.selected_child_positions is None:
             self._selected_child_positions = fa
         else:
             self._selected_child_positions = append(self.selected_child_positions, fa)
 
+        if self._instance_index is not None:
+            self._instance_index.append([pos.translation() for pos in positions])
+
         self._update_collections()
 
     def get_place(self, place_id):
@@ -162,42 +220,52 @@ class SurfaceCollectionModel(Model):
     def set_place(self, place_id, place):
         """Set a specific position by id."""
         self._gl_instances[place_id] = place
+        self._index_moved([self.child_index(place_id)], [place])
         self._update_collections()
 
     def set_places(self, place_ids, places):
         """Set multiple positions by id. Update graphics only once for speed."""
+        places = list(places)
         for pid, p in zip(place_ids, places):
             self._gl_instances[pid] = p
 
+        self._index_moved([self.child_index(pid) for pid in place_ids], places)
         self._update_collections()
 
     def delete_place(self, place_id):
         """Delete a specific position by id."""
-        from numpy import logical_not
+        from numpy import ones
 
-        mask = logical_not(self.child_ids == place_id)
+        mask = ones((len(self),), dtype=bool)
+        mask[self.child_index(place_id)] = False
 
         self._gl_instances.pop(place_id)
+        self._ids_changed()
 
         self._displayed_child_positions = self.displayed_child_positions[mask]
+        self._displayed_back = None
         self._selected_child_positions = self.selected_child_positions[mask]
+        self._instance_index = None
 
         self._update_collections()
 
     def delete_places(self, place_ids):
         """Delete multiple positions by ids. Update graphics only once for speed."""
-        from numpy import zeros, logical_or, logical_not
+        from numpy import ones
+
+        mask = ones((len(self),), dtype=bool)
 
-        mask = zeros((len(self),), dtype=bool)
+        for pid in place_ids:
+            mask[self.child_index(pid)] = False
 
-        cids = self.child_ids
         for pid in place_ids:
             self._gl_instances.pop(pid)
-            mask = logical_or(pid == cids, mask)
+        self._ids_changed()
 
-        mask = logical_not(mask)
         self._displayed_child_positions = self.displayed_child_positions[mask]
+        self._displayed_back = None
         self._selected_child_positions = self.selected_child_positions[mask]
+        self._instance_index = None
 
         self._update_collections()
 
@@ -208,11 +276,41 @@ class SurfaceCollectionModel(Model):
     # Properties ===================================================================
     # ==============================================================================
 
+    def child_index(self, place_id):
+        """Index of the instance with this id in child_ids and child_positions."""
+        if self._child_index is None:
+            self._child_index = {pid: idx for idx, pid in enumerate(self._gl_instances.keys())}
+
+        return self._child_index[place_id]
+
+    def _ids_changed(self):
+        self._child_ids = None
+        self._child_index = None
+
     @property
     def child_ids(self):
-        from numpy import array, dtype
+        if self._child_ids is None:
+            from numpy import array, dtype
+
+            self._child_ids = array(list(self._gl_instances.keys()), dtype=dtype("U"))
+            self._child_ids.flags.writeable = False
+
+        return self._child_ids
+
+    def instance_index(self):
+        """InstanceIndex over the origins of all instances. Built on first use and kept up to date afterwards."""
+        if self._instance_index is None:
+            from .InstanceIndex import InstanceIndex
 
-        return array(list(self._gl_instances.keys()), dtype=dtype("U"))
+            radius = max([col.instance_radius() for col in self.collections.values()], default=0)
+            coords = [p.translation() for p in self._gl_instances.values()]
+            self._instance_index = InstanceIndex(coords, min_cell_size=radius)
+
+        return self._instance_index
+
+    def _index_moved(self, rows, places):
+        if self._instance_index is not None and len(rows) > 0:
+            self._instance_index.move(rows, [p.translation() for p in places])
 
     @property
     def child_positions(self):
@@ -230,6 +328,7 @@ class SurfaceCollectionModel(Model):
         for pid, p in zip(self._gl_instances.keys(), pl):
             self._gl_instances[pid] = p
 
+        self._instance_index = None
         self._update_collections()
 
     @property
@@ -252,44 +351,119 @@ class SurfaceCollectionModel(Model):
 
     @selected_child_positions.setter
     def selected_child_positions(self, value):
-        from numpy import all, size
+        if value is None:
+            value = False
+
+        sel = self._selected_child_positions
+        if sel is None or sel.shape != (len(self),):
+            from numpy import zeros
 
-        if all(self._selected_child_positions == value):
+            mask = zeros((len(self),), dtype=bool)
+            mask[:] = value
+            self.share_selected_child_positions(mask)
+            self.triggers.activate_trigger(MODELS_SELECTED, None)
             return
 
-        if value is None:
-            from numpy import zeros
+        value = np.broadcast_to(np.asarray(value, dtype=bool), sel.shape)
+        rows = np.flatnonzero(sel != value)
+        self.set_selected_rows(rows, value[rows])
+
+    def set_selected_rows(self, rows, value):
+        """
+        Select or deselect the instances at rows. The selection mask is modified in place and the MODELS_SELECTED
+        trigger reports the changed rows.
+
+        Parameters
+        ----------
+        rows : numpy.ndarray or list of int
+            Instance indices.
+        value : bool or numpy.ndarray
+            New selection state, for all rows or per row.
+        """
+        sel = self._selected_child_positions
+        if sel is None:
+            return
+
+        rows = np.asarray(rows, dtype=np.int64)
+        value = np.broadcast_to(np.asarray(value, dtype=bool), rows.shape)
 
-            value = zeros((len(self),), dtype=bool)
+        changed = sel[rows] != value
+        rows = rows[changed]
+        if len(rows) == 0:
+            return
 
-        from numpy import copy
+        sel[rows] = value[changed]
 
-        self._selected_child_positions = copy(value)
+        self.share_selected_child_positions(sel)
+        self.triggers.activate_trigger(MODELS_SELECTED, rows)
+
+    def share_selected_child_positions(self, mask):
+        """
+        Use mask as selection of all collections without copying it. The owner of the mask may modify it in place, but
+        needs to call this method again afterwards so the highlights are redrawn. Only the highlight outlines are
+        redrawn, the instance positions and colors are left as they are.
+        """
+        self._selected_child_positions = mask
 
         for name, col in self.collections.items():
-            col._highlighted_positions = copy(value)
+            col._highlighted_positions = mask
             col.redraw_needed(highlight_changed=True)
 
-        self.triggers.activate_trigger(MODELS_SELECTED, value)
-
     @property
     def displayed_child_positions(self):
         return self._displayed_child_positions
 
     @displayed_child_positions.setter
     def displayed_child_positions(self, value):
-        if value is None:
+        self.set_displayed_rows(value)
+
+    def set_displayed_rows(self, mask, rows=None):
+        """
+        Update the display of the instances at rows (all if None) from mask.
+
+        Drawings only notice display changes when given a new array, so two masks are kept and swapped on every change.
+        The mask handed out is brought up to date at the rows that changed since it was last used, instead of copying
+        the whole mask.
+
+        Parameters
+        ----------
+        mask : numpy.ndarray or None
+            Display state of all instances. None hides all.
+        rows : numpy.ndarray or None
+            Rows at which mask differs from the current display state, or None if unknown.
+        """
+        if mask is None:
             from numpy import zeros
 
-            value = zeros((len(self),), dtype=bool)
+            mask = zeros((len(self),), dtype=bool)
+            rows = None
 
-        from numpy import copy
+        front = self._displayed_child_positions
+        back = self._displayed_back
 
-        self._displayed_child_positions = copy(value)
+        if rows is None or front is None or front.shape != mask.shape:
+            from numpy import copy
+
+            value = copy(mask)
+            back = None
+            pending = None
+        else:
+            if back is None:
+                value = front.copy()
+            else:
+                value = back
+                value[self._displayed_pending] = front[self._displayed_pending]
+            value[rows] = mask[rows]
+            back = front
+            pending = rows
+
+        self._displayed_child_positions = value
+        self._displayed_back = back
+        self._displayed_pending = pending
 
         for name, col in self.collections.items():
             if col.active:
-                col.display_positions = copy(value)
+                col.display_positions = value
 
     def scm_set_color(self, rgba):
         Drawing.set_color(self, rgba)
@@ -385,6 +559,7 @@ class SurfaceCollectionModel(Model):
             # p = p * (sp_inv * sp_new) <---- would generate 2 more place instances with _reuse_place()
 
         # Update collections with new places
+        self._index_moved(indeces, [pos[idx] for idx in indeces])
         self._update_collections()
         self.triggers.activate_trigger(MODELS_MOVED, ids)
 
@@ -437,6 +612,79 @@ class SurfaceCollectionModel(Model):
 
         return pm
 
+    # ==============================================================================
+    # Area picking =================================================================
+    # ==============================================================================
+    def _pickable(self):
+        """Mask of the instances that are currently drawn by any collection, or None if none are."""
+        if not self.display or len(self) == 0 or self._displayed_child_positions is None:
+            return None
+
+        if not any(col.display and col.active for col in self.collections.values()):
+            return None
+
+        return self._displayed_child_positions
+
+    def planes_mask(self, planes):
+        """
+        Displayed instances with origins within planes.
+
+        Parameters
+        ----------
+        planes : numpy.ndarray
+            Px4 array of planes in scene coordinates, the inside being a*x + b*y + c*z + d >= 0.
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            Boolean mask over all instances.
+        """
+        pickable = self._pickable()
+        if pickable is None:
+            return np.zeros((len(self),), dtype=bool)
+
+        # Planes in the coordinate system of the instance positions
+        planes = np.array(planes, dtype=np.float64).reshape((-1, 4))
+        sp = self.scene_position.matrix
+        normals = planes[:, :3]
+        planes[:, 3] += normals @ sp[:, 3]
+        planes[:, :3] = normals @ sp[:, :3]
+
+        return self.instance_index().planes_mask(planes, mask=pickable)
+
+    def rectangle_mask(self, view, corner1, corner2):
+        """Displayed instances with origins within a rectangle in window pixel coordinates (Boolean mask)."""
+        planes = view.camera.rectangle_bounding_planes(corner1, corner2, view.window_size)
+        if planes is None:
+            return np.zeros((len(self),), dtype=bool)
+
+        return self.planes_mask(planes)
+
+    def lasso_mask(self, view, polygon):
+        """Displayed instances with origins within a polygon (Mx2) in window pixel coordinates (Boolean mask)."""
+        from .InstanceIndex import polygon_mask
+
+        polygon = np.asarray(polygon, dtype=np.float64)
+        mask = self.rectangle_mask(view, polygon.min(axis=0), polygon.max(axis=0))
+
+        rows = np.flatnonzero(mask)
+        if len(rows) > 0:
+            points = self.scene_position.transform_points(self.instance_index().coords[rows])
+            mask[rows] = polygon_mask(_window_coords(view, points), polygon)
+
+        return mask
+
+    def planes_pick(self, planes, exclude=None):
+        """Pick all displayed instances within planes (scene coordinates) as a single pick."""
+        if exclude is not None and exclude(self):
+            return []
+
+        mask = self.planes_mask(planes)
+        if not np.any(mask):
+            return []
+
+        return [PickedInstances(self, mask)]
+
     def _scm_set_position(self, pos):
         return
         # if pos != self.position:
@@ -458,6 +706,14 @@ class SurfaceCollectionModel(Model):
     positions = property(Drawing.positions.fget, _scm_set_positions)
 
     def delete(self):
+        if self._lod_handler is not None:
+            self.session.triggers.remove_handler(self._lod_handler)
+            self._lod_handler = None
+
+        # Stop computing levels of detail
+        for col in self.collections.values():
+            col.level_of_detail = None
+
         # Delete own triggers
         triggers = list(self.triggers.trigger_names())
         for t in triggers:
@@ -495,22 +751,113 @@ class SurfaceCollectionDrawing(Drawing):
 
     DEBUG = False
 
+    TRIANGLE_BUDGET = 10000000
+    """Maximum number of triangles drawn for all on-screen instances when using levels of detail."""
+    PIXELS_PER_TRIANGLE = 4
+    """Minimum on-screen area per triangle of the largest instance when using levels of detail."""
+
     def __init__(self, name, session):
+        self._instance_changes = 0
+        """Incremented whenever the positions or the displayed positions are set."""
+
         super().__init__(name)
         self.session = session
         self.color_locked = False
         self.active = True
         self.clip_cap = False
 
+        self._level_of_detail = None
+        self._lod_level = None
+        self._lod_state = None
+
     def has_surface(self):
         if self.vertices is None:
             return False
         else:
             return True
 
+    def instance_radius(self):
+        """Radius of a sphere around the instance origin that contains the surface at any rotation."""
+        b = self.geometry_bounds()
+        if b is None:
+            return 0.0
+
+        return float(np.linalg.norm(b.center()) + b.radius())
+
     def update_graphics(self, places):
         """Set updated positions and update graphics"""
         self.positions = places
+        self._lod_state = None
+
+    @property
+    def level_of_detail(self):
+        """
+        LevelOfDetail of the displayed surface, or None to always display the surface at full resolution.
+        """
+        return self._level_of_detail
+
+    @level_of_detail.setter
+    def level_of_detail(self, lod):
+        if self._level_of_detail is not None:
+            self._level_of_detail.cancel()
+
+        self._level_of_detail = lod
+        self._lod_level = None
+        self._lod_state = None
+
+    def update_level_of_detail(self, view):
+        """
+        Display the finest level of detail that keeps all on-screen instances within TRIANGLE_BUDGET, and that is not
+        finer than the on-screen size of the closest instance warrants.
+        """
+        lod = self._level_of_detail
+        if lod is None or lod.full[0] is None or not self.display or len(self.positions) == 0:
+            return
+
+        # Only recompute when the camera, window, instances or ready levels changed
+        camera = view.camera
+        state = (camera.position.matrix.tobytes(), tuple(view.window_size), self._instance_changes, lod.ready)
+        if state == self._lod_state:
+            return
+        self._lod_state = state
+
+        pos = self.get_scene_positions(displayed_only=True).array()
+        if len(pos) == 0:
+            return
+
+        # Instance centers in camera coordinates, camera looks along -z
+        center = np.mean(lod.full[0], axis=0)
+        centers = pos[:, :, :3] @ center + pos[:, :, 3]
+        centers = camera.position.inverse().transform_points(centers)
+        depth = -centers[:, 2]
+        radius = lod.radius
+
+        width, height = view.window_size
+        if hasattr(camera, "field_width"):
+            half_width = np.full(depth.shape, camera.field_width / 2)
+        else:
+            half_width = np.maximum(depth, 1e-6) * np.tan(np.radians(camera.field_of_view) / 2)
+        half_height = half_width * height / max(width, 1)
+
+        on_screen = (
+            (depth > -radius)
+            & (np.abs(centers[:, 0]) <= half_width + radius)
+            & (np.abs(centers[:, 1]) <= half_height + radius)
+        )
+        count = np.count_nonzero(on_screen)
+        if count == 0:
+            return
+
+        # Largest on-screen radius in pixels
+        pixels = np.max(radius * width / (2 * half_width[on_screen]))
+
+        max_triangles = min(self.TRIANGLE_BUDGET / count, np.pi * pixels**2 / self.PIXELS_PER_TRIANGLE)
+        level = lod.resolve(lod.level_for(max_triangles))
+
+        if level != self._lod_level:
+            self._lod_level = level
+            vertices, normals, triangles = lod.get(level)
+            Drawing.set_geometry(self, vertices, normals, triangles)
 
     def highlighted_bounds(self):
         """Compute union bounds of highlighted positions (center of rotation)."""
@@ -555,18 +902,26 @@ class SurfaceCollectionDrawing(Drawing):
     """Color for each position, unless colors of the objects are locked."""
 
     def set_scd_highlighted_positions(self, spos):
-        from numpy import all
-
-        if all(spos == self._highlighted_positions):
-            return
-
-        Drawing.set_highlighted_positions(self, spos)
+        # The selection is held by the parent and shared by all collections, only changed rows are updated there.
         self.parent.selected_child_positions = spos
 
     highlighted_positions = property(
         Drawing.highlighted_positions.fget, set_scd_highlighted_positions
     )
 
+    def set_positions(self, positions):
+        Drawing.set_positions(self, positions)
+        self._instance_changes += 1
+
+    positions = property(Drawing.positions.fget, set_positions)
+
+    def set_display_positions(self, position_mask):
+        Drawing.set_display_positions(self, position_mask)
+        self._instance_changes += 1
+
+    display_positions = property(Drawing.display_positions.fget, set_display_positions)
+    """Displayed positions. Masks are swapped by the parent, so changes are counted instead of compared by identity."""
+
     def _first_intercept_excluding_children(self, mxyz1, mxyz2):
         if self.empty_drawing():
             return None
@@ -591,24 +946,35 @@ class SurfaceCollectionDrawing(Drawing):
                     self.parent.child_ids[0],
                 )
         else:
-            pos_nums = self.bounds_intercept_copies(
-                self.geometry_bounds(), mxyz1, mxyz2
+            # Candidates from the spatial index, in the order the ray enters their bounding spheres
+            rows, entry = self.parent.instance_index().ray_candidates(
+                mxyz1, mxyz2, self.instance_radius(), mask=self.display_positions
             )
-            for i in pos_nums:
+            # Only create the pick for the closest copy
+            closest = None
+            for i, f in zip(rows, entry):
+                # No closer hit possible
+                if closest is not None and f > closest[0]:
+                    break
+
                 cxyz1, cxyz2 = self.positions[i].inverse() * (mxyz1, mxyz2)
                 fmin, tmin = closest_triangle_intercept(va, ta, cxyz1, cxyz2)
-                if fmin is not None and (p is None or fmin < p.distance):
-                    pm = np.zeros((len(self.positions),), dtype=bool)
-                    pm[i] = True
-                    p = PickedInstanceTriangle(
-                        fmin,
-                        tmin,
-                        i,
-                        self,
-                        pm,
-                        self.positions[i].translation(),
-                        self.parent.child_ids[i],
-                    )
+                if fmin is not None and (closest is None or fmin < closest[0]):
+                    closest = (fmin, tmin, i)
+
+            if closest is not None:
+                fmin, tmin, i = closest
+                pm = np.zeros((len(self.positions),), dtype=bool)
+                pm[i] = True
+                p = PickedInstanceTriangle(
+                    fmin,
+                    tmin,
+                    i,
+                    self,
+                    pm,
+                    self.positions[i].translation(),
+                    self.parent.child_ids[i],
+                )
         return p
 
 
@@ -646,26 +1012,65 @@ class PickedInstanceTriangle(PickedTriangle):
         return model + particle + position
 
     def select(self, mode="add"):
-        d = self.drawing()
-        pmask = d.highlighted_positions
-        if pmask is None:
-            from numpy import zeros, bool
+        scm = self.drawing().parent
+        c = self._copy
+        if mode == "add":
+            s = True
+        elif mode == "subtract":
+            s = False
+        elif mode == "toggle":
+            s = not scm.selected_child_positions[c]
+        scm.set_selected_rows([c], s)
 
-            pmask = zeros((len(d.positions),), bool)
-        else:
-            # Copy, otherwise it is the same array and we can't check for changes .....
-            from numpy import copy
 
-            pmask = copy(pmask)
-        c = self._copy
+class PickedInstances(Pick):
+    """Many instances of a SurfaceCollectionModel picked at once, e.g. by rectangle or lasso selection."""
+
+    def __init__(self, model, position_mask):
+        Pick.__init__(self)
+        self._model = model
+        self._position_mask = position_mask
+        self._rows = np.flatnonzero(position_mask)
+        # Toggle relative to the state at pick time, markers of the same particles may be toggled first
+        self._toggled = np.logical_not(model.selected_child_positions[self._rows])
+
+    def drawing(self):
+        return self._model
+
+    def position_mask(self):
+        return self._position_mask
+
+    def description(self):
+        return "#{}, {} particles".format(self._model.id_string, len(self._rows))
+
+    def select(self, mode="add"):
         if mode == "add":
-            s = 1
+            value = True
         elif mode == "subtract":
-            s = 0
+            value = False
         elif mode == "toggle":
-            s = not pmask[c]
-        pmask[c] = s
-        d.highlighted_positions = pmask
+            value = self._toggled
+        self._model.set_selected_rows(self._rows, value)
+
+
+def _window_coords(view, points):
+    """Window pixel coordinates (Nx2) of points in scene coordinates."""
+    camera = view.camera
+    width, height = view.window_size
+    pc = camera.position.inverse().transform_points(points)
+
+    # Half width of the field of view at the depth of each point, camera looks along -z
+    if hasattr(camera, "field_width"):
+        half_width = np.full((len(pc),), camera.field_width / 2)
+    else:
+        half_width = np.maximum(-pc[:, 2], 1e-6) * np.tan(np.radians(camera.field_of_view) / 2)
+    half_height = half_width * height / max(width, 1)
+
+    win = np.empty((len(pc), 2))
+    win[:, 0] = (pc[:, 0] / half_width + 1) * width / 2
+    win[:, 1] = (1 - pc[:, 1] / half_height) * height / 2
+
+    return win
 
 
 def rotate_instances(axis, angle, drawings, masks):
@@ -521,7 +521,7 @@ class ArtiaXUI(ToolInstance):
 
         # Special case: The manager model was removed from the session.
         if artia.tomograms.id is None:
-            self.table_tomo.clear_table(count=0)
+            self.table_tomo.clear_table()
             return
 
         # Otherwise update (make sure we have the current model set)
@@ -536,7 +536,7 @@ class ArtiaXUI(ToolInstance):
 
         # Special case: The manager model was removed from the session.
         if artia.partlists.id is None:
-            self.table_part.clear_table(count=0)
+            self.table_part.clear_table()
             return
 
         # Otherwise update (make sure we have the current model set)
@@ -551,7 +551,7 @@ class ArtiaXUI(ToolInstance):
 
         # Special case: The manager model was removed from the session.
         if artia.geomodels.id is None:
-            self.table_geomodel.clear_table(count=0)
+            self.table_geomodel.clear_table()
             return
 
         self.table_geomodel.model = artia.geomodels
@@ -609,15 +609,15 @@ class ArtiaXUI(ToolInstance):
 
     # Callback for trigger TOMO_DISPLAY_CHANGED
     def _update_tomo_shown(self, name, data):
-        self.table_tomo.update_shown()
+        self.table_tomo.update_shown(data)
 
     # Callback for trigger PARTLIST_DISPLAY_CHANGED
     def _update_partlist_shown(self, name, data):
-        self.table_part.update_shown()
+        self.table_part.update_shown(data)
 
     # Callback for trigger GEOMODEL_DISPLAY_CHANGED
     def _update_geomodel_shown(self, name, data):
-        self.table_geomodel.update_shown()
+        self.table_geomodel.update_shown(data)
 
     def _tomo_table_selected(self, item):
         artia = self.get_root()
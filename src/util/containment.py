@@ -0,0 +1,258 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import hashlib
+import weakref
+import numpy as np
+
+
+class SurfaceContainment:
+    """
+    A SurfaceContainment answers whether points are inside a closed surface.
+
+    The surface is voxelized once: the triangles are binned into columns along z, rays along +z are cast from the
+    column centres and the voxels between crossings are filled by parity. Afterwards, points in voxels that no triangle
+    comes near are classified by an array lookup. Points in voxels close to the surface get an exact parity test along
+    +z against the triangles of their column.
+
+    Parameters
+    ----------
+    vertices : numpy.ndarray
+        Nx3 array of vertex coordinates.
+    triangles : numpy.ndarray
+        Mx3 array of vertex indices.
+    resolution : int
+        Number of voxels along the longest side of the bounding box.
+    """
+
+    RESOLUTION = 128
+    """Default number of voxels along the longest side of the bounding box."""
+
+    def __init__(self, vertices, triangles, resolution=RESOLUTION):
+        self._corners = np.asarray(vertices, dtype=np.float64)[np.asarray(triangles, dtype=np.int64)].reshape((-1, 3, 3))
+        """Triangle corners (Mx3x3)."""
+
+        if self._corners.shape[0] == 0:
+            lo = hi = np.zeros((3,))
+        else:
+            lo = self._corners.reshape((-1, 3)).min(axis=0)
+            hi = self._corners.reshape((-1, 3)).max(axis=0)
+
+        self._size = max(float((hi - lo).max()) / resolution, 1e-6)
+        """Voxel edge length."""
+        self._origin = lo - self._size
+        """Lower corner of the grid, one voxel outside the surface."""
+        self._dims = np.ceil((hi - lo) / self._size).astype(np.int64) + 2
+        """Number of voxels along x, y and z."""
+
+        self._build_columns()
+        self._build_voxels()
+
+    # ==============================================================================
+    # Voxelization =================================================================
+    # ==============================================================================
+    def _build_columns(self):
+        """Bin the triangles into the columns their xy bounding box overlaps."""
+        nx, ny = self._dims[0], self._dims[1]
+        xy = self._corners[:, :, :2]
+        lo = np.floor((xy.min(axis=1) - self._origin[:2]) / self._size).astype(np.int64)
+        hi = np.floor((xy.max(axis=1) - self._origin[:2]) / self._size).astype(np.int64)
+        lo = np.clip(lo, 0, [nx - 1, ny - 1])
+        hi = np.clip(hi, 0, [nx - 1, ny - 1])
+
+        # One entry per triangle and overlapped column
+        sx = hi[:, 0] - lo[:, 0] + 1
+        sy = hi[:, 1] - lo[:, 1] + 1
+        counts = sx * sy
+        tris = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = lo[tris, 0] + local // sy[tris]
+        cy = lo[tris, 1] + local % sy[tris]
+        columns = cx * ny + cy
+
+        order = np.argsort(columns, kind="stable")
+        self._column_triangles = tris[order]
+        """Triangle indices sorted by column."""
+        self._column_starts = np.searchsorted(columns[order], np.arange(nx * ny + 1))
+        """Start of the triangles of each column in _column_triangles."""
+
+    def _column_of(self, xy):
+        c = np.floor((xy - self._origin[:2]) / self._size).astype(np.int64)
+        return c[:, 0] * self._dims[1] + c[:, 1]
+
+    def _crossings(self, xy, columns):
+        """
+        Crossings of rays along z through the points xy with the triangles of their columns.
+
+        Returns
+        -------
+        points, z : numpy.ndarray, numpy.ndarray
+            Index of the ray and z of the crossing, one entry per crossing.
+        """
+        starts = self._column_starts[columns]
+        counts = self._column_starts[columns + 1] - starts
+        points = np.repeat(np.arange(len(columns)), counts)
+        entries = np.arange(counts.sum()) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+        corners = self._corners[self._column_triangles[entries]]
+
+        # The point is in the projected triangle if it is on the inner side of all edges
+        p = xy[points]
+        a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+        area = _cross2(b[:, :2] - a[:, :2], c[:, :2] - a[:, :2])
+        orientation = np.sign(area)
+        hit = (
+            (area != 0)
+            & (_edge_side(a[:, :2], b[:, :2], p) == orientation)
+            & (_edge_side(b[:, :2], c[:, :2], p) == orientation)
+            & (_edge_side(c[:, :2], a[:, :2], p) == orientation)
+        )
+
+        # Barycentric coordinates for the height of the crossing
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = _cross2(b[:, :2] - p, c[:, :2] - p) / area
+            v = _cross2(c[:, :2] - p, a[:, :2] - p) / area
+            w = 1 - u - v
+
+        z = u[hit] * a[hit, 2] + v[hit] * b[hit, 2] + w[hit] * c[hit, 2]
+        return points[hit], z
+
+    def _build_voxels(self):
+        nx, ny, nz = self._dims
+
+        # Column centres, nudged off the voxel grid so rays don't run exactly through edges and vertices
+        ix, iy = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+        xy = self._origin[:2] + (np.stack((ix.ravel(), iy.ravel()), axis=1) + 0.5 + _NUDGE) * self._size
+        rays, z = self._crossings(xy, np.arange(nx * ny))
+
+        # A voxel is inside if an odd number of crossings lies above its centre
+        above = np.clip(np.ceil((z - self._origin[2]) / self._size - 0.5).astype(np.int64), 0, nz)
+        toggles = np.zeros((nx * ny, nz + 1), dtype=np.int32)
+        np.add.at(toggles, (rays, above), 1)
+        counts = np.cumsum(toggles[:, ::-1], axis=1)[:, ::-1]
+        self._inside = (counts[:, 1:] % 2 == 1).reshape((nx, ny, nz))
+        """Inside/outside of the voxel centres."""
+
+        # Voxels the bounding box of any triangle overlaps need exact tests
+        self._boundary = np.zeros((nx, ny, nz), dtype=bool)
+        """Voxels close to the surface."""
+        lo = np.floor((self._corners.min(axis=1) - self._origin) / self._size).astype(np.int64)
+        hi = np.floor((self._corners.max(axis=1) - self._origin) / self._size).astype(np.int64)
+        lo = np.clip(lo, 0, self._dims - 1)
+        sizes = np.clip(hi, 0, self._dims - 1) - lo + 1
+
+        # One entry per triangle and overlapped voxel
+        counts = np.prod(sizes, axis=1)
+        tris = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        sy, sz = sizes[tris, 1], sizes[tris, 2]
+        self._boundary[
+            lo[tris, 0] + local // (sy * sz),
+            lo[tris, 1] + (local // sz) % sy,
+            lo[tris, 2] + local % sz,
+        ] = True
+
+    # ==============================================================================
+    # Queries ======================================================================
+    # ==============================================================================
+    def contains(self, points):
+        """
+        Whether points are inside the surface.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            Nx3 array of coordinates.
+
+        Returns
+        -------
+        inside : numpy.ndarray
+            Boolean mask over the points.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+        inside = np.zeros((points.shape[0],), dtype=bool)
+
+        voxels = np.floor((points - self._origin) / self._size).astype(np.int64)
+        in_grid = np.all((voxels >= 0) & (voxels < self._dims), axis=1)
+        rows = np.nonzero(in_grid)[0]
+        voxels = voxels[rows]
+
+        # Far from the surface the voxel decides
+        boundary = self._boundary[voxels[:, 0], voxels[:, 1], voxels[:, 2]]
+        inside[rows[~boundary]] = self._inside[voxels[~boundary, 0], voxels[~boundary, 1], voxels[~boundary, 2]]
+
+        # Close to the surface count the crossings above each point
+        rows = rows[boundary]
+        if len(rows) > 0:
+            xy = points[rows, :2]
+            rays, z = self._crossings(xy, self._column_of(xy))
+            above = z > points[rows[rays], 2]
+            inside[rows] = np.bincount(rays[above], minlength=len(rows)) % 2 == 1
+
+        return inside
+
+
+_NUDGE = np.array([np.sqrt(2) - 1, np.sqrt(3) - 1.5]) * 1e-3
+"""Offset of the column rays from the voxel centres, in voxels."""
+
+
+def _cross2(a, b):
+    return a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+
+
+def _edge_side(a, b, p):
+    """
+    Side of the points p relative to the edges a -> b in 2D, 1 for left and -1 for right.
+
+    Points on an edge are treated as if moved by an infinitesimal offset (e, e^2), so that a ray through an edge or
+    vertex shared by several triangles crosses exactly one of them. The edges are evaluated with their endpoints in a
+    fixed order to give the same result for all triangles sharing them.
+    """
+    swap = (a[:, 0] > b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] > b[:, 1]))
+    lo = np.where(swap[:, np.newaxis], b, a)
+    d = np.where(swap[:, np.newaxis], a, b) - lo
+
+    side = _cross2(d, p - lo)
+    tie = np.where(d[:, 1] != 0, -d[:, 1], d[:, 0])
+    side = np.sign(np.where(side != 0, side, tie))
+
+    return np.where(swap, -side, side)
+
+
+_cache = weakref.WeakKeyDictionary()
+"""Maps surface -> (geometry key, SurfaceContainment)."""
+
+
+def surface_containment(surface, vertices=None):
+    """
+    SurfaceContainment of a surface, cached until its geometry changes.
+
+    Parameters
+    ----------
+    surface : chimerax.graphics.Drawing
+        A closed surface.
+    vertices : numpy.ndarray or None
+        Vertices to use instead of surface.vertices, e.g. transformed to scene coordinates.
+
+    Returns
+    -------
+    containment : SurfaceContainment
+    """
+    if vertices is None:
+        vertices = surface.vertices
+    vertices = np.ascontiguousarray(vertices)
+    triangles = np.ascontiguousarray(surface.triangles)
+
+    key = (
+        vertices.shape,
+        triangles.shape,
+        hashlib.blake2b(vertices, digest_size=16).digest(),
+        hashlib.blake2b(triangles, digest_size=16).digest(),
+    )
+
+    cached = _cache.get(surface)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    containment = SurfaceContainment(vertices, triangles)
+    _cache[surface] = (key, containment)
+    return containment
@@ -0,0 +1,164 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+
+def suppress_duplicates(pairs, ranks):
+    """
+    Greedy non-maximum suppression: particles are visited by rank, and a particle is kept unless it is a neighbour of a
+    particle kept before it.
+
+    Instead of visiting the particles one at a time, all particles that rank better than all their undecided neighbours
+    are kept at once and their neighbours are dropped, until every particle is decided. This gives the same result as
+    the sequential greedy order.
+
+    Parameters
+    ----------
+    pairs : numpy.ndarray
+        Mx2 array of neighbouring particle rows.
+    ranks : numpy.ndarray
+        Distinct rank of each particle, lower is better.
+
+    Returns
+    -------
+    keep, cluster : numpy.ndarray, numpy.ndarray
+        Boolean mask of kept particles, and for every particle the row of the best ranked kept neighbour it was
+        dropped for (its own row if it was kept).
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    count = ranks.shape[0]
+    pairs = np.asarray(pairs, dtype=np.int64).reshape((-1, 2))
+
+    # Both directions, so every particle sees all its neighbours in the second column
+    a = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    b = np.concatenate((pairs[:, 1], pairs[:, 0]))
+
+    keep = np.zeros((count,), dtype=bool)
+    undecided = np.ones((count,), dtype=bool)
+    while len(a) > 0:
+        # Best rank among the undecided neighbours
+        best = np.full((count,), count, dtype=np.int64)
+        np.minimum.at(best, a, ranks[b])
+
+        local = undecided & (ranks < best)
+        keep |= local
+
+        # Neighbours of kept particles are dropped
+        dropped = np.zeros((count,), dtype=bool)
+        dropped[b[local[a]]] = True
+        undecided &= ~(local | dropped)
+
+        remaining = undecided[a] & undecided[b]
+        a, b = a[remaining], b[remaining]
+
+    # Particles without undecided neighbours left are kept
+    keep |= undecided
+
+    # Every dropped particle goes to the best ranked kept neighbour
+    cluster = np.arange(count)
+    a = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    b = np.concatenate((pairs[:, 1], pairs[:, 0]))
+    assign = ~keep[a] & keep[b]
+    best = np.full((count,), count, dtype=np.int64)
+    np.minimum.at(best, a[assign], ranks[b[assign]])
+
+    dropped = np.nonzero(~keep)[0]
+    by_rank = np.argsort(ranks)
+    cluster[dropped] = by_rank[best[dropped]]
+
+    return keep, cluster
+
+
+def average_rotations(rotations, cluster, count):
+    """
+    Average rotation matrices per cluster: the mean matrix is projected to the closest rotation.
+
+    Parameters
+    ----------
+    rotations : numpy.ndarray
+        Nx3x3 rotation matrices.
+    cluster : numpy.ndarray
+        Cluster index of every rotation.
+    count : int
+        Number of clusters.
+
+    Returns
+    -------
+    rotations : numpy.ndarray
+        count x 3 x 3 rotation matrices.
+    """
+    mean = np.zeros((count, 3, 3))
+    np.add.at(mean, cluster, rotations)
+
+    u, _, vt = np.linalg.svd(mean)
+    det = np.sign(np.linalg.det(u @ vt))
+    u[:, :, 2] *= det[:, np.newaxis]
+    return u @ vt
+
+
+def dedup_particles(partlist, radius, score=None, lowest=False, average=False):
+    """
+    Remove near-duplicate particles of a particle list. Particles within radius of each other are clustered around the
+    best particle by score, which is kept and the others deleted.
+
+    Parameters
+    ----------
+    partlist : ParticleList
+        The particle list.
+    radius : float
+        Particles closer than this are duplicates.
+    score : str or None
+        Attribute deciding which particle to keep, or None to keep the first.
+    lowest : bool
+        Whether a lower score is better.
+    average : bool
+        Whether to move the kept particles to the mean position and orientation of their cluster.
+
+    Returns
+    -------
+    deleted : int
+        Number of deleted particles.
+    """
+    count = partlist.size
+    if count < 2:
+        return 0
+
+    index = partlist.neighbour_index()
+    pairs = index.pairs(radius)
+    if len(pairs) == 0:
+        return 0
+
+    # Rank by score, ties and the order without a score go to the lower row
+    if score is None:
+        ranks = np.arange(count)
+    else:
+        values = partlist.get_attribute_values(score)
+        order = np.lexsort((np.arange(count), values if lowest else -values))
+        ranks = np.empty((count,), dtype=np.int64)
+        ranks[order] = np.arange(count)
+
+    keep, cluster = suppress_duplicates(pairs, ranks)
+    ids = partlist.particle_ids
+
+    if average:
+        # Only clusters with more than one particle change
+        members = np.nonzero(np.bincount(cluster, minlength=count)[cluster] > 1)[0]
+        kept, local = np.unique(cluster[members], return_inverse=True)
+
+        sizes = np.bincount(local)[:, np.newaxis]
+        coords = np.zeros((len(kept), 3))
+        np.add.at(coords, local, index.coords[members])
+        coords /= sizes
+
+        angles = np.stack([partlist.get_attribute_values(a)[members] for a in ("ang_1", "ang_2", "ang_3")], axis=1)
+        rotations = partlist.data._rot().as_matrices(angles[:, 0], angles[:, 1], angles[:, 2])
+        rotations = average_rotations(rotations, local, len(kept))
+
+        partlist.set_particle_transforms(ids[kept].tolist(), coords, rotations)
+
+    # Delete all duplicates at once
+    deleted = ids[~keep]
+    partlist.delete_data(deleted.tolist())
+
+    return len(deleted)
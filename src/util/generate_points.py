@@ -1,7 +1,4 @@
-from chimerax.geometry._geometry import closest_triangle_intercept
-from chimerax.geometry import z_align
 import numpy as np
-import time
 
 
 def generate_points_in_bbox(session, surface, radius=1, num_pts=100, method='poisson', n_candidates=30):
@@ -20,30 +17,193 @@ def generate_points_in_bbox(session, surface, radius=1, num_pts=100, method='poi
 
 
 def generate_points_in_surface(session, surface, radius=100, num_pts=100, method='poisson', n_candidates=30, exact_num=False):
-    if method not in ['poisson', 'uniform', 'regular grid']:
+    if method not in ['poisson', 'uniform', 'regular grid', 'jittered grid']:
         return
     bbox = surface.bounds()
     xyz_min, xyz_max = bbox.xyz_min, bbox.xyz_max
+
+    from .containment import surface_containment
+    containment = surface_containment(surface)
+
     if method == 'poisson':
-        coords = generate_poisson_disc_pts(radius, xyz_min, xyz_max, n_candidates)
+        coords = poisson_in_volume(containment, radius, xyz_min, xyz_max, num_pts=num_pts if exact_num else None)
     elif method == 'uniform':
-        coords = generate_random_pts(num_pts, xyz_min, xyz_max)
+        if exact_num:
+            coords = uniform_in_volume(containment, num_pts, xyz_min, xyz_max)
+        else:
+            coords = generate_random_pts(num_pts, xyz_min, xyz_max)
+            coords = coords[containment.contains(coords)]
+    elif method == 'jittered grid':
+        coords = jittered_in_volume(containment, num_pts, xyz_min, xyz_max)
     else:
         coords = generate_regular_grid_pts(num_pts, xyz_min, xyz_max)
+        coords = coords[containment.contains(coords)]
+
+    if exact_num and len(coords) < num_pts:
+        session.logger.warning(
+            "Only {} of {} points could be placed inside {}, is the surface closed?".format(
+                len(coords), num_pts, surface.name
+            )
+        )
+
+    create_partlist_from_coords(session, surface.name + " " + method + " particles inside", coords)
+
+
+VOLUME_BLOCK = 2 ** 18
+"""Number of candidates classified at once when sampling in a volume."""
+VOLUME_MAX_BLOCKS = 1000
+"""Number of blocks in a row without samples inside after which sampling in a volume gives up, e.g. for surfaces that
+are not closed."""
+POISSON_PACKING = 0.3
+"""Fraction of the volume filled by spheres of half the radius in typical Poisson disk samples."""
+
+
+def uniform_in_volume(containment, num_pts, xyz_min, xyz_max, rng=None):
+    """
+    Exactly num_pts uniform samples inside a closed surface.
+
+    Candidates are drawn in the bounding box in blocks sized by the fraction of the box inside the surface seen so far,
+    and classified at once.
+
+    Parameters
+    ----------
+    containment : SurfaceContainment
+        Containment test of the surface.
+    num_pts : int
+        Number of samples.
+    xyz_min, xyz_max : numpy.ndarray
+        Bounding box of the surface.
+    rng : numpy.random.Generator or None
+        Random number generator.
+
+    Returns
+    -------
+    coords : numpy.ndarray
+        Nx3 coordinates, fewer than num_pts only if none of VOLUME_MAX_BLOCKS blocks in a row was inside.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    blocks = []
+    found = tried = empty = 0
+    while found < num_pts and empty < VOLUME_MAX_BLOCKS:
+
+        # Enough candidates for the remaining samples at the fraction inside seen so far, plus some margin
+        fraction = (found + 1) / (tried + 1)
+        size = int(min(max((num_pts - found) / fraction * 1.1, 1024), VOLUME_BLOCK))
+        coords = generate_random_pts(size, xyz_min, xyz_max, rng=rng)
+        coords = coords[containment.contains(coords)]
+
+        blocks.append(coords)
+        found += len(coords)
+        tried += size
+        empty = empty + 1 if len(coords) == 0 else 0
+
+    if not blocks:
+        return np.zeros((0, 3))
+
+    return np.concatenate(blocks)[:num_pts]
+
+
+def jittered_in_volume(containment, num_pts, xyz_min, xyz_max, rng=None):
+    """
+    Stratified samples inside a closed surface: one random sample in every cell of a cubic grid, cells sized so that
+    about num_pts samples fall inside.
+
+    Parameters
+    ----------
+    containment : SurfaceContainment
+        Containment test of the surface.
+    num_pts : int
+        Approximate number of samples.
+    xyz_min, xyz_max : numpy.ndarray
+        Bounding box of the surface.
+    rng : numpy.random.Generator or None
+        Random number generator.
+
+    Returns
+    -------
+    coords : numpy.ndarray
+        Nx3 coordinates.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    xyz_min = np.asarray(xyz_min, dtype=np.float64)
+    lens = np.asarray(xyz_max, dtype=np.float64) - xyz_min
+    cell = float(np.cbrt(_inside_volume(containment, xyz_min, xyz_max, rng) / max(num_pts, 1)))
+    if cell <= 0:
+        return np.zeros((0, 3))
+
+    # Cells are handled one z slab at a time to bound memory
+    dims = np.maximum(np.ceil(lens / cell).astype(np.int64), 1)
+    x, y = np.meshgrid(np.arange(dims[0]), np.arange(dims[1]), indexing='ij')
+    xy = np.stack((x.ravel(), y.ravel()), axis=1)
+
+    blocks = []
+    slabs = max(VOLUME_BLOCK // len(xy), 1)
+    for z0 in range(0, dims[2], slabs):
+        z = np.arange(z0, min(z0 + slabs, dims[2]))
+        cells = np.concatenate((np.tile(xy, (len(z), 1)), np.repeat(z, len(xy))[:, np.newaxis]), axis=1)
+        coords = xyz_min + (cells + rng.random(cells.shape)) * cell
+        blocks.append(coords[containment.contains(coords)])
+
+    return np.concatenate(blocks)
+
+
+POISSON_POOL_FACTOR = 10
+"""Number of pool samples per radius**3 of volume for Poisson disk sampling in a volume."""
+POISSON_MAX_POOL = 10 ** 7
+"""Upper limit of the pool size for Poisson disk sampling in a volume."""
+
+
+def poisson_in_volume(containment, radius, xyz_min, xyz_max, num_pts=None, rng=None):
+    """
+    Poisson disk samples inside a closed surface, thinned from a pool of uniform samples on a background grid (see
+    poisson_disk_subset).
+
+    Parameters
+    ----------
+    containment : SurfaceContainment
+        Containment test of the surface.
+    radius : float or None
+        Minimum distance between samples. Only a starting guess if num_pts is set, estimated from the volume if None.
+    xyz_min, xyz_max : numpy.ndarray
+        Bounding box of the surface.
+    num_pts : int or None
+        If set, the radius is adjusted to return exactly this many samples (see poisson_disk_target).
+    rng : numpy.random.Generator or None
+        Random number generator.
+
+    Returns
+    -------
+    coords : numpy.ndarray
+        Nx3 coordinates.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if num_pts is not None:
+        pool_size = num_pts * 10
+        if radius is None:
+            volume = _inside_volume(containment, xyz_min, xyz_max, rng)
+            radius = float(np.cbrt(6 * POISSON_PACKING * volume / (np.pi * max(num_pts, 1))))
+    else:
+        volume = _inside_volume(containment, xyz_min, xyz_max, rng)
+        pool_size = int(np.ceil(POISSON_POOL_FACTOR * volume / float(radius) ** 3))
+    pool = uniform_in_volume(containment, min(pool_size, POISSON_MAX_POOL), xyz_min, xyz_max, rng=rng)
 
-    coords_in_surface = []
-    for coord in coords:
-        if is_point_in_surface(coord, surface.vertices, surface.triangles, xyz_min, xyz_max):
-            coords_in_surface.append(coord)
-    if method == 'uniform' and exact_num:
-        while len(coords_in_surface) < num_pts:
-            coords = generate_random_pts(num_pts, xyz_min, xyz_max)
-            for coord in coords:
-                if is_point_in_surface(coord, surface.vertices, surface.triangles, xyz_min, xyz_max):
-                    coords_in_surface.append(coord)
-        coords_in_surface = coords_in_surface[:num_pts]
+    if num_pts is not None:
+        return pool[poisson_disk_target(pool, radius, num_pts, rng=rng)]
 
-    create_partlist_from_coords(session, surface.name + " " + method + " particles inside", coords_in_surface)
+    return pool[poisson_disk_subset(pool, radius, priority=rng.random(len(pool)))]
+
+
+def _inside_volume(containment, xyz_min, xyz_max, rng, num_samples=VOLUME_BLOCK):
+    """Monte Carlo estimate of the volume inside the surface."""
+    coords = generate_random_pts(num_samples, xyz_min, xyz_max, rng=rng)
+    fraction = np.count_nonzero(containment.contains(coords)) / num_samples
+    return fraction * float(np.prod(np.asarray(xyz_max, dtype=np.float64) - xyz_min))
 
 
 def generate_poisson_disc_pts(radius, xyz_min, xyz_max, n_candidates):
@@ -59,11 +219,11 @@ def generate_poisson_disc_pts(radius, xyz_min, xyz_max, n_candidates):
     return samples * (xyz_max-xyz_min) + xyz_min
 
 
-def generate_random_pts(num_total_pts, xyz_min, xyz_max):
-    rng = np.random.default_rng()
-    lens = xyz_max - xyz_min
-    return np.array([[rng.random() * lens[0] + xyz_min[0], rng.random() * lens[1] + xyz_min[1], rng.random() * lens[2] + xyz_min[2]]
-                    for i in range(num_total_pts)])
+def generate_random_pts(num_total_pts, xyz_min, xyz_max, rng=None):
+    if rng is None:
+        rng = np.random.default_rng()
+    xyz_min = np.asarray(xyz_min, dtype=np.float64)
+    return rng.random((num_total_pts, 3)) * (np.asarray(xyz_max, dtype=np.float64) - xyz_min) + xyz_min
 
 
 def generate_regular_grid_pts(num_total_pts, xyz_min, xyz_max):
@@ -74,40 +234,17 @@ def generate_regular_grid_pts(num_total_pts, xyz_min, xyz_max):
     return np.stack((xx, yy, zz), axis=-1).reshape(num_pts_per_axis ** 3, 3)
 
 
-def is_point_in_surface(point, vertices, triangles, xyz_min, xyz_max):
-    closest_side = np.argmin(np.append(point-xyz_min, xyz_max-point))
-    end = point.copy()
-    end[closest_side % 3] = np.append(xyz_min, xyz_max)[closest_side]
-
-    cti = closest_triangle_intercept
-    fraction_of_distance, tnum = cti(vertices, triangles, point, end)
-
-    dist_to_end = end - point
-    start = point
-    intercepts = 0
-    margin = 1.001
-    while fraction_of_distance is not None:
-        intercepts += 1
-        if intercepts > 1000:
-            print("TOO MANY INTERSEPTS")
-            return False
-        start = start + fraction_of_distance*margin*dist_to_end
-        dist_to_end = end - start
-        fraction_of_distance, tnum = cti(vertices, triangles, start, end)
-    return bool(intercepts % 2)
-
-
-def create_partlist_from_coords(session, name, points, using_points=False):
+def create_partlist_from_coords(session, name, points, using_points=False, rotations=None):
     artia = session.ArtiaX
     artia.create_partlist(name=name)
     partlist = artia.partlists.child_models()[-1]
-    from chimerax.geometry import translation
     if using_points:
-        origins = [translation(point.coord) for point in points]
+        origins = np.array([point.coord for point in points], dtype=np.float64)
         rotations = [point.rotation for point in points]
     else:
-        origins = [translation(coord) for coord in points]
-        rotations = origins
+        origins = np.asarray(points, dtype=np.float64)
+        if rotations is None:
+            rotations = np.tile(np.identity(3), (len(points), 1, 1))
     shifts = np.zeros((len(points), 3))
     partlist.new_particles(origins, shifts, rotations)
 
@@ -125,99 +262,313 @@ def generate_points_on_surface(session, surface, num_pts=100, radius=10, method=
         return
 
     if method == 'uniform':
-        points = uniform_on_surface(surface, num_pts)
+        coords, rotations = uniform_on_surface(surface, num_pts)
     else:
-        points = poisson_on_surface(surface, radius, num_pts, exact_num)
+        coords, rotations = poisson_on_surface(surface, radius, num_pts, exact_num)
 
-    create_partlist_from_coords(session, "Particles on " + surface.name + " " + method, points, using_points=True)
+    create_partlist_from_coords(session, "Particles on " + surface.name + " " + method, coords, rotations=rotations)
 
 
-def uniform_on_surface(surface, num_pts):
-    # Using the unbiased sampling (version 2) from https://vcg.isti.cnr.it/Publications/2012/CCS12/TVCG-2011-07-0217.pdf
-    verts, tris, norms = surface.vertices, surface.triangles, surface.normals
-    from chimerax.surface import surface_area
-    from chimerax.geometry import z_align
-    tri_areas = [surface_area(verts, [tri]) for tri in tris]
-    max_area = max(tri_areas)
-    points = []
-    for j in range(num_pts):
-        while True:
-            i = np.random.randint(0, len(tris))
-            val = np.random.random()
-            if val < tri_areas[i]/max_area:
-                coord = generate_point_on_tri(verts[tris[i]])
-                normal = norms[tris[i]].mean(0)
-                rotation = z_align(coord, coord + normal).zero_translation().inverse()
-                points.append(Point(coord, rotation))
-                break
-    return points
-
+def uniform_on_surface(surface, num_pts, rng=None):
+    """
+    Area weighted uniform samples on a surface, oriented with z along the surface normal.
 
-def generate_point_on_tri(verts):
-    a, b = verts[1]-verts[0], verts[2]-verts[0]
-    u1, u2 = np.random.random(), np.random.random()
-    if u1 + u2 > 1:
-        u1, u2 = 1 - u1, 1-u2
-    return verts[0] + u1*a + u2*b
+    Parameters
+    ----------
+    surface : chimerax.graphics.Drawing
+        The surface.
+    num_pts : int
+        Number of samples.
+    rng : numpy.random.Generator or None
+        Random number generator.
 
+    Returns
+    -------
+    coords, rotations : numpy.ndarray, numpy.ndarray
+        Nx3 coordinates and Nx3x3 rotation matrices.
+    """
+    verts, tris, norms = surface.vertices, surface.triangles, surface.normals
+    if rng is None:
+        rng = np.random.default_rng()
+
+    # Triangles are picked by binary search in the cumulative areas
+    corners = verts[tris].astype(np.float64)
+    a = corners[:, 1] - corners[:, 0]
+    b = corners[:, 2] - corners[:, 0]
+    cumulative_areas = np.cumsum(np.linalg.norm(np.cross(a, b), axis=1))
+    picked = np.searchsorted(cumulative_areas, rng.random(num_pts) * cumulative_areas[-1], side='right')
+    picked = np.minimum(picked, len(tris) - 1)
+
+    # Uniform in the triangle by folding the unit square
+    u = rng.random((num_pts, 2))
+    folded = u.sum(axis=1) > 1
+    u[folded] = 1 - u[folded]
+    coords = corners[picked, 0] + u[:, :1] * a[picked] + u[:, 1:] * b[picked]
+
+    normals = norms[tris[picked]].mean(axis=1)
+    return coords, z_align_rotations(normals)
+
+
+def z_align_rotations(directions):
+    """
+    Rotations taking the z axis to each direction, equal to z_align(p, p + direction).zero_translation().inverse().
+
+    Parameters
+    ----------
+    directions : numpy.ndarray
+        Nx3 array of directions, need not be normalized.
+
+    Returns
+    -------
+    rotations : numpy.ndarray
+        Nx3x3 rotation matrices.
+    """
+    d = np.asarray(directions, dtype=np.float64).reshape((-1, 3))
+    length = np.linalg.norm(d, axis=1)
+    d = d / np.where(length > 0, length, 1)[:, np.newaxis]
+    a, b, c = d[:, 0], d[:, 1], d[:, 2]
+    h = np.sqrt(a * a + c * c)
+
+    # Rows of the z_align rotation
+    aligned = np.zeros((len(d), 3, 3))
+    regular = h > 0.0001
+    hr = np.where(regular, h, 1)
+    aligned[:, 0] = np.stack((c / hr, np.zeros_like(a), -a / hr), axis=1)
+    aligned[:, 1] = np.stack((-a * b / hr, h, -b * c / hr), axis=1)
+    aligned[:, 2] = d
+
+    # Directions along y
+    up = ~regular & (b > 0)
+    down = ~regular & (b <= 0)
+    aligned[up] = [[1, 0, 0], [0, 0, -1], [0, 1, 0]]
+    aligned[down] = [[1, 0, 0], [0, 0, 1], [0, -1, 0]]
+
+    # The inverse of a rotation is its transpose
+    return np.transpose(aligned, (0, 2, 1))
+
+
+def poisson_on_surface(surface, radius, num_pts, exact_num=True, rng=None):
+    """
+    Poisson disk samples on a surface, oriented with z along the surface normal.
+
+    Using the Constrained Sample-Based Poisson-Disk Sampling from
+    https://vcg.isti.cnr.it/Publications/2012/CCS12/TVCG-2011-07-0217.pdf: a pool of uniform samples is thinned until no
+    two samples are within radius of each other. With exact_num, the radius is bisected (never below the requested
+    radius if that already gives enough samples) so that about num_pts samples remain, and the excess is dropped at
+    random.
+
+    Parameters
+    ----------
+    surface : chimerax.graphics.Drawing
+        The surface.
+    radius : float
+        Minimum distance between samples.
+    num_pts : int
+        Number of samples to aim for, the pool has ten times as many samples if exact_num is set.
+    exact_num : bool
+        Whether to return exactly num_pts samples.
+    rng : numpy.random.Generator or None
+        Random number generator.
+
+    Returns
+    -------
+    coords, rotations : numpy.ndarray, numpy.ndarray
+        Nx3 coordinates and Nx3x3 rotation matrices.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
 
-def poisson_on_surface(surface, radius, num_pts, exact_num=True):
-    # Using the Constrained Sample-Based Poisson-Disk Sampling from https://vcg.isti.cnr.it/Publications/2012/CCS12/TVCG-2011-07-0217.pdf
-
-    # Generate a pool of points using uniform sampling
     num_to_gen = num_pts * 10 if exact_num else num_pts
-    sample_pool = uniform_on_surface(surface, num_to_gen)
-    bounds = surface.bounds()
-    xyz_min = bounds.xyz_min
-    # Sort all the points into cells with side length r
-    cells = fill_spacial_hash_table(xyz_min, radius, sample_pool)
-
-    points = []
-    while list(cells.values()):
-        # Extracting a sample from the dict of potential points
-        sample = list(cells.values())[0][0]
-        index = np.array(list(cells.keys())[0])
-        points.append(sample)
-        # Remove all samples within r distance from the chosen sample
-        remove_samples(sample, index, radius, cells)
+    pool, rotations = uniform_on_surface(surface, num_to_gen, rng=rng)
+    priority = rng.random(len(pool))
 
     if exact_num:
-        while len(points) < num_pts:
-            old_num_of_pts = len(points)
-
-            sample_pool = np.append(points, uniform_on_surface(surface, num_to_gen))
-            cells = fill_spacial_hash_table(xyz_min, radius, sample_pool)
-            points = []
-            while list(cells.values()):
-                # Extracting a sample from the dict of potential points
-                sample = list(cells.values())[0][0]
-                index = np.array(list(cells.keys())[0])
-                points.append(sample)
-                # Remove all samples within r distance from the chosen sample
-                remove_samples(sample, index, radius, cells)
-            if len(points) <= old_num_of_pts:
+        selected = poisson_disk_target(pool, radius, num_pts, priority=priority, rng=rng)
+    else:
+        selected = poisson_disk_subset(pool, radius, priority=priority)
+
+    return pool[selected], rotations[selected]
+
+
+POISSON_BISECTIONS = 10
+"""Number of bisection steps used to find the radius for a target count."""
+
+
+def poisson_disk_target(coords, radius, num_pts, priority=None, rng=None):
+    """
+    Poisson disk subset of a sample pool with exactly num_pts samples (or all samples if the pool is smaller).
+
+    The largest radius giving at least num_pts samples is searched by bisection, starting from radius. The excess
+    samples at that radius are dropped at random.
+
+    Parameters
+    ----------
+    coords : numpy.ndarray
+        Nx3 array of pool coordinates.
+    radius : float
+        Initial radius.
+    num_pts : int
+        Number of samples.
+    priority : numpy.ndarray or None
+        Samples with lower priority are tried first, random if None.
+    rng : numpy.random.Generator or None
+        Random number generator.
+
+    Returns
+    -------
+    selected : numpy.ndarray
+        Indices of the selected samples.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+    if rng is None:
+        rng = np.random.default_rng()
+    if priority is None:
+        priority = rng.random(len(coords))
+    if len(coords) <= num_pts:
+        return np.arange(len(coords))
+
+    extent = float(np.linalg.norm(coords.max(axis=0) - coords.min(axis=0)))
+    radius = min(float(radius), extent) if radius is not None and radius > 0 else extent / 2
+
+    # Bracket the radius: lower gives enough samples, upper does not
+    lower = upper = radius
+    selected = poisson_disk_subset(coords, radius, priority=priority)
+    if len(selected) >= num_pts:
+        best = selected
+        while upper < extent:
+            upper = min(upper * 2, extent)
+            candidate = poisson_disk_subset(coords, upper, priority=priority)
+            if len(candidate) < num_pts:
                 break
-        points = points[:num_pts]
-
-    return points
-
-
-def fill_spacial_hash_table(xyz_min, side_length, sample_pool):
-    from collections import defaultdict
-    cells = defaultdict(list)
-    for sample in sample_pool:
-        index = np.floor((sample.coord - xyz_min)/side_length).astype(int)
-        cells[tuple(index)].append(sample)
-
-    return cells
-
-
-def remove_samples(sample, index, radius, cells):
-    from itertools import product
-    indices_to_check = [tuple(index + around) for around in product([-1, 0, 1], repeat=3)]
-    indices_to_check = [index for index in indices_to_check if (np.asarray(index)>=[0,0,0]).all()]
-    for index in indices_to_check:
-        cells[index] = [point for point in cells[index] if np.linalg.norm(sample.coord - point.coord) > radius]
-        if not cells[index]:
-            del cells[index]
-
+            lower, best = upper, candidate
+        else:
+            # Even the size of the pool leaves enough samples
+            return _random_subset(best, num_pts, rng)
+    else:
+        best = None
+        for _ in range(POISSON_BISECTIONS):
+            lower /= 2
+            candidate = poisson_disk_subset(coords, lower, priority=priority)
+            if len(candidate) >= num_pts:
+                best = candidate
+                break
+            upper = lower
+        if best is None:
+            return _random_subset(np.arange(len(coords)), num_pts, rng)
+
+    for _ in range(POISSON_BISECTIONS):
+        if len(best) == num_pts:
+            break
+
+        middle = (lower + upper) / 2
+        candidate = poisson_disk_subset(coords, middle, priority=priority)
+        if len(candidate) >= num_pts:
+            lower, best = middle, candidate
+        else:
+            upper = middle
+
+    return _random_subset(best, num_pts, rng)
+
+
+def _random_subset(indices, num, rng):
+    if len(indices) <= num:
+        return indices
+    return np.sort(rng.choice(indices, size=num, replace=False))
+
+
+POISSON_CHUNK = 8192
+"""Number of cells tested at once, bounds the memory of the neighbour lookup."""
+POISSON_DENSE_CELLS = 2 ** 25
+"""Grids with up to this many cells are looked up directly instead of by binary search."""
+
+
+def poisson_disk_subset(coords, radius, priority=None):
+    """
+    Maximal subset of a sample pool in which no two samples are within radius of each other.
+
+    The pool is binned into a grid with cell size radius / sqrt(3), so every cell holds at most one accepted sample and
+    only the 5x5x5 cells around a sample need to be checked. Cells are processed in 27 interleaved phases, no two cells
+    of one phase can conflict, so all cells of a phase try their next candidate at once.
+
+    Parameters
+    ----------
+    coords : numpy.ndarray
+        Nx3 array of pool coordinates.
+    radius : float
+        Minimum distance between samples.
+    priority : numpy.ndarray or None
+        Within a cell, samples with lower priority are tried first. Random if None.
+
+    Returns
+    -------
+    selected : numpy.ndarray
+        Sorted indices of the accepted samples.
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape((-1, 3))
+    n = len(coords)
+    if n == 0 or radius <= 0:
+        return np.arange(n)
+    if priority is None:
+        priority = np.random.default_rng().random(n)
+
+    # Cell indices, padded by two cells so that neighbour keys never wrap around. Cells are limited to 2**20 per axis
+    # to keep the keys in int64, at which point the radius is negligible compared to the extent anyway.
+    lo = coords.min(axis=0)
+    cell = max(radius / np.sqrt(3), float((coords.max(axis=0) - lo).max()) / 2 ** 20)
+    idx = np.floor((coords - lo) / cell).astype(np.int64) + 2
+    dims = idx.max(axis=0) + 3
+    keys = (idx[:, 0] * dims[1] + idx[:, 1]) * dims[2] + idx[:, 2]
+
+    # Pool sorted by cell, then priority
+    order = np.lexsort((priority, keys))
+    cells, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    cell_idx = idx[order[starts]]
+    phases = (cell_idx[:, 0] % 3) * 9 + (cell_idx[:, 1] % 3) * 3 + cell_idx[:, 2] % 3
+
+    offsets = np.arange(-2, 3)
+    offsets = np.stack(np.meshgrid(offsets, offsets, offsets, indexing="ij"), axis=-1).reshape((-1, 3))
+    # Cells that can hold a sample within radius, i.e. all but the centre and the corners
+    reach = np.sum(np.maximum(np.abs(offsets) - 1, 0) ** 2, axis=1)
+    offsets = offsets[np.any(offsets != 0, axis=1) & (reach < 3)]
+    offset_keys = (offsets[:, 0] * dims[1] + offsets[:, 1]) * dims[2] + offsets[:, 2]
+
+    accepted = np.full((len(cells),), -1, dtype=np.int64)
+    """Accepted pool index per cell."""
+    tried = np.zeros((len(cells),), dtype=np.int64)
+    """Number of candidates tried per cell."""
+    r2 = radius * radius
+
+    # Accepted pool index per cell of the whole grid, if it is small enough
+    grid = None
+    if np.prod(dims.astype(np.float64)) <= POISSON_DENSE_CELLS:
+        grid = np.full((int(np.prod(dims)),), -1, dtype=np.int64)
+
+    active = np.arange(len(cells))
+    while len(active) > 0:
+        for phase in range(27):
+            group = active[phases[active] == phase]
+            for chunk in range(0, len(group), POISSON_CHUNK):
+                c = group[chunk:chunk + POISSON_CHUNK]
+                candidates = order[starts[c] + tried[c]]
+
+                # Samples accepted in the neighbouring cells
+                neighbour_keys = cells[c][:, np.newaxis] + offset_keys
+                if grid is not None:
+                    neighbours = grid[neighbour_keys]
+                else:
+                    pos = np.minimum(np.searchsorted(cells, neighbour_keys), len(cells) - 1)
+                    neighbours = np.where(cells[pos] == neighbour_keys, accepted[pos], -1)
+
+                rows, cols = np.nonzero(neighbours >= 0)
+                d = coords[neighbours[rows, cols]] - coords[candidates[rows]]
+                conflict = np.bincount(rows[np.sum(d * d, axis=1) < r2], minlength=len(c)) > 0
+
+                accepted[c[~conflict]] = candidates[~conflict]
+                if grid is not None:
+                    grid[cells[c[~conflict]]] = candidates[~conflict]
+                tried[c] += 1
+
+        # Cells stay active until they accepted a sample or ran out of candidates
+        active = active[(accepted[active] < 0) & (tried[active] < counts[active])]
+
+    return np.sort(accepted[accepted >= 0])
@@ -0,0 +1,93 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+# BILD commands of glyphs at unit size. Arrows have radius 1/15 and head radius 4/15 of their length.
+_ARROW = ".arrow 0 0 0 {} {} {} 0.0666666667 0.2666666667"
+GLYPHS = {
+    "axes": [
+        ".color 1 0 0",
+        _ARROW.format(1, 0, 0),
+        ".color 1 1 0",
+        _ARROW.format(0, 1, 0),
+        ".color 0 0 1",
+        _ARROW.format(0, 0, 1),
+    ],
+    "direction": [
+        _ARROW.format(1, 0, 0),
+        _ARROW.format(0, 0, 1),
+    ],
+    "camera": [
+        ".color 1 1 0",
+        _ARROW.format(0, 1, 0),
+        ".color 0 0 1",
+        _ARROW.format(0, 0, 1),
+    ],
+    "sphere": [
+        ".sphere 0 0 0 1",
+    ],
+}
+"""BILD commands by glyph name."""
+
+_unit_glyphs = {}
+"""Cached unit size surfaces by glyph name."""
+
+
+def glyph_surface(session, name, size):
+    """
+    Surface of a glyph, scaled from a cached unit size mesh.
+
+    Parameters
+    ----------
+    session : chimerax.core.session.Session
+        ChimeraX session.
+    name : str
+        Glyph name, one of GLYPHS.
+    size : float
+        Length of the arrows or radius of the sphere.
+
+    Returns
+    -------
+    vertices, normals, triangles, vertex_colors : numpy.ndarray
+        The surface. Normals and triangles are shared between calls and must not be modified.
+    """
+    if name not in _unit_glyphs:
+        _unit_glyphs[name] = _read_glyph(session, GLYPHS[name])
+
+    v, n, t, vc = _unit_glyphs[name]
+
+    # Uniform scaling keeps the normals
+    return (v * np.float32(size), n, t, vc.copy())
+
+
+def combine_surfaces(*surfaces):
+    """Concatenate several (vertices, normals, triangles, vertex_colors) surfaces into one."""
+    offsets = np.cumsum([0] + [len(s[0]) for s in surfaces[:-1]])
+
+    return (
+        np.concatenate([s[0] for s in surfaces]),
+        np.concatenate([s[1] for s in surfaces]),
+        np.concatenate([s[2] + o for s, o in zip(surfaces, offsets)]).astype(surfaces[0][2].dtype),
+        np.concatenate([s[3] for s in surfaces]),
+    )
+
+
+def _read_glyph(session, commands):
+    from chimerax.bild.bild import _BildFile
+    from chimerax.atomic import AtomicShapeDrawing
+
+    b = _BildFile(session, "dummy")
+    for command in commands:
+        tokens = command.split()
+        if tokens[0] == ".color":
+            b.color_command(tokens)
+        elif tokens[0] == ".arrow":
+            b.arrow_command(tokens)
+        elif tokens[0] == ".sphere":
+            b.sphere_command(tokens)
+
+    d = AtomicShapeDrawing("shapes")
+    d.add_shapes(b.shapes)
+
+    return (d.vertices, d.normals, d.triangles, d.vertex_colors)
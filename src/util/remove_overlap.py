@@ -2,41 +2,169 @@ from chimerax.geometry._geometry import closest_triangle_intercept
 from chimerax.geometry import z_align
 import numpy as np
 import time
+from functools import partial
+
+def remove_overlap(session, particles, pls, scms, bounds, method='distance', on_surface_particles=None, in_surface_particles=None, particles_to_keep_still=None, max_iterations=100, num_points=100, move_factor=1, rotate_to_normal=True, workers=1, redraw_every=1, redraw_interval=None, tolerance=0, progress=None):
+    """
+    Iteratively move particles until their surfaces don't overlap anymore.
+
+    Particles are moved in the particle data only. The particle lists are updated and a frame is drawn every
+    redraw_every iterations or redraw_interval seconds, and once more after the last iteration.
+
+    Parameters
+    ----------
+    redraw_every : int
+        Update the particle lists and draw every redraw_every iterations, 0 to only update them at the end.
+    redraw_interval : float or None
+        Also update and draw if more than redraw_interval seconds passed since the last time.
+    tolerance : float
+        Stop once no particle moves by more than this distance in one iteration.
+    progress : callable or None
+        Called as progress(iteration, largest_movement) after each iteration. If it returns True, the run is stopped.
+    """
+    # The work within an iteration is split among threads, NumPy releases the GIL in its heavy kernels
+    options = dict(redraw_every=redraw_every, redraw_interval=redraw_interval, tolerance=tolerance, progress=progress)
+    if workers is not None and workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            _remove_overlap(session, particles, pls, scms, bounds, method, on_surface_particles, in_surface_particles, particles_to_keep_still, max_iterations, num_points, move_factor, rotate_to_normal, executor, **options)
+    else:
+        _remove_overlap(session, particles, pls, scms, bounds, method, on_surface_particles, in_surface_particles, particles_to_keep_still, max_iterations, num_points, move_factor, rotate_to_normal, **options)
+
 
-def remove_overlap(session, particles, pls, scms, bounds, method='distance', on_surface_particles=None, in_surface_particles=None, particles_to_keep_still=None, max_iterations=100, num_points=100, move_factor=1, rotate_to_normal=True):
+def _remove_overlap(session, particles, pls, scms, bounds, method, on_surface_particles, in_surface_particles, particles_to_keep_still, max_iterations, num_points, move_factor, rotate_to_normal, executor=None, redraw_every=1, redraw_interval=None, tolerance=0, progress=None):
     if method == 'distance':
-        calculate_overlap = calculate_overlap_distance
+        calculate_overlap = partial(calculate_overlap_distance, executor=executor)
     else:
-        calculate_overlap = calculate_overlap_point_volume
+        calculate_overlap = partial(calculate_overlap_point_volume, executor=executor)
+
+    def redraw():
+        for pl in pls:
+            pl.update_places()
+        session.update_loop.draw_new_frame()
 
     movements = get_movements(calculate_overlap, particles, scms, bounds, on_surface_particles, in_surface_particles, particles_to_keep_still, num_points, move_factor, rotate_to_normal)
     iteration = 0
-    while not all(not movement.any() for movement in movements.values()):
+    last_redraw = time.time()
+    drawn = True
+    while True:
+        largest_movement = max((np.linalg.norm(movement) for movement in movements.values()), default=0)
+        if largest_movement <= tolerance:
+            break
+
         # move all the particles away from each other
         for p in particles:
-            p.origin_coord = np.asarray(p.origin_coord) + movements[p]
-        for pl in pls:
-            pl.update_places()
-        session.update_loop.draw_new_frame()
+            if movements[p].any():
+                p.origin_coord = np.asarray(p.origin_coord) + movements[p]
+        drawn = False
+
+        if (redraw_every > 0 and (iteration + 1) % redraw_every == 0) or (
+                redraw_interval is not None and time.time() - last_redraw >= redraw_interval):
+            redraw()
+            drawn = True
+            last_redraw = time.time()
+
         movements = get_movements(calculate_overlap, particles, scms, bounds, on_surface_particles, in_surface_particles, particles_to_keep_still, num_points, move_factor, rotate_to_normal)
         iteration += 1
+
+        if progress is not None and progress(iteration, largest_movement):
+            break
+
         if iteration > max_iterations:
             session.logger.warning("artiax remove overlap: {} iterations reached.".format(max_iterations))
-            return
+            break
+
+    # Commit the final positions
+    if not drawn:
+        for pl in pls:
+            pl.update_places()
 
 
 def get_movements(calculate_overlap, particles, scms, bounds, on_surface_particles, in_surface_particles, particles_to_keep_still, num_points, move_factor, rotate_to_normal):
-    movements = calculate_overlap(particles, scms, bounds, particles_to_keep_still, num_points, move_factor)
+    # Particles don't move while the movements are computed, so their vertices are transformed once
+    vertices = TransformedVertices(scms)
+
+    movements = calculate_overlap(particles, scms, bounds, particles_to_keep_still, num_points, move_factor, vertices=vertices)
     if on_surface_particles is not None:
         for ps, surface in on_surface_particles:
-            movements = project_movements_to_surface(movements, ps, surface, bounds, rotate_to_normal)
+            movements = project_movements_to_surface(movements, ps, surface, bounds, rotate_to_normal, vertices=vertices)
     if in_surface_particles is not None:
         for ps, surface, search_distance in in_surface_particles:
-            movements = bound_movements_inside_surface(movements, ps, surface, search_distance, scms)
+            movements = bound_movements_inside_surface(movements, ps, surface, search_distance, scms, vertices=vertices)
     return movements
 
 
-def project_movements_to_surface(movements, particles, surface, bounds, rotate_to_normal=True):
+class TransformedVertices:
+    """
+    Surface vertices of particles at their current position and orientation, computed once per particle and kept
+    until the particle is moved or rotated.
+
+    Parameters
+    ----------
+    scms : dict
+        Maps particle -> surface collection drawing with the untransformed vertices.
+    """
+
+    def __init__(self, scms):
+        self._scms = scms
+        self._vertices = {}
+
+    def __getitem__(self, p):
+        if p not in self._vertices:
+            self._vertices[p] = p.full_transform().transform_points(self._scms[p].vertices)
+
+        return self._vertices[p]
+
+    def invalidate(self, p):
+        """The particle was moved or rotated."""
+        self._vertices.pop(p, None)
+
+    def prefetch(self, particles, executor=None):
+        """Transform the vertices of these particles, in parallel if an executor is given."""
+        particles = [p for p in particles if p not in self._vertices]
+
+        def transform(chunk):
+            return [p.full_transform().transform_points(self._scms[p].vertices) for p in chunk]
+
+        for p, verts in zip(particles, map_chunks(transform, particles, executor)):
+            self._vertices[p] = verts
+
+
+MAP_CHUNKS = 64
+"""Number of chunks map_chunks splits the items into."""
+
+
+def map_chunks(function, items, executor=None):
+    """
+    Apply a function to consecutive chunks of items and concatenate the returned lists. With an executor the chunks are
+    processed in parallel, the results are still returned in the order of the items, so that they don't depend on the
+    number of workers.
+
+    Parameters
+    ----------
+    function : callable
+        Takes a list of items and returns a list of results of the same length.
+    items : list
+        The items.
+    executor : concurrent.futures.Executor or None
+        Runs the chunks if given, otherwise all items are processed in one call.
+
+    Returns
+    -------
+    results : list
+    """
+    if executor is None or len(items) < 2:
+        return function(items)
+
+    # More chunks than workers to even out the load
+    chunk_count = min(len(items), MAP_CHUNKS)
+    bounds = np.linspace(0, len(items), chunk_count + 1).astype(int)
+    chunks = [items[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    return [result for chunk in executor.map(function, chunks) for result in chunk]
+
+
+def project_movements_to_surface(movements, particles, surface, bounds, rotate_to_normal=True, vertices=None):
     from chimerax.geometry._geometry import closest_triangle_intercept
 
     for p in particles:
@@ -76,16 +204,22 @@ def project_movements_to_surface(movements, particles, surface, bounds, rotate_t
                 rotation = rotation_to_z.zero_translation().inverse()
                 p.rotation = rotation
 
+                if vertices is not None:
+                    vertices.invalidate(p)
+
     return movements
 
 
-def bound_movements_inside_surface(movements, particles, surface, search_distance, scms):
+def bound_movements_inside_surface(movements, particles, surface, search_distance, scms, vertices=None):
     from chimerax.geometry._geometry import find_close_points
+
+    if vertices is None:
+        vertices = TransformedVertices(scms)
+
     for p in particles:
         if not movements[p].any():
             continue
-        scm = scms[p]
-        p_verts = p.full_transform().transform_points(scm.vertices) + movements[p]
+        p_verts = vertices[p] + movements[p]
         close_points_indicies = find_close_points(p_verts, surface.vertices, search_distance)
         if not len(close_points_indicies[0]):
             continue
@@ -106,63 +240,81 @@ def bound_movements_inside_surface(movements, particles, surface, search_distanc
 
     return movements
 
-def calculate_overlap_distance(particles, scms, bounds, particles_to_keep_still=None, not_used=None, also_not_used=None):
+def calculate_overlap_distance(particles, scms, bounds, particles_to_keep_still=None, not_used=None, also_not_used=None, vertices=None, executor=None):
     from chimerax.geometry._geometry import find_close_points
 
-    overlaps = {p: [] for p in particles}
-    for i, p in enumerate(particles[:-1]):
-        bounds_p = bounds[p]
-        xyz_min_p, xyz_max_p = np.array(bounds_p.xyz_min + p.coord), np.array(bounds_p.xyz_max + p.coord)
-        for j, other_p in enumerate(particles[i + 1:]):
-            bounds_other_p = bounds[other_p]
-            xyz_min_other_p, xyz_max_other_p = np.array(bounds_other_p.xyz_min + other_p.coord), np.array(
-                bounds_other_p.xyz_max + other_p.coord)
-            if (xyz_min_p <= xyz_max_other_p).all() and (xyz_max_p >= xyz_min_other_p).all():
-                overlaps[p].append(other_p)
-                overlaps[other_p].append(p)
+    if vertices is None:
+        vertices = TransformedVertices(scms)
 
-    movements = {p: np.array([0,0,0], dtype=np.float64) for p in particles}
-    number_of_overlaps = {p: 0 for p in particles}
+    overlaps = overlapping_neighbours(particles, bounds)
+
+    # Overlapping pairs in order
+    pairs = []
     for i, p in enumerate(particles[:-1]):
-        scm = scms[p]
-        p_verts = p.full_transform().transform_points(scm.vertices)
-        overlapping_particles = [other_p for other_p in overlaps[p] if other_p not in particles[:i]]
-        for other_p in overlapping_particles:
+        for j in overlaps[i]:
+            if j <= i:
+                continue
+            other_p = particles[j]
             if particles_to_keep_still is not None and particles_to_keep_still[p] and particles_to_keep_still[other_p]:
                 continue
-            scm = scms[other_p]
-            other_p_verts = other_p.full_transform().transform_points(scm.vertices)
+            pairs.append((p, other_p))
+
+    vertices.prefetch(list(dict.fromkeys(p for pair in pairs for p in pair)), executor)
+
+    # Close points of the pairs, the planes through them are fit together below
+    def close_points(chunk):
+        results = []
+        for p, other_p in chunk:
+            p_verts = vertices[p]
+            other_p_verts = vertices[other_p]
             close_points_indicies = find_close_points(p_verts, other_p_verts, 1)
             if not len(close_points_indicies[0]):
+                results.append(None)
                 continue
             all_close_points = np.vstack((p_verts[close_points_indicies[0]], other_p_verts[close_points_indicies[1]]))
 
             middle = all_close_points.mean(0)
-            svd = np.linalg.svd(all_close_points - middle)
-            normal = svd[2][2, :]
-            normal = normal/np.linalg.norm(normal)
-
-            p_to_middle = middle - np.array(p.coord)
-            if normal.dot(p_to_middle) < 0:
-                normal = -normal
-
-            # IF you need to speed something up, its this next function that is the bottleneck
-            p_in_other_p_depth = find_depth_of_pts_from_plane(p_verts, middle, normal)
-            other_p_in_p_depth = find_depth_of_pts_from_plane(other_p_verts, middle, -normal)
-
-            movement_direction = -normal
-            move_dist = (p_in_other_p_depth + other_p_in_p_depth)/2
-            if particles_to_keep_still is None or (not particles_to_keep_still[p] and not particles_to_keep_still[other_p]):
-                number_of_overlaps[p] += 1
-                number_of_overlaps[other_p] += 1
-                movements[p] += movement_direction * move_dist
-                movements[other_p] -= movement_direction * move_dist
-            elif particles_to_keep_still[p]:
-                number_of_overlaps[other_p] += 1
-                movements[other_p] -= movement_direction * move_dist*2
-            else:
-                number_of_overlaps[p] += 1
-                movements[p] += movement_direction * move_dist*2
+            centered = all_close_points - middle
+            results.append((middle, centered.T @ centered))
+        return results
+
+    planes = map_chunks(close_points, pairs, executor)
+    pairs = [pair for pair, plane in zip(pairs, planes) if plane is not None]
+    middles = [plane[0] for plane in planes if plane is not None]
+    covariances = [plane[1] for plane in planes if plane is not None]
+
+    normals = plane_normals(np.array(covariances).reshape((-1, 3, 3)))
+    for k, (p, other_p) in enumerate(pairs):
+        p_to_middle = middles[k] - np.array(p.coord)
+        if normals[k].dot(p_to_middle) < 0:
+            normals[k] = -normals[k]
+
+    def depths(chunk):
+        return [
+            (find_depth_of_pts_from_plane(vertices[p], middles[k], normals[k]),
+             find_depth_of_pts_from_plane(vertices[other_p], middles[k], -normals[k]))
+            for k, (p, other_p) in chunk
+        ]
+
+    pair_depths = map_chunks(depths, list(enumerate(pairs)), executor)
+
+    # Movements are summed up in pair order, independent of the number of workers
+    movements = {p: np.array([0,0,0], dtype=np.float64) for p in particles}
+    number_of_overlaps = {p: 0 for p in particles}
+    for (p, other_p), normal, (p_in_other_p_depth, other_p_in_p_depth) in zip(pairs, normals, pair_depths):
+        movement_direction = -normal
+        move_dist = (p_in_other_p_depth + other_p_in_p_depth)/2
+        if particles_to_keep_still is None or (not particles_to_keep_still[p] and not particles_to_keep_still[other_p]):
+            number_of_overlaps[p] += 1
+            number_of_overlaps[other_p] += 1
+            movements[p] += movement_direction * move_dist
+            movements[other_p] -= movement_direction * move_dist
+        elif particles_to_keep_still[p]:
+            number_of_overlaps[other_p] += 1
+            movements[other_p] -= movement_direction * move_dist*2
+        else:
+            number_of_overlaps[p] += 1
+            movements[p] += movement_direction * move_dist*2
 
     for p in particles:
         if number_of_overlaps[p]:
@@ -170,75 +322,240 @@ def calculate_overlap_distance(particles, scms, bounds, particles_to_keep_still=
     return movements
 
 
+def plane_normals(covariances):
+    """
+    Normals of the least squares planes through sets of points, i.e. the directions of least variance. Equal to the
+    last right singular vector of the centered points up to the sign.
+
+    Parameters
+    ----------
+    covariances : numpy.ndarray
+        Px3x3 array of scatter matrices (centered points transposed times centered points).
+
+    Returns
+    -------
+    normals : numpy.ndarray
+        Px3 array of unit normals.
+    """
+    if covariances.shape[0] == 0:
+        return np.zeros((0, 3))
+
+    # Eigenvalues in ascending order, eigenvectors in columns
+    return np.linalg.eigh(covariances)[1][:, :, 0]
+
+
+def overlapping_neighbours(particles, bounds):
+    """
+    Indices of the particles whose bounding boxes overlap the bounding box of each particle, in increasing order.
+
+    Parameters
+    ----------
+    particles : list of Particle
+        The particles.
+    bounds : dict
+        Maps particle -> bounds of its surface relative to the particle position.
+
+    Returns
+    -------
+    neighbours : list of numpy.ndarray
+        Neighbours of each particle.
+    """
+    coords = np.array([p.coord for p in particles], dtype=np.float64).reshape((-1, 3))
+    xyz_min = np.array([bounds[p].xyz_min for p in particles], dtype=np.float64).reshape((-1, 3)) + coords
+    xyz_max = np.array([bounds[p].xyz_max for p in particles], dtype=np.float64).reshape((-1, 3)) + coords
+    pairs = box_overlap_pairs(xyz_min, xyz_max)
+
+    # Both directions, sorted by particle then neighbour
+    first = np.concatenate((pairs[:, 0], pairs[:, 1]))
+    second = np.concatenate((pairs[:, 1], pairs[:, 0]))
+    order = np.lexsort((second, first))
+    first, second = first[order], second[order]
+    splits = np.searchsorted(first, np.arange(1, len(particles)))
+
+    return np.split(second, splits)
+
+
+def box_overlap_pairs(xyz_min, xyz_max):
+    """
+    All pairs of overlapping axis-aligned boxes. The box centres are binned into a uniform grid with cells as large as
+    the largest box, so only boxes in the same or neighbouring cells need to be compared.
+
+    Parameters
+    ----------
+    xyz_min, xyz_max : numpy.ndarray
+        Nx3 arrays of lower and upper box corners.
+
+    Returns
+    -------
+    pairs : numpy.ndarray
+        Kx2 array of box indices (i < j), sorted by i, then j.
+    """
+    xyz_min = np.asarray(xyz_min, dtype=np.float64)
+    xyz_max = np.asarray(xyz_max, dtype=np.float64)
+    count = xyz_min.shape[0]
+
+    if count < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    centers = (xyz_min + xyz_max) / 2
+    lo = centers.min(axis=0)
+    extent = float((centers.max(axis=0) - lo).max())
+    cell = max(float((xyz_max - xyz_min).max()), extent / 2**20, 1e-6)
+
+    # Cells are offset by one, so that keys of neighbouring cells never wrap around
+    cells = np.floor((centers - lo) / cell).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    indices = np.arange(count)
+
+    first = []
+    second = []
+    for offset in _HALF_NEIGHBOURHOOD:
+        shifted = keys + (offset[0] * dims[1] + offset[1]) * dims[2] + offset[2]
+        starts = np.searchsorted(sorted_keys, shifted, side="left")
+        stops = np.searchsorted(sorted_keys, shifted, side="right")
+        lengths = stops - starts
+
+        a = np.repeat(indices, lengths)
+        b = order[np.arange(lengths.sum()) + np.repeat(starts - np.cumsum(lengths) + lengths, lengths)]
+
+        # Pairs within one cell are found twice
+        if offset == (0, 0, 0):
+            keep = a < b
+            a, b = a[keep], b[keep]
+
+        first.append(a)
+        second.append(b)
+
+    a = np.concatenate(first)
+    b = np.concatenate(second)
+    i = np.minimum(a, b)
+    j = np.maximum(a, b)
+
+    # Exact box test
+    hit = np.all(xyz_min[i] <= xyz_max[j], axis=1) & np.all(xyz_max[i] >= xyz_min[j], axis=1)
+    i, j = i[hit], j[hit]
+
+    order = np.lexsort((j, i))
+    return np.stack((i[order], j[order]), axis=1)
+
+
+_HALF_NEIGHBOURHOOD = [(0, 0, 0)] + [
+    (x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1) if (x, y, z) > (0, 0, 0)
+]
+"""The own cell and half of the neighbouring cells, such that each pair of neighbouring cells is visited once."""
+
+
+def order_by_overlaps(neighbours):
+    """
+    Order in which particles are processed by the volume method: repeatedly the particle that overlaps the most of the
+    remaining particles, until no overlaps remain. Ties go to the lower index.
+
+    Parameters
+    ----------
+    neighbours : list of numpy.ndarray
+        Overlapping particles of each particle, see overlapping_neighbours.
+
+    Returns
+    -------
+    order : list of int
+    """
+    import heapq
+
+    degree = np.array([len(n) for n in neighbours], dtype=np.int64)
+    heap = [(-d, i) for i, d in enumerate(degree) if d > 0]
+    heapq.heapify(heap)
+    done = np.zeros((len(neighbours),), dtype=bool)
+
+    order = []
+    while heap:
+        d, i = heapq.heappop(heap)
+
+        # Outdated entry
+        if done[i] or -d != degree[i]:
+            continue
+
+        order.append(i)
+        done[i] = True
+
+        for j in neighbours[i]:
+            if done[j]:
+                continue
+            degree[j] -= 1
+            if degree[j] > 0:
+                heapq.heappush(heap, (-degree[j], j))
+
+    return order
+
+
 def find_depth_of_pts_from_plane(pts, middle, normal, calc_depth=True):
     # Returns distance from the plane to the point furthest away from the plane on the side the normal points to.
-    # Could maybe be faster?
     normal = np.asarray(normal)/np.linalg.norm(normal)
-    pts = np.asarray(pts)
-    offset = np.dot(normal, middle)
-    pts_on_right_side = pts[np.dot(pts, normal) > offset]
-    if len(pts_on_right_side):
+    distances = np.asarray(pts) @ normal - np.dot(normal, middle)
+    if len(distances) == 0:
+        return 0
+
+    depth = distances.max()
+    if depth > 0:
         if calc_depth:
-            projected_to_normal = [normal * np.dot(normal, pt) for pt in pts_on_right_side]
-            middle_projected_onto_normal = normal * np.dot(normal, middle)
-            lengths = [np.linalg.norm(pt-middle_projected_onto_normal) for pt in projected_to_normal]
-            return max(lengths)
+            return depth
         else:
             return 1
     else:
         return 0
 
 
-def calculate_overlap_point_volume(particles, scms, bounds, particles_to_keep_still=None, num_points=100, move_factor=0.33):
+def calculate_overlap_point_volume(particles, scms, bounds, particles_to_keep_still=None, num_points=100, move_factor=0.33, vertices=None, executor=None):
     # return a dictionary with the movement vector to add to all particles. particles is a list of all particles to calculate overlap for, scms and bounds are dicts with the particles as keys and scms/bounds as values.
     generate_pts = generate_poisson_disc_pts
 
+    if vertices is None:
+        vertices = TransformedVertices(scms)
+
     # Figure out which particles overlap each other and create an ordered list with the particles to generate points for
-    overlaps = {p: [] for p in particles}
-    overlaps_list = [[] for i in range(len(particles))]
-    for i, p in enumerate(particles[:-1]):
-        bounds_p = bounds[p]
-        xyz_min_p, xyz_max_p = np.array(bounds_p.xyz_min + p.coord), np.array(bounds_p.xyz_max + p.coord)
-        for j, other_p in enumerate(particles[i+1:]):
-            bounds_other_p = bounds[other_p]
-            xyz_min_other_p, xyz_max_other_p = np.array(bounds_other_p.xyz_min + other_p.coord), np.array(bounds_other_p.xyz_max + other_p.coord)
-            if (xyz_min_p <= xyz_max_other_p).all() and (xyz_max_p >= xyz_min_other_p).all():
-                overlaps[p].append(other_p)
-                overlaps[other_p].append(p)
-                overlaps_list[i].append(other_p)
-                overlaps_list[j].append(p)
-
-    ordered_particles = []
-    while len(max(overlaps_list, key=len)):
-        particle_most_overlaps_index = np.argmax(list(map(len, overlaps_list)))
-        particle_most_overlaps = particles[particle_most_overlaps_index]
-        ordered_particles.append(particle_most_overlaps)
-        overlaps_list[particle_most_overlaps_index] = []
-        overlaps_list = [[p for p in particle_list if p != particle_most_overlaps] for particle_list in overlaps_list]
-
-    # Go through all particles that overlap and calculate the amount they overlap.
+    overlaps = overlapping_neighbours(particles, bounds)
+    order = order_by_overlaps(overlaps)
+    position = {i: rank for rank, i in enumerate(order)}
+
+    vertices.prefetch([particles[i] for i in order], executor)
+
+    # Overlap volumes of each particle with the particles that come later in the order
+    def overlap_volumes(chunk):
+        results = []
+        for i, p in chunk:
+            bounds_p = bounds[p]
+            bounds_size = bounds_p.size()
+            bbox_vol = bounds_size[0] * bounds_size[1] * bounds_size[2]
+            xyz_min, xyz_max = np.array(bounds_p.xyz_min + p.coord), np.array(bounds_p.xyz_max + p.coord)
+            pts = generate_pts(num_points, xyz_min, xyz_max)
+            scm = scms[p]
+            p_verts = vertices[p]
+
+            pts_in_p1 = filter_points_inside(pts, p_verts, scm.triangles, xyz_min, xyz_max)
+
+            volumes = []
+            overlapping_particles = [particles[j] for j in overlaps[order[i]] if position.get(j, len(order)) > i]
+            for other_p in overlapping_particles:
+                if particles_to_keep_still is not None and particles_to_keep_still[p] and particles_to_keep_still[other_p]:
+                    continue
+                scm = scms[other_p]
+                p_verts = vertices[other_p]
+
+                pts_in_both = filter_points_inside(pts_in_p1, p_verts, scm.triangles, xyz_min, xyz_max)
+                volumes.append((other_p, bbox_vol * len(pts_in_both) / len(pts)))
+            results.append(volumes)
+        return results
+
+    ranked = [(i, particles[idx]) for i, idx in enumerate(order)]
+    all_volumes = map_chunks(overlap_volumes, ranked, executor)
+
+    # Go through all particles that overlap and move them by the amount they overlap, in order.
     movements = {p: np.array([0,0,0], dtype=np.float64) for p in particles}
-    for i, p in enumerate(ordered_particles):
-        bounds_p = bounds[p]
-        bounds_size = bounds_p.size()
-        bbox_vol = bounds_size[0] * bounds_size[1] * bounds_size[2]
-        xyz_min, xyz_max = np.array(bounds_p.xyz_min + p.coord), np.array(bounds_p.xyz_max + p.coord)
-        pts = generate_pts(num_points, xyz_min, xyz_max)
-        scm = scms[p]
-        p_verts = p.full_transform().transform_points(scm.vertices)
-
-        pts_in_p1 = filter_points_inside(pts, p_verts, scm.triangles, xyz_min, xyz_max)
-
-        overlapping_particles = [other_p for other_p in overlaps[p] if other_p not in ordered_particles[:i]]
-        for other_p in overlapping_particles:
-            if particles_to_keep_still is not None and particles_to_keep_still[p] and particles_to_keep_still[other_p]:
-                continue
-            scm = scms[other_p]
-            p_verts = other_p.full_transform().transform_points(scm.vertices)
-
-            pts_in_both = filter_points_inside(pts_in_p1, p_verts, scm.triangles, xyz_min, xyz_max)
-            overlap_vol = bbox_vol * len(pts_in_both) / len(pts)
-
+    for (i, p), volumes in zip(ranked, all_volumes):
+        for other_p, overlap_vol in volumes:
             movement_direction = np.asarray(p.coord) - other_p.coord
             movement_direction = movement_direction/np.linalg.norm(movement_direction)
             move_dist = (overlap_vol ** (1/3))*move_factor
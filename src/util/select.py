@@ -1,54 +1,258 @@
 # vim: set expandtab shiftwidth=4 softtabstop=4:
 
 # General
+import ast
 import numpy as np
 
 # ChimeraX
-from chimerax.core.commands import run
+from chimerax.core.errors import UserError
 
 
 def selection_cmd(session, list_id, attributes, minima, maxima):
-    markerset = session.ArtiaX.partlists.get(list_id).markers
-    markers = markerset.get_all_markers()
+    pl = session.ArtiaX.partlists.get(list_id)
 
     # Attributes not empty, select
     if len(attributes) > 0:
-        # Mask for fast execution
-        mask = np.full((len(markers),), True)
-        # mask[0] = False
-
-        # Build mask
-        for idx, m in enumerate(markers):
-            for a, mini, maxi in zip(attributes, minima, maxima):
-                mask[idx] = mask[idx] and (mini <= getattr(m, a) <= maxi)
-
-        markerset.atoms.selecteds = mask
+        pl.selected_particles = range_mask(pl, attributes, minima, maxima)
 
     # Nothing to select, just clear selection
     else:
-        mask = np.full((len(markers),), False)
-        markerset.atoms.selecteds = mask
+        pl.selected_particles = False
 
 
 def display_cmd(session, list_id, attributes, minima, maxima):
-    markerset = session.ArtiaX.partlists.get(list_id).markers
-    markers = markerset.get_all_markers()
+    pl = session.ArtiaX.partlists.get(list_id)
 
-    # Attributes not empty, select
+    # Attributes not empty, show
     if len(attributes) > 0:
-        # Mask for fast execution
-        mask = np.full((len(markers),), True)
-
-        for idx, m in enumerate(markers):
-            for a, mini, maxi in zip(attributes, minima, maxima):
-                mask[idx] = mask[idx] and (mini <= getattr(m, a) <= maxi)
-
-        markerset.atoms.displays = mask
+        pl.displayed_particles = range_mask(pl, attributes, minima, maxima)
 
     # Nothing to select, just show all
     else:
-        mask = np.full((len(markers),), True)
-        markerset.atoms.displays = mask
+        pl.displayed_particles = True
+
+
+def expression_cmd(session, partlist, expression, mode="select"):
+    mask = evaluate_expression(partlist, expression)
+
+    if mode == "select":
+        partlist.selected_particles = mask
+    elif mode == "show":
+        partlist.displayed_particles = mask
+
+    return mask
+
+
+def range_mask(partlist, attributes, minima, maxima):
+    """
+    Boolean mask of all particles whose attributes are all within the given ranges (inclusive).
+
+    Parameters
+    ----------
+    partlist : ParticleList
+        The particle list to filter.
+    attributes : list of str
+        Attribute names.
+    minima : list of float
+        Lower bounds, one per attribute.
+    maxima : list of float
+        Upper bounds, one per attribute.
+
+    Returns
+    -------
+    mask : numpy.ndarray
+        Boolean mask of length partlist.size
+    """
+    mask = np.ones((partlist.size,), dtype=bool)
+
+    for a, mini, maxi in zip(attributes, minima, maxima):
+        order, values = partlist.get_attribute_order(a)
+        start = np.searchsorted(values, mini, side="left")
+        stop = np.searchsorted(values, maxi, side="right")
+
+        m = np.zeros((partlist.size,), dtype=bool)
+        m[order[start:stop]] = True
+        mask &= m
+
+    return mask
+
+
+def evaluate_expression(partlist, expression):
+    """
+    Evaluate a boolean expression over the attributes of a particle list.
+
+    Expressions use python syntax, e.g. "score > 0.5 and (tilt < 30 or 0.2 <= ccc <= 0.8)". Attribute names are
+    resolved on the particle list, comparisons between an attribute and a constant are answered by binary search on
+    the sorted attribute values. Supported are comparisons, and/or/not, &/|/~, arithmetic (+ - * / ** %) and abs().
+
+    Parameters
+    ----------
+    partlist : ParticleList
+        The particle list to filter.
+    expression : str
+        The expression.
+
+    Returns
+    -------
+    mask : numpy.ndarray
+        Boolean mask of length partlist.size
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise UserError('Invalid expression "{}": {}'.format(expression, e.msg))
+
+    result = _ExpressionEvaluator(partlist).visit(tree.body)
+
+    if np.ndim(result) == 0:
+        return np.full((partlist.size,), bool(result))
+
+    if result.dtype != bool:
+        raise UserError('Expression "{}" does not evaluate to true/false.'.format(expression))
+
+    return result
+
+
+class _ExpressionEvaluator:
+    """Walks the syntax tree of a filter expression and evaluates it using numpy operations on attribute columns."""
+
+    _compare_ops = {
+        "Lt": np.less,
+        "LtE": np.less_equal,
+        "Gt": np.greater,
+        "GtE": np.greater_equal,
+        "Eq": np.equal,
+        "NotEq": np.not_equal,
+    }
+
+    _mirror_ops = {"Lt": "Gt", "LtE": "GtE", "Gt": "Lt", "GtE": "LtE", "Eq": "Eq", "NotEq": "NotEq"}
+
+    _binary_ops = {
+        "Add": np.add,
+        "Sub": np.subtract,
+        "Mult": np.multiply,
+        "Div": np.true_divide,
+        "Pow": np.power,
+        "Mod": np.mod,
+        "BitAnd": np.logical_and,
+        "BitOr": np.logical_or,
+    }
+
+    _functions = {"abs": np.abs}
+
+    def __init__(self, partlist):
+        self.partlist = partlist
+        self.attributes = partlist.get_all_attributes()
+
+    def visit(self, node):
+        method = getattr(self, "_visit_" + type(node).__name__, None)
+        if method is None:
+            raise UserError("Unsupported syntax in expression: {}".format(type(node).__name__))
+        return method(node)
+
+    def _visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise UserError("Only numeric constants are allowed in expressions, got {}.".format(node.value))
+        return node.value
+
+    def _visit_Name(self, node):
+        self._check_attribute(node.id)
+        return self.partlist.get_attribute_values(node.id)
+
+    def _check_attribute(self, name):
+        if name not in self.attributes:
+            raise UserError("Attribute {} unknown for particle list #{} - {}.".format(name,
+                                                                                       self.partlist.id_string,
+                                                                                       self.partlist.name))
+
+    def _visit_BoolOp(self, node):
+        func = np.logical_and if type(node.op).__name__ == "And" else np.logical_or
+        result = self.visit(node.values[0])
+        for v in node.values[1:]:
+            result = func(result, self.visit(v))
+        return result
+
+    def _visit_UnaryOp(self, node):
+        op = type(node.op).__name__
+        operand = self.visit(node.operand)
+        if op in ["Not", "Invert"]:
+            return np.logical_not(operand)
+        elif op == "USub":
+            return np.negative(operand)
+        elif op == "UAdd":
+            return operand
+        raise UserError("Unsupported operator in expression: {}".format(op))
+
+    def _visit_BinOp(self, node):
+        op = type(node.op).__name__
+        if op not in self._binary_ops:
+            raise UserError("Unsupported operator in expression: {}".format(op))
+        return self._binary_ops[op](self.visit(node.left), self.visit(node.right))
+
+    def _visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in self._functions or len(node.args) != 1:
+            raise UserError("Unsupported function call in expression.")
+        return self._functions[node.func.id](self.visit(node.args[0]))
+
+    def _visit_Compare(self, node):
+        result = None
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            m = self._compare(left, type(op).__name__, right)
+            result = m if result is None else np.logical_and(result, m)
+            left = right
+        return result
+
+    def _compare(self, left, op, right):
+        if op not in self._compare_ops:
+            raise UserError("Unsupported comparison in expression: {}".format(op))
+
+        # attribute <op> constant or constant <op> attribute can use the sorted index
+        name, const = None, None
+        if isinstance(left, ast.Name) and _is_number(right):
+            name, const = left.id, self.visit(right)
+        elif _is_number(left) and isinstance(right, ast.Name):
+            name, const, op = right.id, self.visit(left), self._mirror_ops[op]
+
+        if name is not None:
+            self._check_attribute(name)
+            return self._range_query(name, op, const)
+
+        return self._compare_ops[op](self.visit(left), self.visit(right))
+
+    def _range_query(self, name, op, value):
+        order, values = self.partlist.get_attribute_order(name)
+        n = self.partlist.size
+
+        left = np.searchsorted(values, value, side="left")
+        right = np.searchsorted(values, value, side="right")
+
+        if op == "Lt":
+            start, stop = 0, left
+        elif op == "LtE":
+            start, stop = 0, right
+        elif op == "Gt":
+            start, stop = right, n
+        elif op == "GtE":
+            start, stop = left, n
+        else:
+            start, stop = left, right
+
+        mask = np.zeros((n,), dtype=bool)
+        mask[order[start:stop]] = True
+
+        if op == "NotEq":
+            mask = np.logical_not(mask)
+
+        return mask
+
+
+def _is_number(node):
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        return _is_number(node.operand)
+    return False
 
 
 def color_cmd(session, list_id, color, log=False):
@@ -71,22 +275,16 @@ def color_cmd(session, list_id, color, log=False):
 
 
 def colormap_cmd(session, list_id, palette, attribute, minimum, maximum, transparency=100, log=False):
-    markers = session.ArtiaX.partlists.get(list_id).markers
-    _id = markers.id_string
+    pl = session.ArtiaX.partlists.get(list_id)
 
-    run(session,
-        'color byattribute a:{} #{} palette {} range {},{} transparency {}'.format(attribute,
-                                                                                   markers.id_string,
-                                                                                   palette,
-                                                                                   minimum,
-                                                                                   maximum,
-                                                                                   transparency), log=False)
+    # Map the attribute column through the palette and set all colors at once
+    pl.particle_colors = attribute_colors(session, pl, palette, attribute, minimum, maximum, transparency)
 
     if log:
         from chimerax.core.commands import log_equivalent_command
         log_equivalent_command(session,
                                'artiax colormap #{} {} palette {} minValue {} '
-                               'maxValue {} transparency {}'.format(markers.id_string,
+                               'maxValue {} transparency {}'.format(pl.id_string,
                                                                     attribute,
                                                                     palette,
                                                                     minimum,
@@ -94,6 +292,49 @@ def colormap_cmd(session, list_id, palette, attribute, minimum, maximum, transpa
                                                                     transparency))
 
 
+def attribute_colors(session, partlist, palette, attribute, minimum, maximum, transparency=0):
+    """
+    Colors of all particles of a list mapped from one attribute through a palette.
+
+    Parameters
+    ----------
+    session : chimerax.core.session.Session
+        The session.
+    partlist : ParticleList
+        The particle list to color.
+    palette : str
+        Name of a custom palette (see "palette list").
+    attribute : str
+        The attribute to map.
+    minimum : float
+        Attribute value mapped to the first palette color.
+    maximum : float
+        Attribute value mapped to the last palette color.
+    transparency : float
+        Transparency in percent (0-100).
+
+    Returns
+    -------
+    colors : numpy.ndarray
+        Nx4 array of uint8.
+    """
+    if palette in session.user_colormaps:
+        cmap = session.user_colormaps[palette]
+    else:
+        from chimerax.core.colors import BuiltinColormaps
+        cmap = BuiltinColormaps[palette]
+
+    # Constant attribute: map everything to the first color
+    if maximum <= minimum:
+        maximum = minimum + 1
+
+    values = partlist.get_attribute_values(attribute)
+    colors = cmap.rescale_range(minimum, maximum).interpolated_rgba8(values)
+    colors[:, 3] = round((100 - transparency) * 255 / 100)
+
+    return colors
+
+
 def _full_spec(id_string, attributes, minima, maxima):
     neg = []
     pos = []
@@ -5,7 +5,7 @@ import numpy as np
 from functools import partial
 
 # Qt
-from Qt.QtCore import Qt, Signal
+from Qt.QtCore import Qt, Signal, QTimer
 from Qt.QtGui import QColor
 from Qt.QtWidgets import (
     QWidget,
@@ -27,6 +27,7 @@ from Qt.QtWidgets import (
 # This package
 from .IgnorantComboBox import IgnorantComboBox
 from .GradientRangeSlider import GradientRangeSlider
+from .HistogramSparkline import HistogramSparkline
 from .LabelEditSlider import LabelEditSlider
 
 class ColorRangeWidget(QWidget):
@@ -50,6 +51,9 @@ class ColorRangeWidget(QWidget):
     colorChangeFinished = Signal(tuple, np.ndarray)
     colormapChangeFinished = Signal(tuple, str, str, float, float, float)
 
+    THROTTLE_MS = 50
+    """While the range slider is dragged, colormapChanged is emitted at most once per THROTTLE_MS."""
+
     def __init__(self, session, parent=None):
         super().__init__(parent=parent)
 
@@ -63,6 +67,12 @@ class ColorRangeWidget(QWidget):
 
         self._mode = "mono"
 
+        # Emits colormapChanged after range slider drags
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(self.THROTTLE_MS)
+        self._emit_timer.timeout.connect(self._color_changed)
+
         # The contents
         self._layout = QVBoxLayout()
         self._layout.setContentsMargins(0, 0, 0, 0)
@@ -145,6 +155,9 @@ class ColorRangeWidget(QWidget):
         _slider_min_max_layout.addWidget(self.min_label, alignment=Qt.AlignmentFlag.AlignLeft)
         _slider_min_max_layout.addWidget(self.max_label, alignment=Qt.AlignmentFlag.AlignRight)
 
+        # Histogram of the attribute
+        self.sparkline = HistogramSparkline()
+
         # Slider Line 2
         self.slider = GradientRangeSlider()
         self.slider._singleStep = 0.001
@@ -165,6 +178,7 @@ class ColorRangeWidget(QWidget):
 
         # Assemble slider
         _slider_layout.addLayout(_slider_min_max_layout)
+        _slider_layout.addWidget(self.sparkline)
         _slider_layout.addWidget(self.slider)
         _slider_layout.addLayout(_slider_edit_layout)
 
@@ -449,6 +463,16 @@ class ColorRangeWidget(QWidget):
         self.lower_edit.blockSignals(prev)
         self.upper_edit.blockSignals(prev1)
 
+        # Histogram of the attribute
+        if self.partlist is not None and len(self.attributes) > 0:
+            attribute = self.attributes[self._att_idx]
+            counts, edges = self.partlist.get_attribute_histogram(attribute)
+            quantiles = self.partlist.get_attribute_quantiles(attribute, HistogramSparkline.QUANTILES)
+            self.sparkline.set_histogram(counts, edges, quantiles)
+            self.sparkline.set_range(current_range[0], current_range[1])
+        else:
+            self.sparkline.clear()
+
     def _slider_changed(self, value=None, released=False):
         if value is None:
             value = self.slider.value()
@@ -458,8 +482,13 @@ class ColorRangeWidget(QWidget):
         self.upper_edit.setText("{:.4f}".format(value[1]))
         self.lower_edit.blockSignals(prev)
         self.upper_edit.blockSignals(prev1)
+        self.sparkline.set_range(value[0], value[1])
 
-        self._color_changed(released)
+        # Throttled while dragging, the selection is read when the timer fires
+        if released:
+            self._color_changed(released)
+        elif not self._emit_timer.isActive():
+            self._emit_timer.start()
 
     def _transparency_changed(self, value, released=False):
         alpha = round((100 - value) * 255/100)
@@ -485,6 +514,7 @@ class ColorRangeWidget(QWidget):
         prev = self.slider.blockSignals(True)
         self.slider.setValue((lower, upper))
         self.slider.blockSignals(prev)
+        self.sparkline.set_range(lower, upper)
 
         self._color_changed(released=True)
 
@@ -503,6 +533,8 @@ class ColorRangeWidget(QWidget):
         return palette, attribute, minimum, maximum
 
     def _color_changed(self, released=False):
+        self._emit_timer.stop()
+
         if self._mode == "mono":
             self.partlist.color_settings = {'mode': 'mono',
                                             'palette': '',
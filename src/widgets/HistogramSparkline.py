@@ -0,0 +1,114 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# General
+import numpy as np
+
+# Qt
+from Qt.QtCore import Qt, QRectF
+from Qt.QtGui import QPainter, QPen
+from Qt.QtWidgets import QWidget, QSizePolicy
+
+
+class HistogramSparkline(QWidget):
+    """
+    A HistogramSparkline draws a fixed-bin histogram of one attribute as a small bar plot. Quantiles are drawn as marks
+    and the bins within the selected range are highlighted. Only the precomputed histogram is drawn, so the cost does
+    not depend on the number of particles.
+
+    Parameters
+    ----------
+    parent : QWidget
+        The parent widget.
+    """
+
+    QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+    """Quantiles marked on the sparkline by default."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+
+        self._counts = None
+        """Counts per bin."""
+        self._edges = None
+        """Bin edges (one more than counts)."""
+        self._quantiles = None
+        """Values of the marked quantiles."""
+        self._range = None
+        """Selected range (lower, upper) or None for everything."""
+
+        self.setMinimumHeight(20)
+        self.setMaximumHeight(30)
+        self.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed))
+
+    def set_histogram(self, counts, edges, quantiles=None):
+        """
+        Set the histogram to draw.
+
+        Parameters
+        ----------
+        counts : numpy.ndarray
+            Counts per bin.
+        edges : numpy.ndarray
+            Bin edges.
+        quantiles : numpy.ndarray or None
+            Values to mark.
+        """
+        self._counts = np.asarray(counts, dtype=np.float64)
+        self._edges = np.asarray(edges, dtype=np.float64)
+        self._quantiles = None if quantiles is None else np.asarray(quantiles, dtype=np.float64)
+        self.update()
+
+    def set_range(self, lower, upper):
+        """Set the selected range."""
+        self._range = (lower, upper)
+        self.update()
+
+    def clear(self):
+        self._counts = None
+        self._edges = None
+        self._quantiles = None
+        self._range = None
+        self.update()
+
+    def paintEvent(self, event):
+        if self._counts is None or len(self._counts) == 0:
+            return
+
+        width = self.width()
+        height = self.height() - 1
+        lower = self._edges[0]
+        span = max(self._edges[-1] - lower, 1e-12)
+
+        x = (self._edges - lower) / span * width
+        heights = self._counts / max(self._counts.max(), 1) * height
+        centers = (self._edges[:-1] + self._edges[1:]) / 2
+
+        if self._range is None:
+            selected = np.ones(self._counts.shape, dtype=bool)
+        else:
+            selected = (centers >= self._range[0]) & (centers <= self._range[1])
+
+        palette = self.palette()
+        colors = (palette.mid().color(), palette.highlight().color())
+
+        painter = QPainter(self)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        for idx in range(len(self._counts)):
+            if heights[idx] <= 0:
+                continue
+
+            painter.setBrush(colors[int(selected[idx])])
+            painter.drawRect(QRectF(x[idx], height - heights[idx], max(x[idx + 1] - x[idx], 1), heights[idx]))
+
+        # Quantile marks, the median solid
+        if self._quantiles is not None:
+            pen = QPen(palette.text().color())
+            for idx, q in enumerate(self._quantiles):
+                qx = (q - lower) / span * width
+                median = idx == len(self._quantiles) // 2
+                pen.setStyle(Qt.PenStyle.SolidLine if median else Qt.PenStyle.DotLine)
+                painter.setPen(pen)
+                painter.drawLine(int(round(qx)), 0, int(round(qx)), height)
+
+        painter.end()
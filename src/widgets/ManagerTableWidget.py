@@ -51,6 +51,13 @@ class ManagerTableWidget(QTableWidget):
         self.options_group = QButtonGroup()
         self.options_group.setExclusive(True)
 
+        self._rows = []
+        """Child models in row order."""
+        self._show_boxes = []
+        """Show checkboxes in row order."""
+        self._options_boxes = []
+        """Options radiobuttons in row order."""
+
     def update_selection(self, selected_model_id, send_signal=False):
 
         # None selected
@@ -89,7 +96,7 @@ class ManagerTableWidget(QTableWidget):
         # None selected
         if options_model_id is None:
             # Set all unchecked
-            for btn in self.options_group.buttons():
+            for btn in self._options_boxes:
                 prev = False
                 if not send_signal:
                     prev = btn.blockSignals(True)
@@ -102,7 +109,7 @@ class ManagerTableWidget(QTableWidget):
         # Model selected
         else:
             idx = self.model.get_idx(options_model_id)
-            btn = self.options_group.buttons()[idx]
+            btn = self._options_boxes[idx]
 
             prev = False
             if not send_signal:
@@ -113,109 +120,165 @@ class ManagerTableWidget(QTableWidget):
             if not send_signal:
                 btn.blockSignals(prev)
 
-    def update_shown(self, send_signal=False):
-        for idx, btn in enumerate(self.show_group.buttons()):
-            prev = False
-            if not send_signal:
-                prev = btn.blockSignals(True)
+    def update_shown(self, model=None, send_signal=False):
+        # Only the row of the model that changed, if it is known
+        if model is not None:
+            if model in self._rows:
+                self._set_shown(self._rows.index(model), send_signal)
+            return
 
-            # Set the check state
-            if self.model.get(idx).display:
-                btn.setCheckState(Qt.CheckState.Checked)
-            else:
-                btn.setCheckState(Qt.CheckState.Unchecked)
+        for idx in range(len(self._show_boxes)):
+            self._set_shown(idx, send_signal)
 
-            if not send_signal:
-                btn.blockSignals(prev)
+    def _set_shown(self, idx, send_signal=False):
+        btn = self._show_boxes[idx]
+
+        # Only touch the checkbox if the state differs
+        shown = self._rows[idx].display
+        if shown == (btn.checkState() == Qt.CheckState.Checked):
+            return
+
+        prev = False
+        if not send_signal:
+            prev = btn.blockSignals(True)
+
+        # Set the check state
+        if shown:
+            btn.setCheckState(Qt.CheckState.Checked)
+        else:
+            btn.setCheckState(Qt.CheckState.Unchecked)
 
+        if not send_signal:
+            btn.blockSignals(prev)
 
     def update_table(self, options_model_id):
         """
-        Updates the table contents
+        Updates the table contents to match the child models of the manager model. Rows of removed models are removed,
+        rows for new models are inserted and the remaining rows are only updated where their contents changed.
 
         Parameters
         ----------
         options_model_id : tuple of int
             ID of the currently selected "options" child.
-
-        Returns
-        -------
-        selected_id : tuple of int
-            Model id of selected line in the table.
-        options_id : tuple of int
-            Model id of the toggled "options" child.
         """
+        models = self.model.child_models()
+
+        # Remove rows of deleted models
+        for row in reversed(range(len(self._rows))):
+            if self._rows[row] not in models:
+                self.remove_row(row)
+
+        # Insert new rows, move reordered ones and update the others
+        for idx, m in enumerate(models):
+            if idx < len(self._rows) and self._rows[idx] is m:
+                self.update_row(idx, options_model_id)
+                continue
 
-        self.clear_table()
+            if m in self._rows:
+                self.remove_row(self._rows.index(m))
 
-        # Add new Buttons and connections
+            self.insert_row(idx, m, options_model_id)
+
+    def insert_row(self, idx, model, options_model_id=None):
+        """
+        Insert a row for a child model.
+
+        Parameters
+        ----------
+        idx : int
+            Row index, equal to the index of model in the manager model.
+        model : chimerax.core.models.Model
+            The child model.
+        options_model_id : tuple of int
+            ID of the currently selected "options" child.
+        """
         from Qt.QtWidgets import QTableWidgetItem
-        from Qt.QtCore import Qt
-
-        for idx, m in enumerate(self.model.iter()):
-            # Define table items
-            # ID (not editable)
-            id_box = QTableWidgetItem('#{}'.format(m.id_string))
-            id_box.setFlags(id_box.flags() ^ Qt.ItemFlag.ItemIsEditable)
-            # Name
-            name_box = QTableWidgetItem(m.name)
-            # Show checkbox
-            show_widge = CenteredCheckBox()
-            show_box = show_widge.checkbox
-            #Options radio
-            options_widge = CenteredRadioButton()
-            options_box = options_widge.radiobutton
-
-            # Set the check state
-            if self.model.get(idx).display:
-                show_box.setCheckState(Qt.CheckState.Checked)
-            else:
-                show_box.setCheckState(Qt.CheckState.Unchecked)
-
-            if self.model.has_id(options_model_id) and self.model.get_id(idx) == options_model_id:
-                options_box.setChecked(True)
-            else:
-                options_box.setChecked(False)
-
-            # Connect the Items to a function
-            show_box.stateChanged.connect(partial(self.show_cb, idx))
-            #options_box.toggled.connect(partial(self.options_cb, idx))
-            options_box.clicked.connect(partial(self.options_cb, idx))
-
-            self.setItem(idx, 0, id_box)
-            self.setItem(idx, 1, name_box)
-            self.setCellWidget(idx, 2, show_widge)
-            self.setCellWidget(idx, 3, options_widge)
-
-            # Add buttons to groups
-            self.show_group.addButton(show_box)
-            self.options_group.addButton(options_box)
-
-        #self.selectRow(0)
-
-        #if self.model.count > 0:
-        #    selected_id = self.model.get_id(0)
-        #else:
-        #    selected_id = None
-
-        #options_id = options_model_id
-        #if not self.model.has_id(options_model_id):
-        #    options_id = None
-
-        #return (selected_id, options_id)
-
-    def clear_table(self, count=None):
-        self.clearContents()
-        if count is None:
-            self.setRowCount(self.model.count)
+
+        prev = self.blockSignals(True)
+        self.insertRow(idx)
+
+        # Define table items
+        # ID (not editable)
+        id_box = QTableWidgetItem('#{}'.format(model.id_string))
+        id_box.setFlags(id_box.flags() ^ Qt.ItemFlag.ItemIsEditable)
+        # Name
+        name_box = QTableWidgetItem(model.name)
+        # Show checkbox
+        show_widge = CenteredCheckBox()
+        show_box = show_widge.checkbox
+        #Options radio
+        options_widge = CenteredRadioButton()
+        options_box = options_widge.radiobutton
+
+        # Set the check state
+        if model.display:
+            show_box.setCheckState(Qt.CheckState.Checked)
         else:
-            self.setRowCount(count)
+            show_box.setCheckState(Qt.CheckState.Unchecked)
+
+        options_box.setChecked(options_model_id is not None and model.id == options_model_id)
 
-        # Delete old Buttons
-        for b in self.show_group.buttons():
-            self.show_group.removeButton(b)
+        # Connect the Items to a function, rows are looked up on click as they can move
+        show_box.stateChanged.connect(partial(self._show_changed, model))
+        options_box.clicked.connect(partial(self._options_clicked, model))
+
+        self.setItem(idx, 0, id_box)
+        self.setItem(idx, 1, name_box)
+        self.setCellWidget(idx, 2, show_widge)
+        self.setCellWidget(idx, 3, options_widge)
+        self.blockSignals(prev)
+
+        # Add buttons to groups
+        self.show_group.addButton(show_box)
+        self.options_group.addButton(options_box)
+
+        self._rows.insert(idx, model)
+        self._show_boxes.insert(idx, show_box)
+        self._options_boxes.insert(idx, options_box)
+
+    def remove_row(self, idx):
+        """Remove the row at idx."""
+        for group, boxes in ((self.show_group, self._show_boxes), (self.options_group, self._options_boxes)):
+            b = boxes.pop(idx)
+            group.removeButton(b)
             b.deleteLater()
 
-        for b in self.options_group.buttons():
-            self.options_group.removeButton(b)
-            b.deleteLater()
\ No newline at end of file
+        self._rows.pop(idx)
+        self.removeRow(idx)
+
+    def update_row(self, idx, options_model_id=None):
+        """Update the contents of the row at idx that differ from its model."""
+        model = self._rows[idx]
+
+        prev = self.blockSignals(True)
+        id_text = '#{}'.format(model.id_string)
+        if self.item(idx, 0).text() != id_text:
+            self.item(idx, 0).setText(id_text)
+        if self.item(idx, 1).text() != model.name:
+            self.item(idx, 1).setText(model.name)
+        self.blockSignals(prev)
+
+        self._set_shown(idx)
+
+        checked = options_model_id is not None and model.id == options_model_id
+        btn = self._options_boxes[idx]
+        if btn.isChecked() != checked:
+            prev = btn.blockSignals(True)
+            btn.setChecked(checked)
+            btn.blockSignals(prev)
+
+    def _show_changed(self, model, state):
+        if model in self._rows:
+            self.show_cb(self._rows.index(model), state)
+
+    def _options_clicked(self, model, checked):
+        if model in self._rows:
+            self.options_cb(self._rows.index(model), checked)
+
+    def clear_table(self):
+        """Remove all rows."""
+        for row in reversed(range(len(self._rows))):
+            self.remove_row(row)
+
+        self.clearContents()
+        self.setRowCount(0)
@@ -19,6 +19,7 @@ from Qt.QtWidgets import (
 
 # This package
 from .SelectorWidget import SelectorWidget
+from .HistogramSparkline import HistogramSparkline
 
 class SelectionTableWidget(QWidget):
     """
@@ -214,13 +215,31 @@ class SelectionTableWidget(QWidget):
                                 self.attribute_constant,
                                 idx=idx,
                                 mini=mini,
-                                maxi=maxi)
+                                maxi=maxi,
+                                histogram=self._histogram)
 
         self._selectors.append(widget)
         self.selectors_vbox.addWidget(widget, alignment=Qt.AlignmentFlag.AlignTop)
         widget.selectionChanged.connect(self._selector_modified)
         widget.deleted.connect(self._selector_deleted)
 
+    def _histogram(self, attribute):
+        """
+        Cached histogram and quantiles of an attribute of the current ParticleList.
+
+        Parameters
+        ----------
+        attribute : str
+            The attribute name.
+
+        Returns
+        -------
+        counts, edges, quantiles : numpy.ndarray
+        """
+        counts, edges = self.partlist.get_attribute_histogram(attribute)
+        quantiles = self.partlist.get_attribute_quantiles(attribute, HistogramSparkline.QUANTILES)
+        return counts, edges, quantiles
+
     def _mode_switched(self):
         """
         Action upon switching between 'Show' and 'Select' radio buttons
@@ -5,7 +5,7 @@ from functools import partial
 from superqt import QDoubleRangeSlider
 
 # Qt
-from Qt.QtCore import Qt, Signal
+from Qt.QtCore import Qt, Signal, QTimer
 from Qt.QtWidgets import (
     QWidget,
     QGridLayout,
@@ -21,24 +21,36 @@ from Qt.QtWidgets import (
 
 # This package
 from .IgnorantComboBox import IgnorantComboBox
+from .HistogramSparkline import HistogramSparkline
 
 
 class SelectorWidget(QWidget):
     DEBUG = False
 
+    THROTTLE_MS = 50
+    """While the slider is dragged, selectionChanged is emitted at most once per THROTTLE_MS."""
+
     selectionChanged = Signal()
     deleted = Signal(object)
 
-    def __init__(self, attributes, minima, maxima, constant, idx=0, mini=None, maxi=None, parent=None):
+    def __init__(self, attributes, minima, maxima, constant, idx=0, mini=None, maxi=None, histogram=None, parent=None):
         super().__init__(parent=parent)
 
         self.attributes = attributes
         self.minima = minima
         self.maxima = maxima
         self.attribute_constant = constant
+        self.histogram = histogram
+        """Function returning (counts, edges, quantiles) of an attribute, or None."""
         self._idx = idx
         self.active = True
 
+        # Emits selectionChanged after slider drags
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(self.THROTTLE_MS)
+        self._emit_timer.timeout.connect(self._emit_selection_changed)
+
         # The contents
         self._layout = QGridLayout()
 
@@ -75,6 +87,11 @@ class SelectorWidget(QWidget):
         self._slider_min_max_layout.addWidget(self.min_label, alignment=Qt.AlignmentFlag.AlignLeft)
         self._slider_min_max_layout.addWidget(self.max_label, alignment=Qt.AlignmentFlag.AlignRight)
 
+        # Histogram of the attribute
+        self.sparkline = HistogramSparkline()
+        self._set_sparkline()
+        self.sparkline.set_range(value_low, value_high)
+
         # Slider Line 2
         self.slider = QDoubleRangeSlider()
         self.slider._singleStep = 0.001
@@ -105,6 +122,7 @@ class SelectorWidget(QWidget):
             self.upper_edit.setEnabled(False)
 
         self._slider_layout.addLayout(self._slider_min_max_layout)
+        self._slider_layout.addWidget(self.sparkline)
         self._slider_layout.addWidget(self.slider)
         self._slider_layout.addLayout(self._slider_edit_layout)
 
@@ -149,6 +167,7 @@ class SelectorWidget(QWidget):
 
         # Slider
         self.slider.valueChanged.connect(partial(self._slider_changed))
+        self.slider.sliderReleased.connect(partial(self._slider_released))
 
         # Edits
         self.lower_edit.editingFinished.connect(partial(self._edit_changed))
@@ -232,8 +251,19 @@ class SelectorWidget(QWidget):
         self.lower_edit.blockSignals(prev)
         self.upper_edit.blockSignals(prev1)
 
+        self._set_sparkline()
+        self.sparkline.set_range(self.minimum, self.maximum)
+
+    def _set_sparkline(self):
+        if self.histogram is None:
+            self.sparkline.hide()
+            return
+
+        counts, edges, quantiles = self.histogram(self.attributes[self._idx])
+        self.sparkline.set_histogram(counts, edges, quantiles)
 
     def _destroy(self):
+        self._emit_timer.stop()
         self.deleted.emit(self)
         self.deleteLater()
 
@@ -244,8 +274,16 @@ class SelectorWidget(QWidget):
         self.upper_edit.setText("{:.4f}".format(value[1]))
         self.lower_edit.blockSignals(prev)
         self.upper_edit.blockSignals(prev1)
+        self.sparkline.set_range(value[0], value[1])
 
-        self._emit_selection_changed()
+        # Throttled, the selection is read when the timer fires
+        if not self._emit_timer.isActive():
+            self._emit_timer.start()
+
+    def _slider_released(self):
+        # Emit pending changes right away
+        if self._emit_timer.isActive():
+            self._emit_selection_changed()
 
     def _edit_changed(self):
         lower = float(self.lower_edit.text())
@@ -266,7 +304,9 @@ class SelectorWidget(QWidget):
         prev = self.slider.blockSignals(True)
         self.slider.setValue((lower, upper))
         self.slider.blockSignals(prev)
+        self.sparkline.set_range(lower, upper)
         self._emit_selection_changed()
 
     def _emit_selection_changed(self):
+        self._emit_timer.stop()
         self.selectionChanged.emit()
\ No newline at end of file
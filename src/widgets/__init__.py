@@ -5,6 +5,7 @@ from .CenteredCheckBox import CenteredCheckBox
 from .CenteredRadioButton import CenteredRadioButton
 from .ManagerTableWidget import ManagerTableWidget
 from .GradientRangeSlider import GradientRangeSlider
+from .HistogramSparkline import HistogramSparkline
 from .IgnorantComboBox import IgnorantComboBox
 from .SelectorWidget import SelectorWidget
 from .SelectionTableWidget import SelectionTableWidget
@@ -0,0 +1,43 @@
+# vim: set expandtab shiftwidth=4 softtabstop=4:
+
+# The util package imports ChimeraX, so the module is loaded from its file
+import importlib.util
+import os
+
+import numpy as np
+
+_spec = importlib.util.spec_from_file_location(
+    "containment", os.path.join(os.path.dirname(__file__), "..", "src", "util", "containment.py")
+)
+containment = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(containment)
+
+
+def _unit_cube():
+    vertices = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float64)
+    triangles = np.array(
+        [
+            [0, 2, 3], [0, 3, 1],  # x = 0
+            [4, 5, 7], [4, 7, 6],  # x = 1
+            [0, 1, 5], [0, 5, 4],  # y = 0
+            [2, 6, 7], [2, 7, 3],  # y = 1
+            [0, 4, 6], [0, 6, 2],  # z = 0
+            [1, 3, 7], [1, 7, 5],  # z = 1
+        ]
+    )
+    return vertices, triangles
+
+
+def test_points_on_shared_edges():
+    # Rays along z through the diagonals and the centre vertex of the faces z = 0 and z = 1
+    sc = containment.SurfaceContainment(*_unit_cube())
+    points = [[0.5, 0.5, 0.003], [0.3, 0.3, 0.001], [0.3, 0.31, 0.001], [0.7, 0.3, 0.5], [0.25, 0.75, 0.999]]
+    assert np.all(sc.contains(points))
+
+
+def test_regular_grid():
+    sc = containment.SurfaceContainment(*_unit_cube())
+    axis = np.linspace(-0.45, 1.45, 39)
+    points = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape((-1, 3))
+    expected = np.all((points > 0) & (points < 1), axis=1)
+    assert np.array_equal(sc.contains(points), expected)